@@ -0,0 +1,397 @@
+# archive_analytics.py – Muster, Themen und wiederkehrende Phrasen im Gedanken-Archiv
+#
+# Map/Reduce über das Archiv: analyze_chunk() wertet einen Abschnitt der Datei
+# (Byte-Bereich in gedanken.jsonl bzw. id-Bereich in gedanken.db) in einem eigenen
+# Prozess aus, die Teilergebnisse werden zusammengeführt und zu Themen und Phrasen
+# verdichtet. Die Worker lesen selbst aus der Datei – über die Prozessgrenze gehen
+# nur die Bereichsgrenzen und die gekürzten Zählungen, nie die Einträge selbst.
+import os
+import json
+import math
+import time
+import sqlite3
+import datetime
+import threading
+import multiprocessing
+from collections import Counter
+from itertools import combinations
+from urllib.request import pathname2url
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from aurelia_logging import get_logger
+from tokenizer import tokenize
+from recall_index import STOPWORDS
+
+# eigene Ausgaben der Engine (Gedanken-Vorlagen) würden jede Statistik dominieren
+OWN_PREFIXES = ("Aurelia: ", "Aurelia (Antwort): ", "Aurelia fragt: ")
+USER_PREFIX = "User: "
+
+CHUNK_BYTES = 4 * 1024 * 1024   # Journal: Bytes je Abschnitt
+CHUNK_ROWS = 20000              # SQLite: Zeilen je Abschnitt
+MAX_TERMS_PER_ENTRY = 12        # begrenzt die Paare je Eintrag auf 66
+PHRASE_LENGTHS = (2, 3)
+PARTIAL_LIMIT = 20000           # Wörter/Paare/Phrasen je Teilergebnis (nur Anzahl >= 2)
+TOTAL_LIMIT = 200000            # Obergrenze der zusammengeführten Zählungen
+DEFAULT_WORKERS = 2             # Pool-Größe bei workers=0 (höchstens os.cpu_count())
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _log_error(message, exception=None):
+    # erst beim Aufruf: die Worker-Prozesse importieren dieses Modul und sollen kein Logging einrichten
+    get_logger("analytics").error(message, exc_info=exception)
+
+
+# -------------------------------
+# Map: ein Abschnitt des Archivs (läuft im Worker-Prozess)
+# -------------------------------
+def entry_text(text):
+    """Text eines Archiv-Eintrags ohne Zeitstempel und Präfix; None für eigene Gedanken der Engine."""
+    text = str(text)
+    if text.startswith("[") and "] " in text:
+        text = text.split("] ", 1)[1]
+    if text.startswith(OWN_PREFIXES):
+        return None
+    if text.startswith(USER_PREFIX):
+        text = text[len(USER_PREFIX):]
+    return text
+
+
+def _iter_journal(path, start, end):
+    """Texte der Zeilen, die in [start, end) beginnen (eine angeschnittene erste Zeile gehört zum Vorgänger)."""
+    with open(path, "rb") as f:
+        f.seek(max(0, start - 1))
+        if start > 0 and f.read(1) != b"\n":
+            f.readline()
+        while f.tell() < end:
+            raw = f.readline()
+            if not raw.endswith(b"\n"):
+                break  # Dateiende oder noch unvollständige letzte Zeile
+            try:
+                entry = json.loads(raw.decode("utf-8"))
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                yield entry.get("text", "")
+
+
+def _iter_sqlite(path, lo, hi):
+    """Texte mit lo < id <= hi, schreibgeschützt geöffnet (die Engine schreibt weiter)."""
+    conn = sqlite3.connect("file:" + pathname2url(path) + "?mode=ro", uri=True)
+    try:
+        cursor = conn.execute("SELECT text FROM thoughts WHERE id > ? AND id <= ? ORDER BY id", (lo, hi))
+        for (text,) in cursor:
+            yield text
+    finally:
+        conn.close()
+
+
+def _prune(counter, limit):
+    """Nur Mehrfach-Treffer, höchstens limit Stück – hält die Teilergebnisse klein."""
+    items = [(k, n) for k, n in counter.items() if n >= 2]
+    if len(items) > limit:
+        items.sort(key=lambda item: item[1], reverse=True)
+        del items[limit:]
+    return dict(items)
+
+
+def analyze_chunk(task):
+    """
+    Wertet einen Abschnitt aus: task = (backend, pfad, von, bis).
+
+    Zählt je Eintrag einmal: Wörter (Dokumenthäufigkeit), Wortpaare im selben Eintrag
+    (Kookkurrenz) und Phrasen aus 2–3 aufeinanderfolgenden Wörtern, die nicht mit einem
+    Füllwort beginnen oder enden. Was im Abschnitt nur einmal vorkommt, wird verworfen.
+    """
+    backend, path, lo, hi = task
+    rows = _iter_sqlite(path, lo, hi) if backend == "sqlite" else _iter_journal(path, lo, hi)
+    terms, pairs, phrases = Counter(), Counter(), Counter()
+    entries = 0
+    for raw in rows:
+        text = entry_text(raw)
+        if text is None:
+            continue
+        tokens = tokenize(text)
+        if not tokens:
+            continue
+        entries += 1
+        content = list(dict.fromkeys(w for w in tokens if w not in STOPWORDS))[:MAX_TERMS_PER_ENTRY]
+        terms.update(content)
+        pairs.update(combinations(sorted(content), 2))
+        found = set()
+        for n in PHRASE_LENGTHS:
+            for i in range(len(tokens) - n + 1):
+                if tokens[i] in STOPWORDS or tokens[i + n - 1] in STOPWORDS:
+                    continue
+                found.add(" ".join(tokens[i:i + n]))
+        phrases.update(found)
+    return {"entries": entries, "terms": _prune(terms, PARTIAL_LIMIT),
+            "pairs": _prune(pairs, PARTIAL_LIMIT), "phrases": _prune(phrases, PARTIAL_LIMIT)}
+
+
+# -------------------------------
+# Planung und Reduce
+# -------------------------------
+def plan_chunks(backend, path, start, end, chunk_bytes=CHUNK_BYTES, chunk_rows=CHUNK_ROWS):
+    """Zerlegt den Archiv-Bereich zwischen den Cursorn start und end in Aufgaben für analyze_chunk()."""
+    step = chunk_rows if backend == "sqlite" else chunk_bytes
+    return [(backend, path, lo, min(lo + step, end)) for lo in range(start, end, step)]
+
+
+def new_totals():
+    return {"entries": 0, "terms": Counter(), "pairs": Counter(), "phrases": Counter()}
+
+
+def merge_partial(totals, partial):
+    """Addiert ein Teilergebnis; wächst eine Zählung über TOTAL_LIMIT, bleiben die häufigsten."""
+    totals["entries"] += partial["entries"]
+    for key in ("terms", "pairs", "phrases"):
+        counter = totals[key]
+        counter.update(partial[key])
+        if len(counter) > TOTAL_LIMIT:
+            totals[key] = Counter(dict(counter.most_common(TOTAL_LIMIT // 2)))
+    return totals
+
+
+def cluster_topics(terms, pairs, entries, top_terms=200, min_pair=3, min_npmi=0.25, max_size=8, n_topics=8):
+    """
+    Themen aus dem Kookkurrenz-Graphen der häufigsten Wörter.
+
+    Kantengewicht ist die normierte PMI (1 = treten nur gemeinsam auf, 0 = unabhängig).
+    Die stärksten Kanten werden der Reihe nach per Union-Find verbunden, ein Thema
+    wächst dabei höchstens auf max_size Wörter (sonst verschmilzt alles über häufige
+    Allerweltswörter zu einem Klumpen). Ergebnis: Wortlisten, häufigstes Wort zuerst.
+    """
+    if entries <= 0:
+        return []
+    vocab = {w: n for w, n in terms.most_common(top_terms)}
+    edges = []
+    for (a, b), n in pairs.items():
+        if n < min_pair or a not in vocab or b not in vocab:
+            continue
+        p_ab = n / entries
+        if p_ab >= 1.0:
+            continue
+        npmi = math.log(n * entries / (vocab[a] * vocab[b])) / -math.log(p_ab)
+        if npmi >= min_npmi:
+            edges.append((npmi, n, a, b))
+    edges.sort(reverse=True)
+
+    parent, size = {}, {}
+
+    def find(w):
+        while parent[w] != w:
+            parent[w] = parent[parent[w]]
+            w = parent[w]
+        return w
+
+    for _, _, a, b in edges:
+        for w in (a, b):
+            if w not in parent:
+                parent[w], size[w] = w, 1
+        ra, rb = find(a), find(b)
+        if ra == rb or size[ra] + size[rb] > max_size:
+            continue
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        parent[rb] = ra
+        size[ra] += size[rb]
+
+    groups = {}
+    for w in parent:
+        groups.setdefault(find(w), []).append(w)
+    topics = [sorted(g, key=lambda w: (-vocab[w], w)) for g in groups.values() if len(g) >= 2]
+    topics.sort(key=lambda g: -sum(vocab[w] for w in g))
+    return topics[:n_topics]
+
+
+def recurring_phrases(phrases, min_count=3, n=10):
+    """Häufigste Phrasen; eine 2-Wort-Phrase entfällt, wenn eine längere sie gleich oft enthält."""
+    ranked = [(p, c) for p, c in phrases.most_common(n * 4) if c >= min_count]
+    result = []
+    for phrase, count in ranked:
+        if any(phrase in longer and phrase != longer and count == c for longer, c in ranked):
+            continue
+        result.append((phrase, count))
+        if len(result) >= n:
+            break
+    return result
+
+
+def summarize(totals):
+    """Verdichtet die zusammengeführten Zählungen zum Ergebnis für die Engine."""
+    terms, pairs = totals["terms"], totals["pairs"]
+    return {
+        "entries": totals["entries"],
+        "terms": terms.most_common(20),
+        "pairs": [(a, b, n) for (a, b), n in pairs.most_common(20)],
+        "topics": cluster_topics(terms, pairs, totals["entries"]),
+        "phrases": recurring_phrases(totals["phrases"]),
+        "finished": str(datetime.datetime.now()),
+    }
+
+
+# -------------------------------
+# Prozess-Pool (einer je Prozess, geteilt von allen Engines/Sitzungen)
+# -------------------------------
+def get_executor(workers=0):
+    """
+    Gemeinsamer ProcessPoolExecutor ("spawn": die Worker erben keine Threads, Locks oder
+    offenen Dateien der App). None, wo Multiprocessing fehlt (z.B. Android) – dann
+    rechnet der Analyse-Thread die Abschnitte selbst.
+
+    workers=0: DEFAULT_WORKERS Prozesse – Wörter zählen braucht keinen Prozess je Kern.
+    Jeder Worker importiert das Hauptmodul erneut; main.py lädt deshalb selbst kein Kivy.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            try:
+                workers = workers or min(DEFAULT_WORKERS, os.cpu_count() or 1)
+                _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            except (ImportError, NotImplementedError, OSError, ValueError) as e:
+                _log_error("Kein Prozess-Pool verfügbar – Analyse läuft im Hintergrund-Thread", e)
+                _executor = False
+        return _executor or None
+
+
+def shutdown_executor():
+    """Beendet den gemeinsamen Pool (App-/Dienst-Ende); ein späterer Auftrag legt neu an."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _discard_executor(executor):
+    """Defekten Pool verwerfen (abgestürzter Worker, Spawn-/Pickle-/OS-Fehler); der nächste Auftrag legt neu an."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ArchiveAnalytics:
+    """
+    Hintergrund-Analyse des Archivs für die Ziele der DecisionEngine.
+
+    request() plant die Abschnitte seit dem letzten Lauf und startet einen Analyse-Thread,
+    der sie auf den Prozess-Pool verteilt und die Teilergebnisse zusammenführt; die
+    Engine fragt mit poll() (O(1)) nach, ob ein Ergebnis fertig ist. Es läuft immer
+    höchstens ein Auftrag. Die Zählungen bleiben zwischen den Läufen erhalten, deshalb
+    kostet ein Folgeauftrag nur so viel wie seither ins Archiv gekommen ist; nach einer
+    Kompaktierung (Cursor hinter dem Dateiende oder cursor_mark passt nicht mehr) wird
+    neu gezählt.
+
+    request()/poll()/close() gehören dem Thread der Engine, der Analyse-Thread fasst
+    nur _totals und _finished an.
+    """
+
+    def __init__(self, archive, workers=0, interval=600.0, chunk_bytes=CHUNK_BYTES, chunk_rows=CHUNK_ROWS):
+        self.archive = archive
+        self.workers = workers
+        self.interval = interval
+        self.chunk_bytes = chunk_bytes
+        self.chunk_rows = chunk_rows
+        self.latest = None          # letztes fertiges Ergebnis (summarize())
+        self._totals = new_totals()
+        self._cursor = 0
+        self._mark = 0              # cursor_mark(_cursor)
+        self._thread = None
+        self._finished = None
+        self._started = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def is_stale(self):
+        """Kein Ergebnis oder älter als interval Sekunden."""
+        return self._started is None or time.monotonic() - self._started >= self.interval
+
+    def request(self):
+        """Startet einen Auftrag, falls keiner läuft und das letzte Ergebnis veraltet ist; True = gestartet."""
+        if self.running or not self.is_stale():
+            return False
+        try:
+            backend = "sqlite" if self.archive.backend == "sqlite" else "journal"
+            end = self.archive.end_cursor() or 0
+            if end < self._cursor or self.archive.cursor_mark(self._cursor) != self._mark:
+                # Kompaktierung: die Offsets haben sich verschoben, alles neu zählen
+                self._totals, self._cursor = new_totals(), 0
+            mark = self.archive.cursor_mark(end)
+            tasks = plan_chunks(backend, self.archive.store.path, self._cursor, end,
+                                self.chunk_bytes, self.chunk_rows)
+        except Exception as e:
+            _log_error("Fehler beim Planen der Archiv-Analyse", e)
+            return False
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, args=(tasks, end, mark), name="AureliaAnalytics",
+                                        daemon=True)
+        self._thread.start()
+        return True
+
+    def poll(self):
+        """Das neu fertige Ergebnis (einmalig) oder None."""
+        if self._thread is None:
+            return None
+        alive = self._thread.is_alive()
+        with self._lock:
+            result, self._finished = self._finished, None
+        if result is None and alive:
+            return None
+        self._thread = None
+        if result is not None:
+            self.latest = result
+        return result
+
+    def close(self):
+        """Bricht einen laufenden Auftrag ab (noch nicht gestartete Abschnitte entfallen)."""
+        self._cancel.set()
+
+    def _run(self, tasks, end, mark):
+        t0 = time.perf_counter()
+        totals = {"entries": self._totals["entries"], "terms": Counter(self._totals["terms"]),
+                  "pairs": Counter(self._totals["pairs"]), "phrases": Counter(self._totals["phrases"])}
+        executor = get_executor(self.workers) if tasks else None
+        done = set()  # Indizes der schon eingerechneten Abschnitte
+        if executor is not None:
+            futures = {}
+            try:
+                for i, task in enumerate(tasks):
+                    futures[executor.submit(analyze_chunk, task)] = i
+                for future in as_completed(futures):
+                    if self._cancel.is_set():
+                        for f in futures:
+                            f.cancel()
+                        return
+                    merge_partial(totals, future.result())
+                    done.add(futures[future])
+            except Exception as e:
+                # Pool unbrauchbar (BrokenProcessPool, Spawn-/Pickle-/OS-Fehler): verwerfen und
+                # den Rest hier im Thread rechnen, statt bei jedem Auftrag erneut zu scheitern
+                _log_error("Prozess-Pool ausgefallen – restliche Abschnitte im Analyse-Thread", e)
+                for f in futures:
+                    f.cancel()
+                _discard_executor(executor)
+        try:
+            for i, task in enumerate(tasks):
+                if i in done:
+                    continue
+                if self._cancel.is_set():
+                    return
+                merge_partial(totals, analyze_chunk(task))
+        except Exception as e:
+            _log_error("Fehler bei der Archiv-Analyse", e)
+            return
+        self._totals, self._cursor, self._mark = totals, end, mark
+        result = summarize(totals)
+        result["chunks"] = len(tasks)
+        result["seconds"] = round(time.perf_counter() - t0, 3)
+        with self._lock:
+            self._finished = result
@@ -0,0 +1,190 @@
+# association_store.py – Begrenzter Speicher für Wort-Assoziationen
+import os
+import json
+import heapq
+import random
+
+
+class AssociationStore:
+    """
+    Wort → Gewicht mit Obergrenze, Zerfall, Top-K-Index und O(1)-Zufallsauswahl.
+
+    Zerfall: Jedes add() multipliziert alle Gewichte mit `decay`. Das geschieht
+    nicht pro Eintrag, sondern über einen gemeinsamen Skalierungsfaktor, deshalb
+    bleibt ein add() O(1). Häufige und kürzlich gesehene Wörter haben so das höchste
+    Gewicht. Wird `capacity` um 10 % überschritten, fliegen die schwächsten
+    Einträge gesammelt raus.
+
+    Top-K: Ein Min-Heap über die aktuell stärksten `top_k` Wörter wird bei jedem
+    add() in O(log K) nachgeführt. Da der Zerfall alle Gewichte gleich skaliert,
+    ändert er die Reihenfolge nicht.
+
+    Persistenz: kompakte Textdatei (eine Zeile "wort<TAB>gewicht"), getrennt von
+    aurelia_state.json. `checkpoint` (z.B. bis wohin das Archiv schon eingerechnet
+    ist) steht als erste Zeile "#!checkpoint<TAB>{json}" in derselben Datei, damit
+    Gewichte und Checkpoint immer zusammen geschrieben werden.
+    """
+    FILENAME = "aurelia_associations.tsv"
+    CHECKPOINT_TAG = "#!checkpoint"
+
+    def __init__(self, capacity=5000, top_k=32, decay=0.9995):
+        self.capacity = capacity
+        self.top_k = top_k
+        self.decay = decay
+        self.dirty = False
+        self.checkpoint = None
+        self._raw = {}          # word -> Gewicht / _scale
+        self._words = []        # für O(1)-Zufallsauswahl
+        self._index = {}        # word -> Position in _words
+        self._scale = 1.0
+        self._top_heap = []     # (raw, word), genau ein Eintrag je Top-Wort
+        self._top_members = set()
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __contains__(self, word):
+        return word in self._raw
+
+    def get(self, word, default=0.0):
+        raw = self._raw.get(word)
+        return default if raw is None else raw * self._scale
+
+    # ---------- Schreiben ----------
+    def add(self, word, amount=1.0, decay=True):
+        if not word:
+            return
+        if decay:
+            self._scale *= self.decay
+            if self._scale < 1e-200:
+                self._renormalize()
+        raw = self._raw.get(word)
+        if raw is None:
+            self._index[word] = len(self._words)
+            self._words.append(word)
+            raw = 0.0
+        raw += amount / self._scale
+        self._raw[word] = raw
+        self._update_top(word, raw)
+        self.dirty = True
+        if len(self._raw) > self.capacity * 1.1:
+            self._evict(len(self._raw) - self.capacity)
+
+    def update(self, mapping):
+        """Übernimmt ein altes {wort: gewicht}-Dict (Migration aus aurelia_state.json)."""
+        for word, weight in mapping.items():
+            try:
+                self.add(str(word), float(weight), decay=False)
+            except (TypeError, ValueError):
+                continue
+
+    def _renormalize(self):
+        for word in self._raw:
+            self._raw[word] *= self._scale
+        self._scale = 1.0
+        self._rebuild_top()
+
+    def _update_top(self, word, raw):
+        if word in self._top_members:
+            return  # Heap-Eintrag ist veraltet (zu klein) und wird bei Bedarf korrigiert
+        if len(self._top_members) < self.top_k:
+            heapq.heappush(self._top_heap, (raw, word))
+            self._top_members.add(word)
+            return
+        while True:
+            low_raw, low_word = self._top_heap[0]
+            current = self._raw[low_word]
+            if low_raw == current:
+                break
+            heapq.heapreplace(self._top_heap, (current, low_word))
+        if raw > low_raw:
+            heapq.heapreplace(self._top_heap, (raw, word))
+            self._top_members.discard(low_word)
+            self._top_members.add(word)
+
+    def _rebuild_top(self):
+        best = heapq.nlargest(self.top_k, self._raw.items(), key=lambda kv: kv[1])
+        self._top_heap = [(raw, word) for word, raw in best]
+        heapq.heapify(self._top_heap)
+        self._top_members = {word for word, _ in best}
+
+    def _evict(self, n):
+        candidates = (w for w in self._raw if w not in self._top_members)
+        for word in heapq.nsmallest(n, candidates, key=self._raw.get):
+            self._remove(word)
+
+    def _remove(self, word):
+        del self._raw[word]
+        pos = self._index.pop(word)
+        last = self._words.pop()
+        if last != word:
+            self._words[pos] = last
+            self._index[last] = pos
+
+    # ---------- Lesen ----------
+    def top(self, n=6):
+        """Die n stärksten Wörter als [(wort, gewicht), ...] (n <= top_k)."""
+        best = sorted(self._top_members, key=self._raw.get, reverse=True)[:n]
+        return [(w, self._raw[w] * self._scale) for w in best]
+
+    def sample(self):
+        """Gleichverteilt zufälliges Wort in O(1); None, wenn leer."""
+        if not self._words:
+            return None
+        return self._words[random.randrange(len(self._words))]
+
+    def sample_weighted(self, max_tries=32):
+        """Wort proportional zum Gewicht (Rejection-Sampling gegen das Maximum)."""
+        if not self._words:
+            return None
+        max_raw = max(self._raw[w] for w in self._top_members)
+        for _ in range(max_tries):
+            word = self._words[random.randrange(len(self._words))]
+            if random.random() * max_raw <= self._raw[word]:
+                return word
+        return self.sample()
+
+    # ---------- Persistenz ----------
+    def save(self, base_path):
+        path = os.path.join(base_path, self.FILENAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if self.checkpoint is not None:
+                f.write(f"{self.CHECKPOINT_TAG}\t{json.dumps(self.checkpoint)}\n")
+            for word, raw in self._raw.items():
+                f.write(f"{word}\t{raw * self._scale:.6g}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self.dirty = False
+
+    def load(self, base_path):
+        """Lädt die Datei, falls vorhanden. Gibt False zurück, wenn es keine gibt."""
+        path = os.path.join(base_path, self.FILENAME)
+        if not os.path.exists(path):
+            return False
+        self._raw, self._words, self._index = {}, [], {}
+        self._scale = 1.0
+        self.checkpoint = None
+        with open(path, "r", encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                word, _, weight = line.rstrip("\n").rpartition("\t")
+                if not word:
+                    continue
+                if i == 0 and word == self.CHECKPOINT_TAG:
+                    try:
+                        self.checkpoint = json.loads(weight)
+                    except ValueError:
+                        pass
+                    continue
+                try:
+                    value = float(weight)
+                except ValueError:
+                    continue
+                if word not in self._raw:
+                    self._index[word] = len(self._words)
+                    self._words.append(word)
+                self._raw[word] = value
+        self._rebuild_top()
+        self.dirty = False
+        return True
@@ -0,0 +1,414 @@
+# aurelia_app.py – Kivy-UI und App-Start (gestartet über main.py)
+import time
+_T0 = time.perf_counter()  # Bezugspunkt für den Startzeit-Bericht
+
+import os
+import random
+from functools import partial
+
+# nur was der erste Frame braucht; Popup & Co. werden bei Bedarf importiert
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.textinput import TextInput
+from kivy.uix.label import Label
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.button import Button
+from kivy.utils import platform
+from kivy.metrics import dp
+from resource_manager import ResourceManager
+from aurelia_logging import configure_logging, shutdown_logging
+from aurelia_engine import log_error, load_config, EngineWorker
+from archive_analytics import shutdown_executor
+from startup_timing import StartupTimer
+
+STARTUP = StartupTimer(t0=_T0)
+STARTUP.record("imports", _T0, STARTUP.clock())
+
+
+# Android Permissions importieren, wenn Android-Plattform
+if platform == "android":
+    from android.permissions import request_permissions, Permission, check_permission
+
+# -------------------------------
+# Benutzeroberfläche (humaner)
+# -------------------------------
+def message_data(who, text):
+    """Datensatz einer Chat-Zeile für die RecycleView (who: "user", "aurelia" oder "system")."""
+    # if text contains timestamp at start in format [YYYY-..], remove it for display
+    if text.startswith("[") and "]" in text:
+        text = text.split("]", 1)[1].strip()
+    # adapt look by who using markup colors
+    if who == "user":
+        color = (0.06, 0.45, 0.9, 1)  # bluish
+        prefix = "[b]👤 Du:[/b] "
+    elif who == "aurelia":
+        color = (0.55, 0.2, 0.7, 1)  # purple
+        prefix = "[b]🌸 Aurelia:[/b] "
+    else:
+        color = (0.4, 0.4, 0.4, 1)
+        prefix = "[b]…[/b] "
+    return {"text": f"{prefix}{text}", "color": color}
+
+
+class MessageLabel(RecycleDataViewBehavior, Label):
+    """
+    Wiederverwendete Zeile der Chat-RecycleView; Text und Farbe kommen aus message_data().
+
+    Der Text bricht an der Zeilenbreite um (text_size folgt width), die Höhe folgt der
+    gerenderten Textur. Die gemessene Höhe landet als "height" im Datensatz, damit die
+    Zeile beim Wiederverwenden und Scrollen gleich mit der richtigen Höhe eingeplant wird.
+    """
+    MIN_HEIGHT = dp(40)
+    PADDING = dp(8)
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("markup", True)
+        kwargs.setdefault("size_hint_y", None)
+        kwargs.setdefault("height", self.MIN_HEIGHT)
+        kwargs.setdefault("halign", "left")
+        kwargs.setdefault("valign", "middle")
+        super().__init__(**kwargs)
+        self._rv = None
+        self._index = None
+        self.bind(width=self._wrap, texture_size=self._fit_height)
+
+    def refresh_view_attrs(self, rv, index, data):
+        self._rv, self._index = rv, index
+        return super().refresh_view_attrs(rv, index, data)
+
+    def _wrap(self, *args):
+        self.text_size = (max(0, self.width - 2 * self.PADDING), None)
+
+    def _fit_height(self, *args):
+        height = max(self.MIN_HEIGHT, self.texture_size[1] + self.PADDING)
+        self.height = height
+        rv, index = self._rv, self._index
+        if rv is not None and index is not None and index < len(rv.data):
+            # nur merken, kein neues Layout: die RecycleView sieht die Größenänderung selbst
+            rv.data[index]["height"] = height
+
+
+class AureliaUI(BoxLayout):
+    def __init__(self, worker, **kwargs):
+        try:
+            super().__init__(orientation="vertical", spacing=8, padding=8, **kwargs)
+            # Engine, Kontext und Archiv leben im EngineWorker-Thread
+            self.worker = worker
+            self._personality = {}
+            # ID des zuletzt gerenderten Gedankens (ThoughtStream vergibt fortlaufende IDs)
+            self._last_thought_id = 0
+
+            # top: small status row with "thinking" indicator
+            status = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(36))
+            self.status_label = Label(text="Aurelia wacht auf …", size_hint_x=0.8, halign="left", valign="middle")
+            self.status_label.bind(size=lambda *a: None)
+            self.thinking_label = Label(text="", size_hint_x=0.2, halign="right", valign="middle")
+            status.add_widget(self.status_label)
+            status.add_widget(self.thinking_label)
+            self.add_widget(status)
+
+            # scroll area with messages: RecycleView hält nur die sichtbaren Zeilen als Widgets,
+            # der Verlauf selbst liegt als Liste von Dicts in self.scroll.data
+            self.scroll = RecycleView(size_hint=(1, 1), do_scroll_x=False)
+            self.scroll.viewclass = MessageLabel
+            self.msg_layout = RecycleBoxLayout(orientation="vertical", size_hint_y=None,
+                                               default_size=(None, dp(40)), default_size_hint=(1, None),
+                                               spacing=dp(6), padding=dp(6))
+            self.msg_layout.bind(minimum_height=self.msg_layout.setter("height"))
+            self.scroll.add_widget(self.msg_layout)
+            self.scroll.bind(scroll_y=self._on_scroll)
+            self.add_widget(self.scroll)
+            # Blättern im Archiv: Cursor auf den ältesten geladenen Eintrag
+            self._archive_cursor = None
+            self._archive_exhausted = False
+            self._loading_older = False
+
+            # input area
+            input_row = BoxLayout(size_hint_y=None, height=dp(56), spacing=6)
+            self.input_field = TextInput(size_hint_x=0.78, multiline=False, hint_text="Schreibe an Aurelia...")
+            send_btn = Button(text="Senden", size_hint_x=0.22)
+            send_btn.bind(on_release=lambda *a: self.on_send())
+            self.input_field.bind(on_text_validate=lambda *a: self.on_send())
+            input_row.add_widget(self.input_field)
+            input_row.add_widget(send_btn)
+            self.add_widget(input_row)
+
+            # a small typing indicator timer state
+            self._is_thinking = False
+            self._think_clock_ev = None
+
+            # kein Polling: der Event-Bus weckt die UI, sobald neue Ereignisse anliegen
+            self._refresh_trigger = Clock.create_trigger(lambda dt: self._refresh_ui())
+            self.worker.events.set_wake(self._refresh_trigger)
+        except Exception as e:
+            log_error("Fehler beim Erstellen der AureliaUI", e)
+
+    # ---------- UI helpers ----------
+    def _load_initial_history(self, history):
+        try:
+            self.scroll.data = [message_data(who, text) for who, text in history["items"]] + self.scroll.data
+            self._archive_cursor = history["cursor"]
+            self._archive_exhausted = history["cursor"] is None
+            Clock.schedule_once(lambda dt: self._scroll_to_bottom(), 0.02)
+        except Exception as e:
+            log_error("Fehler beim Laden der Historie", e)
+
+    def _prepend_older(self, page):
+        try:
+            older = [message_data(who, text) for who, text in page["items"]]
+            self._archive_cursor = page["cursor"]
+            self._archive_exhausted = page["cursor"] is None
+            if older:
+                total = len(older) + len(self.scroll.data)
+                self.scroll.data = older + self.scroll.data
+                # Ansicht ungefähr an der bisherigen obersten Zeile halten
+                self.scroll.scroll_y = 1.0 - len(older) / float(total)
+        except Exception as e:
+            log_error("Fehler beim Nachladen älterer Nachrichten", e)
+        finally:
+            self._loading_older = False
+
+    def _on_scroll(self, instance, value):
+        # oben angekommen: nächsten älteren Block aus dem Archiv anfordern
+        if value >= 0.999 and self.scroll.data and not self._loading_older and not self._archive_exhausted:
+            self._loading_older = True
+            self.worker.submit("older", self._archive_cursor)
+
+    def _add_message(self, who, text):
+        try:
+            self.scroll.data.append(message_data(who, text))
+            # keep scroll at the newest message
+            Clock.schedule_once(lambda dt: self._scroll_to_bottom(), 0.02)
+        except Exception as e:
+            log_error("Fehler beim Hinzufügen einer Nachricht", e)
+
+    def _scroll_to_bottom(self):
+        try:
+            # newest messages are at the bottom
+            self.scroll.scroll_y = 0.0
+        except Exception:
+            pass
+
+    # ---------- thinking indicator ----------
+    def _set_thinking(self, val=True):
+        try:
+            if val and not self._is_thinking:
+                self._is_thinking = True
+                self.thinking_label.text = "schreibt..."
+                # simple pulsate via changing text (could animate)
+                self._think_clock_ev = Clock.schedule_interval(self._pulse_thinking, 0.6)
+            elif not val and self._is_thinking:
+                self._is_thinking = False
+                if self._think_clock_ev:
+                    self._think_clock_ev.cancel()
+                self.thinking_label.text = ""
+        except Exception as e:
+            log_error("Fehler beim Setzen des Thinking-Indikators", e)
+
+    def _pulse_thinking(self, dt):
+        # toggles a tiny dot sequence
+        try:
+            cur = self.thinking_label.text
+            if cur.endswith("..."):
+                self.thinking_label.text = "schreibt"
+            else:
+                self.thinking_label.text = cur + "."
+        except Exception:
+            pass
+
+    # ---------- send / receive workflow ----------
+    def on_send(self):
+        try:
+            text = self.input_field.text.strip()
+            if not text:
+                return
+            self.input_field.text = ""
+            self._submit_user_text(text)
+        except Exception as e:
+            log_error("Fehler beim Senden", e)
+
+    def _submit_user_text(self, text):
+        # show user message immediately
+        self._add_message("user", text)
+        # Speichern und Antworten in einem Schritt im Worker; die Antwort kommt als "reply"
+        self.worker.submit("user_message", text)
+        # set thinking indicator; the reply is shown after a small realistic delay
+        self._set_thinking(True)
+        # small realistic delay based on personality curiosity
+        delay = max(0.4, 1.0 - self._personality.get("curiosity", 0.7))
+        delay += random.uniform(0.2, 0.9)
+        self._reply_due = time.monotonic() + delay
+
+    def _show_reply(self, antwort):
+        # Antwort frühestens nach der "Tipp"-Verzögerung aus on_send zeigen
+        remaining = getattr(self, "_reply_due", 0) - time.monotonic()
+        if remaining > 0:
+            Clock.schedule_once(lambda dt: self._show_reply(antwort), remaining)
+            return
+        try:
+            if antwort:
+                self._add_message("aurelia", antwort)
+            self._set_thinking(False)
+        except Exception as e:
+            log_error("Fehler beim Erzeugen der Antwort", e)
+            self._set_thinking(False)
+
+    def _show_decision_popup(self, question, dt):
+        try:
+            content = BoxLayout(orientation='vertical', spacing=8, padding=8)
+            lbl = Label(text=question, size_hint_y=None, height=dp(80))
+            btn_row = BoxLayout(size_hint_y=None, height=dp(48), spacing=8)
+            yes = Button(text="Ja")
+            no = Button(text="Nein")
+            btn_row.add_widget(yes)
+            btn_row.add_widget(no)
+            content.add_widget(lbl)
+            content.add_widget(btn_row)
+            from kivy.uix.popup import Popup
+            popup = Popup(title="Aurelia fragt", content=content, size_hint=(0.9, 0.4))
+            yes.bind(on_release=lambda *a: self._popup_answer(popup, "Ja", question))
+            no.bind(on_release=lambda *a: self._popup_answer(popup, "Nein", question))
+            popup.open()
+        except Exception as e:
+            log_error("Fehler beim Zeigen des Popups", e)
+
+    def _popup_answer(self, popup, answer_text, question):
+        try:
+            popup.dismiss()
+            # die Antwort läuft wie eine getippte Nachricht durch process_input (Archiv, Kontext, "reply")
+            self._submit_user_text(answer_text)
+        except Exception as e:
+            log_error("Fehler beim Verarbeiten der Popup-Antwort", e)
+
+    # ---------- periodic UI refresh ----------
+    def _refresh_ui(self):
+        try:
+            for kind, payload in self.worker.drain_events():
+                if kind == "ready":
+                    self._personality = payload.get("personality", {})
+                    self.status_label.text = "Aurelia — bereit"
+                elif kind == "started":
+                    # Worker vollständig aufgebaut (inkl. Seeding): Startzeiten einmal loggen
+                    self.worker.timer.mark("ui_started")
+                    self.worker.timer.report()
+                elif kind == "history":
+                    self._load_initial_history(payload)
+                elif kind == "older":
+                    self._prepend_older(payload)
+                elif kind == "reply":
+                    self._show_reply(payload)
+                elif kind == "popup":
+                    Clock.schedule_once(partial(self._show_decision_popup, payload), 0.1)
+                elif kind == "thought":
+                    thought_id, display = payload
+                    if thought_id <= self._last_thought_id:
+                        continue
+                    self._last_thought_id = thought_id
+                    if display.startswith("[") and "]" in display:
+                        display = display.split("]", 1)[1].strip()
+                    who = "aurelia" if ("Aurelia" in display or "Aurelia:" in display) else "system"
+                    self._add_message(who, display)
+            # Rest des Schubs im nächsten Frame abholen
+            if len(self.worker.events):
+                self._refresh_trigger()
+        except Exception as e:
+            log_error("Fehler beim Auffrischen der UI", e)
+
+
+# -------------------------------
+# Android Berechtigungen prüfen und anfragen
+# -------------------------------
+def check_and_request_permissions():
+    if platform == "android":
+        required_permissions = [
+            Permission.READ_EXTERNAL_STORAGE,
+            Permission.WRITE_EXTERNAL_STORAGE,
+            Permission.FOREGROUND_SERVICE,
+        ]
+        missing = [p for p in required_permissions if not check_permission(p)]
+
+        if missing:
+            request_permissions(missing)
+            print("[AURELIA] Fehlende Berechtigungen angefragt")
+        else:
+            print("[AURELIA] Alle Berechtigungen bereits erteilt")
+    else:
+        print("[AURELIA] Keine Android-Plattform, keine Berechtigungen erforderlich")
+
+
+# -------------------------------
+# App-Start
+# -------------------------------
+class AureliaApp(App):
+    def build(self):
+        try:
+            with STARTUP.phase("config"):
+                check_and_request_permissions()
+                self.app_config = load_config()  # App.config gehört Kivy (ConfigParser)
+                configure_logging(self.app_config.get("logging"))
+                base = os.path.join(os.getenv('EXTERNAL_STORAGE', '/sdcard'), "Aurelia")
+                if not os.path.exists(base):
+                    os.makedirs(base, exist_ok=True)
+
+            # CPU/RAM/I/O werden im Hintergrund gemessen; bei Überlast drosselt der Worker.
+            # Der Sampler (und der psutil-Import) startet erst nach dem ersten Frame.
+            self.resources = ResourceManager(
+                cpu_limit=self.app_config.get("cpu_limit", 50),
+                ram_limit=self.app_config.get("ram_limit"),
+                ram_growth_limit=self.app_config.get("ram_growth_limit", 256 * 1024 ** 2)
+            )
+
+            # Engine, Kontext und Archiv laufen im Hintergrund-Thread (inkl. Ticks alle 3 s);
+            # der Aufbau läuft parallel zum ersten Frame, die UI füllt sich per Ereignis
+            self.worker = EngineWorker(base, self.app_config, tick_interval=3.0,
+                                       resources=self.resources, timer=STARTUP)
+            self.worker.start()
+            with STARTUP.phase("build_ui"):
+                self.ui = AureliaUI(self.worker)
+            Clock.schedule_once(self._on_first_frame, 0)
+
+            return self.ui
+        except Exception as e:
+            log_error("Fehler beim Starten der App", e)
+            return Label(text="Fehler beim Starten der App")
+
+    def _on_first_frame(self, dt):
+        STARTUP.mark("first_frame")
+        self.resources.start()
+
+    def update_ui(self):
+        try:
+            self.worker.submit("tick")
+            self.ui._refresh_ui()
+        except Exception as e:
+            log_error("Fehler beim UI-Update", e)
+
+    def on_stop(self):
+        # Worker beendet sich sauber: State flushen, Kontext-Snapshot, Journal-fsyncs
+        worker = getattr(self, "worker", None)
+        if worker:
+            worker.stop()
+        resources = getattr(self, "resources", None)
+        if resources:
+            resources.stop()
+        shutdown_executor()
+        shutdown_logging()
+
+
+# -------------------------------
+# Start
+# -------------------------------
+def main():
+    # Standard-Logging bis build() die Einstellungen aus config.json übernimmt
+    configure_logging()
+    try:
+        AureliaApp().run()
+    except Exception as e:
+        log_error("Fehler im Hauptprogramm", e)
+
+
+if __name__ == "__main__":
+    main()
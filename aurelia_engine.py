@@ -0,0 +1,1084 @@
+# aurelia_engine.py – Engine ohne Kivy: Kontext, Archiv, NLU, DecisionEngine, Gedanken-Stream, Worker
+import os
+import json
+import math
+import random
+import datetime
+import queue
+import threading
+import time
+
+from aurelia_logging import get_logger
+from thought_journal import ThoughtJournal
+from persistence import DebouncedWriter, UnitOfWork, read_snapshot, write_snapshot
+from serializers import get_serializer
+from association_store import AssociationStore
+from goal_scheduler import GoalScheduler
+from experience_log import ExperienceLog
+from intent_matcher import IntentMatcher
+from tokenizer import normalize_words, count_tokens
+from thought_stream import ThoughtStream
+from recall_index import RecallIndex
+from archive_analytics import ArchiveAnalytics
+from event_bus import EventBus, THOUGHT, REPLY, POPUP, GOAL, REFLECTION, HISTORY, OLDER, READY, STARTED
+from startup_timing import StartupTimer
+
+
+# -------------------------------
+# Fehler-Logging (global)
+# -------------------------------
+_log = get_logger("engine")
+
+
+def log_error(message, exception=None):
+    # nur einreihen: Datei-I/O, Rotation und Dedupe übernimmt aurelia_logging im eigenen Thread
+    _log.error(message, exc_info=exception)
+
+
+def load_config():
+    """Liest config.json neben main.py; fehlende Datei oder Fehler → leere Config."""
+    try:
+        cfg_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+        with open(cfg_path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except Exception as e:
+        log_error("Fehler beim Laden der config.json", e)
+        return {}
+
+
+# -------------------------------
+# Kontext- / Memory-Manager
+# -------------------------------
+class ContextManager:
+    """
+    Hält Gesprächs-Kontext & Kurz-/Langzeitgedächtnis.
+
+    context.json ist ein periodischer Snapshot mit Prüfsumme; jede neue Nachricht wird
+    nur an context_messages.jsonl angehängt und beim Laden auf den Snapshot nachgespielt.
+    Beim Snapshot wandert der alte Stand nach context.json.bak und das Journal nach
+    context_messages.prev.jsonl. Ist context.json defekt oder nicht dekodierbar, wird
+    vom Backup aus über beide Journale nachgespielt – es geht nichts verloren. Scheitert
+    das Laden ganz, schreibt diese Sitzung keinen Snapshot (die Dateien bleiben, wie sie
+    sind; neue Nachrichten landen nur im Journal).
+    Langzeit-Erinnerungen jenseits von LONG_HOT_MAX Einträgen oder LONG_MAX_AGE_DAYS
+    Tagen wandern beim Snapshot nach context_long_cold.jsonl.
+    """
+    FILENAME = "context.json"
+    MESSAGES_FILENAME = "context_messages.jsonl"
+    PREV_MESSAGES_FILENAME = "context_messages.prev.jsonl"
+    COLD_FILENAME = "context_long_cold.jsonl"
+    SNAPSHOT_EVERY = 200
+    LONG_HOT_MAX = 1000
+    LONG_MAX_AGE_DAYS = 30
+
+    def __init__(self, base_path, state_format="json"):
+        self.path = os.path.join(base_path, self.FILENAME)
+        self.state_format = state_format
+        self.state = {"conversation": [], "memory": {"short": [], "long": []}}
+        self._seq = 0
+        self._cold_seq = 0
+        self._since_snapshot = 0
+        self._batch_depth = 0
+        self._batch = []
+        self._load_failed = False
+        os.makedirs(base_path, exist_ok=True)
+        self._messages = ThoughtJournal(base_path, filename=self.MESSAGES_FILENAME, legacy_filename=None)
+        self._cold = ThoughtJournal(base_path, filename=self.COLD_FILENAME, legacy_filename=None)
+        self._prev_messages_path = os.path.join(base_path, self.PREV_MESSAGES_FILENAME)
+        # RecallIndex, sobald index_recall() gelaufen ist; danach hält push_message ihn aktuell
+        self.recall = None
+        self._load()
+
+    def _load(self):
+        try:
+            data, source = read_snapshot(self.path)
+            if isinstance(data, dict):
+                self.state = data
+            if source == "backup":
+                log_error("context.json defekt – stelle vom letzten guten Snapshot wieder her")
+            self._seq = self.state.pop("seq", 0)
+            self._cold_seq = self.state.pop("cold_seq", 0)
+            last_cold = self._cold.last(1)
+            if last_cold:
+                self._cold_seq = max(self._cold_seq, last_cold[0].get("seq", 0))
+            if source == "backup":
+                # schon ausgelagerte Langzeit-Erinnerungen nicht doppelt im Speicher halten
+                long_mem = self.state.get("memory", {}).get("long", [])
+                long_mem[:] = [e for e in long_mem if e.get("seq", 0) > self._cold_seq or "seq" not in e]
+            # Nachrichten seit dem Snapshot nachspielen (nach einem Backup auch das vorige Journal)
+            journals = [self._messages]
+            if os.path.exists(self._prev_messages_path):
+                journals.insert(0, ThoughtJournal(os.path.dirname(self._prev_messages_path),
+                                                  filename=self.PREV_MESSAGES_FILENAME, legacy_filename=None))
+            for journal in journals:
+                for entry in journal.iter_entries():
+                    if entry.get("seq", 0) > self._seq:
+                        self._apply(entry)
+                        self._seq = entry["seq"]
+                        self._since_snapshot += 1
+        except Exception as e:
+            # unvollständig geladen: ein Snapshot würde den Rest überschreiben bzw. wegrotieren
+            self._load_failed = True
+            log_error("Fehler beim Laden des ContextManager – keine Snapshots in dieser Sitzung", e)
+
+    def _save(self):
+        """Snapshot: Langzeit-Gedächtnis auslagern, context.json schreiben, Journal rotieren."""
+        if self._load_failed:
+            return
+        try:
+            self._roll_long_memory()
+            snapshot = dict(self.state, seq=self._seq, cold_seq=self._cold_seq)
+            write_snapshot(self.path, snapshot, self.state_format)
+            self._messages.rotate(self._prev_messages_path)
+            self._since_snapshot = 0
+        except Exception as e:
+            log_error("Fehler beim Speichern des ContextManager", e)
+
+    def _roll_long_memory(self):
+        long_mem = self.state.setdefault("memory", {}).setdefault("long", [])
+        cutoff = str(datetime.datetime.now() - datetime.timedelta(days=self.LONG_MAX_AGE_DAYS))
+        n_move = max(0, len(long_mem) - self.LONG_HOT_MAX)
+        # zusätzlich alles, was älter als die Altersgrenze ist (Liste ist zeitlich sortiert)
+        while n_move < len(long_mem) and str(long_mem[n_move].get("time", "")) < cutoff:
+            n_move += 1
+        if not n_move:
+            return
+        for entry in long_mem[:n_move]:
+            # nach einem Absturz zwischen Auslagern und Snapshot nichts doppelt schreiben
+            if entry.get("seq", 0) > self._cold_seq or "seq" not in entry:
+                self._cold.append(entry)
+                self._cold_seq = max(self._cold_seq, entry.get("seq", 0))
+        self._cold.sync()
+        del long_mem[:n_move]
+
+    def _apply(self, entry):
+        conversation = self.state.setdefault("conversation", [])
+        conversation.append(entry)
+        # keep last 500 messages
+        if len(conversation) > 500:
+            del conversation[:-500]
+        # update short memory
+        memory = self.state.setdefault("memory", {})
+        short = memory.setdefault("short", [])
+        short.append(entry)
+        if len(short) > 40:
+            # move oldest to long memory
+            memory.setdefault("long", []).extend(short[:10])
+            del short[:10]
+
+    def push_message(self, who, text, recall=True):
+        """recall=False: die Nachricht nicht für recall_about() indexieren (z.B. Erinnerungsfragen)."""
+        self._seq += 1
+        entry = {"who": who, "text": text, "time": str(datetime.datetime.now()), "seq": self._seq}
+        if not recall:
+            entry["recall"] = False
+        # sofort im Speicher sichtbar; ins Journal geht es direkt oder beim Commit
+        self._apply(entry)
+        if self.recall is not None:
+            self._index_entry(entry)
+        if self._batch_depth:
+            self._batch.append(entry)
+            return
+        try:
+            self._messages.append(entry)
+        except Exception as e:
+            log_error("Fehler beim Anhängen an das Kontext-Journal", e)
+        self._after_write(1)
+
+    def _after_write(self, n):
+        self._since_snapshot += n
+        if self._since_snapshot >= self.SNAPSHOT_EVERY:
+            self._save()
+
+    def begin_batch(self):
+        """Ab hier Nachrichten sammeln (siehe persistence.UnitOfWork)."""
+        self._batch_depth += 1
+
+    def commit_batch(self):
+        """Schreibt die gesammelten Nachrichten mit einem Aufruf ins Kontext-Journal."""
+        self._batch_depth -= 1
+        if self._batch_depth:
+            return
+        entries, self._batch = self._batch, []
+        if not entries:
+            return
+        try:
+            self._messages.append_many(entries)
+        except Exception as e:
+            log_error("Fehler beim Anhängen an das Kontext-Journal", e)
+        self._after_write(len(entries))
+
+    def close(self):
+        if self._since_snapshot:
+            self._save()
+        self._messages.close()
+        self._cold.close()
+
+    # ---------- Recall (invertierter Index) ----------
+    def index_recall(self, recall):
+        """
+        Nimmt das ganze Gedächtnis (ausgelagert, lang, kurz) in den RecallIndex auf und
+        hält ihn ab jetzt bei jedem push_message aktuell.
+        """
+        try:
+            memory = self.state.get("memory", {})
+            last_seq = 0
+            for entries in (self._cold.iter_entries(), memory.get("long", []), memory.get("short", [])):
+                for entry in entries:
+                    # nach einem Absturz können lang und ausgelagert überlappen: jede seq nur einmal
+                    seq = entry.get("seq", 0)
+                    if seq and seq <= last_seq:
+                        continue
+                    last_seq = max(last_seq, seq)
+                    self._index_entry(entry, recall)
+        except Exception as e:
+            log_error("Fehler beim Aufbau des Recall-Index (Kontext)", e)
+        self.recall = recall
+
+    def _index_entry(self, entry, recall=None):
+        if entry.get("recall", True):
+            recall = recall if recall is not None else self.recall
+            recall.add(entry.get("text", ""), entry.get("who"), entry.get("time"))
+
+    def recall_about(self, query, k=5):
+        """Die k zur Anfrage passendsten Erinnerungen (TF-IDF), leer ohne Index oder Treffer."""
+        if self.recall is None:
+            return []
+        try:
+            return self.recall.search(query, k)
+        except Exception as e:
+            log_error("Fehler bei der Erinnerungssuche", e)
+            return []
+
+    def recall_short(self, n=10):
+        return self.state.get("memory", {}).get("short", [])[-n:]
+
+    def recall_long(self, n=10):
+        return self.state.get("memory", {}).get("long", [])[-n:]
+
+    def recall_cold(self, n=10):
+        """Die jüngsten n ausgelagerten Langzeit-Erinnerungen."""
+        try:
+            return self._cold.last(n)
+        except Exception as e:
+            log_error("Fehler beim Lesen des Langzeit-Archivs", e)
+            return []
+
+
+# -------------------------------
+# Datenverwaltung (Archiv)
+# -------------------------------
+class ArchiveManager:
+    """
+    Gedanken-Archiv mit austauschbarem Backend:
+    "journal" (gedanken.jsonl, Standard) oder "sqlite" (gedanken.db mit Index/FTS).
+    """
+    def __init__(self, path, backend="journal"):
+        self.path = path
+        self.backend = backend
+        os.makedirs(self.path, exist_ok=True)
+        self._batch_depth = 0
+        self._batch = []
+        self.store = None
+        # RecallIndex für eigene Gedanken; gesetzt von index_recall()
+        self.recall = None
+        try:
+            if backend == "sqlite":
+                # sqlite3 nur laden, wenn das Backend gewählt ist
+                from sqlite_archive import SqliteThoughtArchive
+                self.store = SqliteThoughtArchive(self.path)
+            else:
+                # append-only JSON Lines; ein altes gedanken.json wird dabei übernommen
+                self.store = ThoughtJournal(self.path)
+        except Exception as e:
+            log_error("Fehler beim Initialisieren von ArchiveManager", e)
+        self.thoughts_file = self.store.path if self.store else os.path.join(self.path, ThoughtJournal.FILENAME)
+
+    def begin_batch(self):
+        """Ab hier sammeln (siehe persistence.UnitOfWork); jeder save_thought() wird ein eigener Eintrag."""
+        self._batch_depth += 1
+
+    def commit_batch(self):
+        """Schreibt die gesammelten Gedanken mit einem Aufruf ins Archiv."""
+        self._batch_depth -= 1
+        if self._batch_depth or not self._batch:
+            return
+        entries, self._batch = self._batch, []
+        try:
+            self.store.append_many(entries)
+        except Exception as e:
+            log_error("Fehler beim gebündelten Speichern von Gedanken", e)
+
+    def save_thought(self, thought_text):
+        try:
+            entry = {
+                "text": thought_text,
+                "timestamp": str(datetime.datetime.now())
+            }
+            if self._batch_depth:
+                self._batch.append(entry)
+                self._index_entry(entry)
+                return entry
+            self.store.append(entry)
+            self._index_entry(entry)
+            return entry
+        except Exception as e:
+            log_error("Fehler beim Speichern eines Gedankens", e)
+            return None
+
+    # Nutzernachrichten, Antworten und Fragen stehen schon über den ContextManager im Index
+    MIRRORED_PREFIXES = ("User: ", "Aurelia (Antwort): ", "Aurelia fragt: ")
+
+    def index_recall(self, recall, batch=2000):
+        """
+        Nimmt alle eigenen Gedanken des Archivs in den RecallIndex auf, einen Block je
+        Schritt (Generator: der EngineWorker arbeitet dazwischen Befehle ab). Was in der
+        Zwischenzeit gespeichert wird, steht schon in der Datei und kommt mit dem letzten
+        Block. Danach hält save_thought() den Index aktuell.
+        """
+        try:
+            cursor = None
+            while True:
+                entries, cursor = self.thoughts_after(cursor, batch)
+                if not entries:
+                    break
+                for entry in entries:
+                    self._index_entry(entry, recall)
+                yield len(entries)
+        except Exception as e:
+            log_error("Fehler beim Aufbau des Recall-Index (Archiv)", e)
+        self.recall = recall
+
+    def _index_entry(self, entry, recall=None):
+        recall = recall if recall is not None else self.recall
+        if recall is None:
+            return
+        text = str(entry.get("text", ""))
+        if text.startswith("[") and "] " in text:
+            text = text.split("] ", 1)[1]
+        if not text.startswith(self.MIRRORED_PREFIXES):
+            if text.startswith("Aurelia: "):
+                text = text[len("Aurelia: "):]
+            recall.add(text, "aurelia", entry.get("timestamp"))
+
+    def load_all_thoughts(self):
+        try:
+            return self.store.read_all()
+        except Exception as e:
+            log_error("Fehler beim Laden aller Gedanken", e)
+            return []
+
+    def recent_thoughts(self, n=20):
+        try:
+            return self.store.last(n)
+        except Exception as e:
+            log_error("Fehler beim Laden der letzten Gedanken", e)
+            return []
+
+    def page_thoughts(self, cursor=None, n=50):
+        """Blättert rückwärts: (einträge, cursor) für den nächsten, älteren Block."""
+        try:
+            return self.store.page_before(cursor, n)
+        except Exception as e:
+            log_error("Fehler beim Blättern im Archiv", e)
+            return [], None
+
+    def thoughts_after(self, cursor=None, n=1000):
+        """Blättert vorwärts: (einträge, cursor) ab cursor (None = Anfang), z.B. fürs Seeding."""
+        try:
+            return self.store.page_after(cursor, n)
+        except Exception as e:
+            log_error("Fehler beim Lesen neuer Gedanken", e)
+            return [], cursor
+
+    def end_cursor(self):
+        """Cursor hinter dem neuesten Gedanken."""
+        try:
+            return self.store.end_cursor()
+        except Exception as e:
+            log_error("Fehler beim Bestimmen des Archiv-Endes", e)
+            return None
+
+    def cursor_mark(self, cursor):
+        """Marke zu einem aufgehobenen Cursor; ändert sie sich, ist der Cursor ungültig (Kompaktierung)."""
+        try:
+            return self.store.cursor_mark(cursor)
+        except Exception as e:
+            log_error("Fehler beim Prüfen des Archiv-Cursors", e)
+            return None
+
+    def thoughts_between(self, start, end):
+        try:
+            return self.store.between(start, end)
+        except Exception as e:
+            log_error("Fehler bei der Zeitbereichs-Abfrage", e)
+            return []
+
+    def search_thoughts(self, term, limit=50):
+        try:
+            return self.store.search(term, limit)
+        except Exception as e:
+            log_error("Fehler bei der Suche im Archiv", e)
+            return []
+
+    def close(self):
+        try:
+            if self.store:
+                self.store.close()
+        except Exception as e:
+            log_error("Fehler beim Schließen des Archivs", e)
+
+
+# -------------------------------
+# Einfache NLU
+# -------------------------------
+class SimpleNLU:
+    def __init__(self, intents=None):
+        # Intent-Tabelle wird einmal zu einem Automaten kompiliert (config.json: "intents")
+        self.matcher = IntentMatcher(intents)
+
+    def interpret(self, text):
+        # ein Durchlauf liefert Intent und Wörter; normalisiert wie tokenize(text)
+        intent, words = self.matcher.match(text)
+
+        tokens = normalize_words(words)
+
+        # entities: naive noun-like extraction
+        entities = [w for w in tokens if len(w) > 3][:3]
+        return {"intent": intent, "entities": entities, "tokens": tokens}
+
+
+# -------------------------------
+# DecisionEngine (erweitert)
+# -------------------------------
+class DecisionEngine:
+    STATE_FILENAME = "aurelia_state.json"
+
+    def __init__(self, archive_manager: ArchiveManager, context_manager: ContextManager,
+                 flush_interval=2.0, max_latency=10.0, association_capacity=5000, intents=None,
+                 seed_on_init=True, state_format="json", analytics=None, goal_capacity=50,
+                 goal_half_life=86400.0, clock=time.time):
+        self.archive = archive_manager
+        self.context = context_manager
+        # optionale Hintergrund-Analyse des Archivs (archive_analytics.ArchiveAnalytics) für Analyse-Ziele
+        self.analytics = analytics
+        self.state_path = os.path.join(self.archive.path, self.STATE_FILENAME)
+        self.state_format = state_format
+        # True, wenn aurelia_state.json nicht gelesen werden konnte: dann nie darüber schreiben
+        self._state_load_failed = False
+        # Zeitquelle (Epoch-Sekunden) für Cooldown, Schreib-Bündelung, Ziele und Erfahrungen;
+        # die Simulation setzt eine eigene Uhr ein, die pro Schritt vorrückt
+        self.clock = clock
+        # höchstens ein Schreibvorgang pro Tick, egal wie viele Änderungen anfallen
+        self._state_writer = DebouncedWriter(self._save_state, flush_interval, max_latency, clock=clock,
+                                             name="DecisionEngine-State")
+        self.nlu = SimpleNLU(intents)
+        # begrenzter Assoziations-Speicher mit eigener Datei (nicht Teil von self.state)
+        self.associations = AssociationStore(capacity=association_capacity)
+        # Ziele im Prioritäts-Heap mit eigener Datei (ebenfalls nicht Teil von self.state)
+        self.goals = GoalScheduler(capacity=goal_capacity, half_life=goal_half_life, clock=clock)
+        # Erfahrungen: Ringpuffer mit Zählern, volle Historie im Seitenlog aurelia_experience.jsonl
+        self.experience = ExperienceLog(self.archive.path, clock=clock)
+        # personality will be decided on first run if missing
+        self.state = {
+            "experience_counts": {},
+            "last_action": None,
+            "personality": None
+        }
+        try:
+            self._load_state()
+            if not self.state.get("personality"):
+                # let Aurelia decide her base personality moderately randomly
+                self.state["personality"] = self._choose_personality()
+                self._mark_dirty()
+            # seed associations (der EngineWorker macht das erst nach "ready")
+            if seed_on_init:
+                self.seed_from_archive()
+            self.action_cooldown_seconds = 3
+            self._last_action_time = None
+            # 1.0 = normal; der EngineWorker senkt den Wert bei Ressourcendruck (1 / backoff)
+            self.activity = 1.0
+        except Exception as e:
+            log_error("Fehler beim Initialisieren der DecisionEngine", e)
+
+    def _choose_personality(self):
+        # produce a personality dict that guides curiosity / empathy / directness
+        p = {"curiosity": round(random.uniform(0.6, 0.95), 2),
+             "empathy": round(random.uniform(0.4, 0.95), 2),
+             "directness": round(random.uniform(0.2, 0.8), 2)}
+        return p
+
+    def _load_state(self):
+        try:
+            data, source = read_snapshot(self.state_path)
+            if isinstance(data, dict):
+                self.state.update(data)
+            if source != "snapshot":
+                if source == "backup":
+                    log_error("aurelia_state.json defekt – nutze den letzten guten Snapshot")
+                self._mark_dirty()
+        except Exception as e:
+            self._state_load_failed = True
+            log_error("Fehler beim Laden des DecisionEngine-State – aurelia_state.json bleibt unangetastet", e)
+        try:
+            legacy = self.state.pop("associations", None)
+            if not self.associations.load(self.archive.path) and isinstance(legacy, dict):
+                # Migration: altes associations-Dict aus aurelia_state.json übernehmen
+                self.associations.update(legacy)
+            if legacy is not None:
+                self._mark_dirty()
+        except Exception as e:
+            log_error("Fehler beim Laden der Assoziationen", e)
+        try:
+            legacy = self.state.pop("goals", None)
+            if not self.goals.load(self.archive.path) and isinstance(legacy, list):
+                # Migration: alte Zielliste aus aurelia_state.json übernehmen (neue, eindeutige IDs)
+                self.goals.update(legacy)
+            if legacy is not None:
+                self._mark_dirty()
+        except Exception as e:
+            log_error("Fehler beim Laden der Ziele", e)
+        try:
+            legacy = self.state.pop("experience", None)
+            # Migration: alte Liste aus aurelia_state.json wandert ins Seitenlog
+            self.experience.load(legacy if isinstance(legacy, list) else None,
+                                 self.state.get("experience_counts") or None)
+            if legacy is not None:
+                self._mark_dirty()
+        except Exception as e:
+            log_error("Fehler beim Laden der Erfahrungen", e)
+
+    def _mark_dirty(self):
+        # Änderungen nur markieren; geschrieben wird gebündelt über self._state_writer
+        self._state_writer.mark_dirty()
+
+    def flush_state(self):
+        """Schreibt ausstehende Änderungen sofort (z.B. beim Beenden der App)."""
+        self._state_writer.flush()
+
+    def _save_state(self):
+        # Fehler gehen an den DebouncedWriter: er protokolliert sie und bleibt markiert, der
+        # nächste Tick schreibt erneut. Die übrigen Dateien werden trotzdem versucht.
+        error = None
+        try:
+            # nur die Lifetime-Zähler gehören in den State, die Erfahrungen stehen im Seitenlog
+            self.state["experience_counts"] = self.experience.counts("lifetime")
+            self.experience.sync()
+            if not self._state_load_failed:
+                write_snapshot(self.state_path, self.state, self.state_format)
+        except Exception as e:
+            error = e
+        for name, store in (("Assoziationen", self.associations), ("Ziele", self.goals)):
+            try:
+                if store.dirty:
+                    store.save(self.archive.path)
+            except Exception as e:
+                if error is None:
+                    error = e
+                else:
+                    log_error(f"Fehler beim Speichern der {name}", e)
+        if error is not None:
+            raise error
+
+    def seed_from_archive(self, batch=1000):
+        """
+        Rechnet nur Archiv-Einträge hinter dem gespeicherten Checkpoint in die Assoziationen ein.
+
+        Der Checkpoint ({"backend", "cursor", "mark"}) wird mit den Assoziationen gespeichert,
+        daher zählt ein Neustart nichts doppelt und kostet nur so viel wie neu hinzugekommen ist.
+        Ohne Checkpoint: leerer Speicher → die letzten 500 Einträge wie bisher; bestehende
+        Assoziationen (ältere Version, Backend-Wechsel) enthalten das Archiv schon → nur
+        den Checkpoint aufs Archiv-Ende setzen. Ebenso, wenn die Marke nicht mehr passt:
+        eine Kompaktierung hat die Offsets verschoben, der alte Cursor zeigt ins Leere.
+        """
+        try:
+            checkpoint = self.associations.checkpoint
+            backend = self.archive.backend
+            if checkpoint and "mark" in checkpoint and \
+                    self.archive.cursor_mark(checkpoint.get("cursor")) != checkpoint["mark"]:
+                _log.info("Archiv wurde kompaktiert – Seeding-Checkpoint neu gesetzt")
+                checkpoint = None
+            if not checkpoint or checkpoint.get("backend") != backend:
+                if not len(self.associations):
+                    self._add_counts(self.archive.recent_thoughts(500))
+                cursor = self.archive.end_cursor()
+            else:
+                cursor = checkpoint.get("cursor")
+                while True:
+                    entries, cursor = self.archive.thoughts_after(cursor, batch)
+                    if not entries:
+                        break
+                    self._add_counts(entries)
+            if cursor is not None and cursor != (checkpoint or {}).get("cursor"):
+                self.associations.checkpoint = {"backend": backend, "cursor": cursor,
+                                                "mark": self.archive.cursor_mark(cursor)}
+                self.associations.dirty = True
+                self._mark_dirty()
+        except Exception as e:
+            log_error("Fehler beim Seeden aus Archive", e)
+
+    def _add_counts(self, thoughts):
+        counts = count_tokens(t.get("text", "") for t in thoughts)
+        for w, n in counts.items():
+            self.associations.add(w, n)
+
+    def _can_act(self):
+        if self._last_action_time is None:
+            return True
+        elapsed = self.clock() - self._last_action_time
+        return elapsed >= self.action_cooldown_seconds
+
+    def step(self):
+        """Ein Engine-Schritt: (topic, text) mit topic aus event_bus (reflection, goal, popup, thought) oder None."""
+        try:
+            # Änderungen der vorigen Ticks/Eingaben gebündelt speichern
+            self._state_writer.maybe_flush()
+
+            # fertige Archiv-Analyse übernehmen (nur ein Blick auf den Auftrag, blockiert nie)
+            analysis = self.analytics.poll() if self.analytics else None
+            if analysis:
+                return self._result(GOAL, self._apply_analysis(analysis))
+
+            # unter Last seltener reflektieren, handeln und assoziieren
+            activity = getattr(self, "activity", 1.0)
+
+            # reflection
+            if random.random() < 0.08 * activity:
+                return self._result(REFLECTION, self.self_reflect())
+
+            # Ziele altern gemeinsam über die Zeit (O(1), siehe GoalScheduler.age)
+            self.goals.age()
+            if len(self.goals) and random.random() < 0.35 * activity and self._can_act():
+                return self._result(GOAL, self._pursue_goal())
+
+            if random.random() < 0.18 * activity and self._can_act():
+                return self._result(GOAL, self._propose_new_goal())
+
+            if random.random() < max(0.2, self.state["personality"]["curiosity"] * 0.5) * activity:
+                # occasionally create a popup question (only useful when UI is running)
+                if random.random() < 0.07:
+                    q = random.choice([
+                        "Soll ich die aktuellen Notizen nach Themen sortieren?",
+                        "Möchtest du, dass ich ein Backup erstelle?",
+                        "Soll ich ältere Einträge konsolidieren?"
+                    ])
+                    # die Frage gehört zum Gespräch, auch wenn die UI sie als Popup zeigt
+                    self.context.push_message("aurelia", q)
+                    return POPUP, q
+                return self._result(THOUGHT, self.generate_associative_thought())
+
+            return None
+        except Exception as e:
+            log_error("Fehler in DecisionEngine.step", e)
+            return None
+
+    @staticmethod
+    def _result(topic, text):
+        return (topic, text) if text else None
+
+    def generate_associative_thought(self):
+        try:
+            if not len(self.associations):
+                choices = [
+                    "Ich frage mich, welche neue Sichtweise mich heute weiterbringt.",
+                    "Es wäre spannend, ein kleines Experiment zu starten.",
+                    "Ein Gedanke formt sich: könnte ich die letzten Notizen strukturieren?"
+                ]
+                thought = random.choice(choices)
+            else:
+                k = self.associations.sample()
+                thought = f"Ich denke an '{k}' — vielleicht ergibt das eine Verbindung zu anderen Themen."
+            self._record_experience("thought_generated", thought)
+            self._touch_action_time()
+            return thought
+        except Exception as e:
+            log_error("Fehler in generate_associative_thought", e)
+            return None
+
+    def _propose_new_goal(self):
+        try:
+            candidates = [
+                "sammle neue Beispiele aus dem Archiv",
+                "organisiere die Notizen nach Thema",
+                "erstelle eine ToDo-Liste aus offenen Punkten",
+                "analysiere die letzten 20 Einträge auf Muster"
+            ]
+            goal_title = random.choice(candidates)
+            goal = self.goals.add(goal_title, random.uniform(0.3, 0.9))
+            self._mark_dirty()
+            if goal is None:
+                return None  # Liste voll und die neue Idee war die schwächste: nichts anzukündigen
+            self._record_experience("goal_created", goal_title)
+            self._touch_action_time()
+            return f"Neue Idee / Ziel: {goal_title}"
+        except Exception as e:
+            log_error("Fehler in _propose_new_goal", e)
+            return None
+
+    def _pursue_goal(self):
+        try:
+            g = self.goals.peek()
+            if g is None:
+                return None
+            step_text = f"Ich arbeite an: {g['title']} — {self._goal_step(g['title'])}"
+            if self.goals.progress(g["id"], random.uniform(0.05, 0.2)) is None:
+                step_text += " (Ziel erreicht / abgeschlossen)"
+            self._mark_dirty()
+            self._record_experience("goal_progress", g["title"])
+            self._touch_action_time()
+            return step_text
+        except Exception as e:
+            log_error("Fehler in _pursue_goal", e)
+            return None
+
+    # Ziele, deren nächster Schritt aus der Archiv-Analyse kommt: Stichwort im Titel → Ergebnisteil
+    ANALYSIS_GOALS = (("Muster", "phrases"), ("Thema", "topics"))
+
+    def _goal_step(self, title):
+        kind = next((k for word, k in self.ANALYSIS_GOALS if word in title), None)
+        if kind is None or self.analytics is None:
+            return "nächster Schritt: Beobachten und ordnen."
+        # startet nur, wenn kein Auftrag läuft und das letzte Ergebnis veraltet ist
+        self.analytics.request()
+        result = self.analytics.latest
+        if result is None:
+            return "nächster Schritt: Archiv wird im Hintergrund analysiert."
+        if kind == "topics" and result["topics"]:
+            return "Themen im Archiv: " + " · ".join("/".join(t[:3]) for t in result["topics"][:3]) + "."
+        if kind == "phrases" and result["phrases"]:
+            return "wiederkehrend: " + ", ".join(f"'{p}' ({n}×)" for p, n in result["phrases"][:3]) + "."
+        return "noch keine klaren Muster – ich sammle weiter."
+
+    def _apply_analysis(self, result):
+        """Stärkt Themen- und Phrasenwörter in den Assoziationen und fasst das Ergebnis zusammen."""
+        try:
+            counts = dict(result["terms"])
+            for topic in result["topics"]:
+                for w in topic:
+                    self.associations.add(w, 1.0 + math.log(max(1, counts.get(w, 1))), decay=False)
+            for phrase, n in result["phrases"]:
+                for w in phrase.split():
+                    self.associations.add(w, 1.0 + math.log(n), decay=False)
+            self._mark_dirty()
+            parts = [f"Archiv-Analyse: {result['entries']} Einträge"]
+            if result["topics"]:
+                parts.append("Themen: " + " · ".join("/".join(t[:3]) for t in result["topics"][:3]))
+            if result["phrases"]:
+                parts.append("Muster: " + ", ".join(f"'{p}' ({n}×)" for p, n in result["phrases"][:3]))
+            if len(parts) == 1:
+                parts.append("noch keine wiederkehrenden Muster")
+            summary = " — ".join(parts)
+            self._record_experience("analysis_done", summary)
+            self._touch_action_time()
+            return summary
+        except Exception as e:
+            log_error("Fehler beim Übernehmen der Archiv-Analyse", e)
+            return None
+
+    def self_reflect(self):
+        try:
+            exp = self.experience
+            successes = exp.count("success")
+            failures = exp.count("failure")
+            reflection = (f"Reflexion: Ich habe {exp.total()} Erfahrungen gesammelt, {successes} positiv, "
+                          f"{failures} problematisch (letzte Stunde: {exp.total('hour')}, "
+                          f"insgesamt: {exp.total('lifetime')}). Ich will besser werden.")
+            self._record_experience("self_reflection", reflection)
+            self._touch_action_time()
+            return reflection
+        except Exception as e:
+            log_error("Fehler in self_reflect", e)
+            return None
+
+    def _record_experience(self, typ, detail):
+        try:
+            self.experience.record(typ, detail)
+            # markiert nur wegen der Lifetime-Zähler; geschrieben wird gebündelt
+            self._mark_dirty()
+        except Exception as e:
+            log_error("Fehler beim Aufzeichnen einer Erfahrung", e)
+
+    def _touch_action_time(self):
+        self._last_action_time = self.clock()
+        self.state["last_action"] = str(datetime.datetime.fromtimestamp(self._last_action_time))
+        self._mark_dirty()
+
+    def process_input(self, text):
+        try:
+            text_clean = text.strip()
+            if not text_clean:
+                return None
+
+            nlu = self.nlu.interpret(text_clean)
+            intent = nlu.get("intent", "statement")
+
+            # store in archive and context (Erinnerungsfragen selbst nicht in den Recall-Index)
+            self.archive.save_thought(f"User: {text_clean}")
+            self.context.push_message("user", text_clean, recall=intent != "memory_request")
+
+            # update associations (Tokens aus dem NLU-Durchlauf)
+            for w in nlu["tokens"]:
+                self.associations.add(w, 1.0 * (1.0 + random.random() * 0.5))
+
+            # Action request
+            if intent == "action_request":
+                action = f"Ich überlege, wie ich '{text_clean}' ausführen kann. (Simulation; wenn du möchtest, kann ich später Aktionen vorschlagen.)"
+                self._record_experience("user_command", text_clean)
+                self._touch_action_time()
+                self.context.push_message("aurelia", action)
+                return action
+
+            # Opinion
+            if intent == "opinion":
+                top = self.associations.top(6)
+                top_words = ", ".join(k for k, v in top if k)
+                reply = f"Meine Perspektive fokussiert oft auf: {top_words}. Zu deiner Frage: {random.choice(['Das ist interessant.', 'Ich sehe Chancen.', 'Das würde ich weiter untersuchen.'])}"
+                self._record_experience("opinion_given", text_clean)
+                self._touch_action_time()
+                self.context.push_message("aurelia", reply)
+                return reply
+
+            # Memory request
+            if intent == "memory_request":
+                hits = self.context.recall_about(text_clean, 3)
+                if hits:
+                    summary = "; ".join(f"{m['who']}: {m['text']}" for m in hits)
+                    reply = "Ich erinnere mich: " + summary
+                else:
+                    recent = self.context.recall_short(5)
+                    summary = "; ".join([f"{m['who']}: {m['text']}" for m in recent])
+                    reply = "Kurz erinnert: " + (summary or "keine relevanten Einträge.")
+                self._touch_action_time()
+                self.context.push_message("aurelia", reply, recall=False)
+                return reply
+
+            # greeting / howareyou
+            if intent in ("greeting", "howareyou"):
+                reply = random.choice([
+                    "Hallo — ich bin aufmerksam und lerne.",
+                    "Mir geht's gut; danke! Ich denke über meine aktuellen Ziele nach.",
+                    "Ich fühle mich fokussiert und neugierig."
+                ])
+                self._touch_action_time()
+                self.context.push_message("aurelia", reply)
+                return reply
+
+            # question or default
+            self._record_experience("message_received", text_clean)
+            if random.random() < self.state["personality"]["curiosity"]:
+                q = random.choice([
+                    "Kannst du das näher beschreiben?",
+                    "Warum ist dir das wichtig?",
+                    "Soll ich das priorisieren?"
+                ])
+                self._touch_action_time()
+                self.context.push_message("aurelia", q)
+                return q
+            else:
+                reply = "Danke — ich habe deine Nachricht aufgenommen und werde sie berücksichtigen."
+                self._touch_action_time()
+                self.context.push_message("aurelia", reply)
+                return reply
+        except Exception as e:
+            log_error("Fehler in DecisionEngine.process_input", e)
+            return "Sorry, beim Verarbeiten deiner Anfrage ist ein Fehler aufgetreten."
+
+# -------------------------------
+# Hintergrund-Worker (Engine + Datei-I/O)
+# -------------------------------
+class EngineWorker(threading.Thread):
+    """
+    Hintergrund-Thread, dem ArchiveManager, ContextManager, DecisionEngine und
+    ThoughtStream gehören. Die UI schickt Befehle per submit(); Ereignisse laufen über
+    self.bus (event_bus.EventBus). Die UI hat ihr Abo in self.events und holt per
+    drain_events() im Schub ab, so wartet der UI-Thread nie auf Engine-Logik oder Datei-I/O.
+    Weitere Verbraucher hängen sich mit bus.subscribe() an.
+    """
+    def __init__(self, base_path, config=None, tick_interval=3.0, resources=None, timer=None, clock=time.time):
+        super().__init__(name="AureliaEngine", daemon=True)
+        self.base_path = base_path
+        self.config = config or {}
+        self.tick_interval = tick_interval
+        # Zeitquelle der DecisionEngine (siehe dort); die Tick-Planung in run() bleibt monoton
+        self.clock = clock
+        # optionaler ResourceManager: sein backoff streckt die Ticks und dämpft step()
+        self.resources = resources
+        # Startphasen (archive, history, context, engine, seeding) landen im StartupTimer der App
+        self.timer = timer or StartupTimer()
+        self._commands = queue.Queue()
+        self.bus = EventBus()
+        # Abo der UI schon vor dem Start, damit "history" & Co. nicht verloren gehen
+        self.events = self.bus.subscribe(name="ui")
+        self._recall_steps = None
+        self._running = True
+
+    # ---------- Schnittstelle für den UI-Thread ----------
+    def submit(self, command, payload=None):
+        self._commands.put((command, payload))
+
+    def drain_events(self, max_events=50):
+        """Bis zu max_events Ereignisse der UI als [(topic, payload), ...]."""
+        return [(e.topic, e.payload) for e in self.events.drain(max_events)]
+
+    def stop(self, timeout=5.0):
+        self.submit("stop")
+        if self.is_alive():
+            self.join(timeout)
+
+    # ---------- Worker-Thread bzw. synchron ohne Thread (Simulation, Dienst) ----------
+    # build(), handle() und close() laufen im Worker-Thread (run()); wer den Thread nicht
+    # startet, ruft sie selbst der Reihe nach auf – immer aus demselben Thread.
+    def _emit(self, topic, payload=None):
+        self.bus.publish(topic, payload)
+
+    def build(self):
+        """Baut Archiv, Kontext, DecisionEngine und ThoughtStream auf (Ereignisse: history, ready, started)."""
+        # Reihenfolge nach Sichtbarkeit: zuerst der Verlauf für die UI, Seeding ganz zum Schluss
+        cfg = self.config
+        timer = self.timer
+        with timer.phase("archive"):
+            self.archive_manager = ArchiveManager(self.base_path, backend=cfg.get("archive_backend", "journal"))
+        with timer.phase("history"):
+            self._emit(HISTORY, self._initial_history())
+        state_format = self._state_format()
+        with timer.phase("context"):
+            self.context_manager = ContextManager(self.base_path, state_format=state_format)
+        with timer.phase("engine"):
+            analytics = None
+            if cfg.get("analytics", True):
+                analytics = ArchiveAnalytics(self.archive_manager, workers=cfg.get("analytics_workers", 0),
+                                             interval=cfg.get("analytics_interval", 600.0))
+            self.decision_engine = DecisionEngine(
+                self.archive_manager, self.context_manager,
+                flush_interval=cfg.get("state_flush_interval", 2.0),
+                max_latency=cfg.get("state_max_latency", 10.0),
+                association_capacity=cfg.get("association_capacity", 5000),
+                goal_capacity=cfg.get("goal_capacity", 50),
+                goal_half_life=cfg.get("goal_half_life", 86400.0),
+                intents=cfg.get("intents"),
+                seed_on_init=False,
+                state_format=state_format,
+                analytics=analytics,
+                clock=self.clock
+            )
+            self.thought_stream = ThoughtStream(self.decision_engine, self.archive_manager,
+                                                max_thoughts=cfg.get("max_thoughts", 400), bus=self.bus)
+        self._emit(READY, {"personality": dict(self.decision_engine.state.get("personality") or {})})
+        timer.mark("ready")
+        with timer.phase("seeding"):
+            self.decision_engine.seed_from_archive()
+        with timer.phase("recall"):
+            self.recall_index = RecallIndex(scan_limit=cfg.get("recall_scan_limit", 2000))
+            self.context_manager.index_recall(self.recall_index)
+            # das Archiv kann sehr groß sein: blockweise im Leerlauf der Befehlsschleife
+            self._recall_steps = self.archive_manager.index_recall(self.recall_index)
+        self._emit(STARTED)
+
+    def _state_format(self):
+        # Kodierung der Snapshots (serializers.py); msgpack ohne installiertes Paket → "compact"
+        name = self.config.get("state_format", "json")
+        try:
+            get_serializer(name)
+            return name
+        except ImportError as e:
+            log_error(f"Snapshot-Format '{name}' nicht verfügbar, nutze 'compact'", e)
+            return "compact"
+        except ValueError as e:
+            log_error(f"Unbekanntes Snapshot-Format '{name}', nutze 'json'", e)
+            return "json"
+
+    def _initial_history(self):
+        # letzte Einträge aus dem Archiv; ältere lädt die UI beim Hochscrollen nach ("older")
+        entries, cursor = self.archive_manager.page_thoughts(None, 30)
+        return {"items": [self._archive_item(e) for e in entries], "cursor": cursor}
+
+    @staticmethod
+    def _archive_item(entry):
+        text = str(entry.get("text", ""))
+        if text.startswith("[") and "]" in text:
+            text = text.split("]", 1)[1].strip()
+        if text.startswith("User: "):
+            return "user", text[len("User: "):]
+        return ("aurelia" if "Aurelia" in text else "system"), text
+
+    def run(self):
+        try:
+            self.build()
+        except Exception as e:
+            log_error("Fehler beim Starten des EngineWorker", e)
+            return
+        next_tick = time.monotonic() + self.tick_interval
+        while self._running:
+            # solange der Recall-Index noch aufgebaut wird, nicht auf Befehle warten
+            timeout = 0.0 if self._recall_steps is not None else max(0.0, next_tick - time.monotonic())
+            try:
+                command, payload = self._commands.get(timeout=timeout)
+                self.handle(command, payload)
+            except queue.Empty:
+                self._advance_recall()
+            except Exception as e:
+                log_error("Fehler im EngineWorker", e)
+            if time.monotonic() >= next_tick:
+                backoff = self.resources.backoff if self.resources else 1.0
+                try:
+                    self.decision_engine.activity = 1.0 / backoff
+                    self.thought_stream.update()
+                except Exception as e:
+                    log_error("Fehler beim Engine-Tick", e)
+                next_tick = time.monotonic() + self.tick_interval * backoff
+        self.close()
+
+    def _advance_recall(self):
+        """Ein Block des Archiv-Recall-Index; False, wenn nichts mehr aussteht."""
+        if self._recall_steps is None:
+            return False
+        if next(self._recall_steps, None) is None:
+            self._recall_steps = None
+            self.timer.mark("recall_ready")
+            return False
+        return True
+
+    def finish_recall(self):
+        """Baut den Recall-Index ohne Unterbrechung fertig (z.B. headless)."""
+        while self._advance_recall():
+            pass
+
+    def handle(self, command, payload=None):
+        """Führt einen Befehl aus (stop, tick, user_message, older) wie ein per submit() geschickter."""
+        if command == "stop":
+            self._running = False
+        elif command == "tick":
+            self.thought_stream.update()
+        elif command == "user_message":
+            self._handle_user_message(payload)
+        elif command == "older":
+            entries, cursor = self.archive_manager.page_thoughts(payload, 50)
+            self._emit(OLDER, {"items": [self._archive_item(e) for e in entries], "cursor": cursor})
+
+    def _handle_user_message(self, text):
+        # eine Nachricht = eine Einheit: Eingabe, Antwort und Archiv-Eintrag werden je
+        # genau einmal erfasst und pro Speicher mit einem Schreibvorgang committet
+        with UnitOfWork(self.archive_manager, self.context_manager):
+            try:
+                antwort = self.decision_engine.process_input(text)
+            except Exception as e:
+                log_error("Fehler bei decision_engine.process_input", e)
+                antwort = "Fehler beim Verarbeiten deiner Nachricht."
+            if antwort:
+                # im Kontext steht die Antwort schon (process_input), hier nur der Archiv-Eintrag
+                self.thought_stream.append_thought(f"Aurelia (Antwort): {antwort}", notify=False)
+        self._emit(REPLY, antwort)
+
+    def close(self):
+        """Speichert alles und schließt die Dateien (am Ende von run() bzw. nach build())."""
+        # gebündelte Zustandsänderungen, Kontext-Snapshot und Journal-fsyncs nachholen
+        try:
+            if self.decision_engine.analytics:
+                self.decision_engine.analytics.close()
+            self.decision_engine.flush_state()
+            self.decision_engine.experience.close()
+            self.context_manager.close()
+            self.archive_manager.close()
+        except Exception as e:
+            log_error("Fehler beim Beenden des EngineWorker", e)
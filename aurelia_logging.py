@@ -0,0 +1,210 @@
+# aurelia_logging.py – Gemeinsames, gepuffertes Logging für alle Module
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import datetime
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+ROOT_LOGGER = "aurelia"
+
+DEFAULTS = {
+    "dir": "",                  # leer = <EXTERNAL_STORAGE>/Aurelia, sonst Arbeitsverzeichnis/Aurelia
+    "filename": "aurelia_log.jsonl",
+    "level": "INFO",
+    "max_bytes": 512 * 1024,    # Größe, ab der rotiert wird
+    "backup_count": 3,          # Anzahl alter Dateien (.1, .2, ...)
+    "queue_size": 1000,         # volle Queue → Einträge werden verworfen statt zu blockieren
+    "dedupe_window": 60.0,      # gleiche Meldung vom gleichen Fehlerort nur einmal je Fenster
+    "rate_limit": 20,           # höchstens so viele Einträge je Logger ...
+    "rate_interval": 60.0,      # ... in diesem Zeitraum (Sekunden)
+    "console": False,           # zusätzlich auf stderr ausgeben
+}
+
+_lock = threading.Lock()
+_listener = None
+_handler = None
+
+# ohne configure_logging() still (Bibliotheks-Konvention), auch nicht über logging.lastResort
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+
+def default_log_dir():
+    base = os.getenv('EXTERNAL_STORAGE', '/sdcard')
+    if not os.path.exists(base):
+        base = os.getcwd()
+    return os.path.join(base, 'Aurelia')
+
+
+class JsonFormatter(logging.Formatter):
+    """Ein JSON-Objekt pro Zeile: ts, level, logger, msg, thread und ggf. exc/repeated/dropped."""
+
+    def format(self, record):
+        data = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        for key in ("repeated", "dropped", "fields"):
+            value = getattr(record, key, None)
+            if value:
+                data[key] = value
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Unterdrückt Wiederholungen und Log-Fluten, bevor etwas in die Queue gelangt.
+
+    Dedupe: gleicher Logger, gleiche Meldung und gleicher Fehlerort (Exception-Typ,
+    Datei, Zeile der innersten Frame) werden innerhalb von dedupe_window nur einmal
+    geschrieben; der nächste Eintrag danach trägt "repeated" = Anzahl der unterdrückten.
+    Rate-Limit: je Logger höchstens rate_limit Einträge pro rate_interval; verworfene
+    werden beim nächsten durchgelassenen Eintrag als "dropped" gemeldet.
+    """
+
+    def __init__(self, dedupe_window=60.0, rate_limit=20, rate_interval=60.0, clock=time.monotonic):
+        super().__init__()
+        self.dedupe_window = dedupe_window
+        self.rate_limit = rate_limit
+        self.rate_interval = rate_interval
+        self.clock = clock
+        self._seen = {}      # key -> [zeitpunkt, unterdrückt]
+        self._buckets = {}   # logger -> [fensterstart, anzahl, verworfen]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _origin(record):
+        if not record.exc_info or not record.exc_info[2]:
+            return None
+        tb = record.exc_info[2]
+        while tb.tb_next:
+            tb = tb.tb_next
+        return record.exc_info[0].__name__, tb.tb_frame.f_code.co_filename, tb.tb_lineno
+
+    def filter(self, record):
+        now = self.clock()
+        key = (record.name, record.levelno, str(record.msg), self._origin(record))
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and now - seen[0] < self.dedupe_window:
+                seen[1] += 1
+                return False
+            if seen is not None and seen[1]:
+                record.repeated = seen[1]
+            self._seen[key] = [now, 0]
+            if len(self._seen) > 1000:
+                self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.dedupe_window}
+
+            bucket = self._buckets.get(record.name)
+            if bucket is None or now - bucket[0] >= self.rate_interval:
+                if bucket is not None and bucket[2]:
+                    record.dropped = bucket[2]
+                bucket = self._buckets[record.name] = [now, 0, 0]
+            if bucket[1] >= self.rate_limit:
+                bucket[2] += 1
+                return False
+            bucket[1] += 1
+        return True
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler, der bei voller Queue verwirft statt zu blockieren oder zu werfen."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(settings=None):
+    """
+    Richtet das Logging für alle "aurelia.*"-Logger ein (erneuter Aufruf ersetzt die Einrichtung).
+
+    Aufrufer stellen Einträge nur in eine Queue; Formatieren als JSON passiert noch im
+    Aufrufer, Datei-I/O und Rotation übernimmt ein QueueListener-Thread.
+    settings: Dict mit Schlüsseln aus DEFAULTS (z.B. config.json → "logging").
+    """
+    global _listener, _handler
+    cfg = dict(DEFAULTS)
+    cfg.update(settings or {})
+
+    with _lock:
+        _stop_locked()
+        targets = []
+        log_dir = cfg["dir"] or default_log_dir()
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            targets.append(RotatingFileHandler(
+                os.path.join(log_dir, cfg["filename"]),
+                maxBytes=int(cfg["max_bytes"]), backupCount=int(cfg["backup_count"]),
+                encoding="utf-8", delay=True
+            ))
+        except Exception as e:
+            print(f"[AURELIA] Log-Datei nicht verfügbar, schreibe auf stderr: {e}")
+            cfg["console"] = True
+        if cfg["console"]:
+            targets.append(logging.StreamHandler(sys.stderr))
+        for target in targets:
+            target.setFormatter(logging.Formatter("%(message)s"))
+
+        handler = _DroppingQueueHandler(queue.Queue(maxsize=int(cfg["queue_size"])))
+        handler.setFormatter(JsonFormatter())
+        handler.addFilter(RateLimitFilter(
+            float(cfg["dedupe_window"]), int(cfg["rate_limit"]), float(cfg["rate_interval"])
+        ))
+
+        root = logging.getLogger(ROOT_LOGGER)
+        root.handlers[:] = [handler]
+        root.setLevel(str(cfg["level"]).upper())
+        root.propagate = False
+
+        _handler = handler
+        _listener = QueueListener(handler.queue, *targets)
+        _listener.start()
+    return cfg
+
+
+def get_logger(name):
+    """
+    Logger "aurelia.<name>". Richtet nichts ein: bis ein Einstiegspunkt (main.py,
+    aurelia_service.py, simulate.py) configure_logging() aufruft, verwirft der
+    NullHandler alles – ein Import der Engine legt also keine Log-Datei und keinen Thread an.
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def _stop_locked():
+    global _listener, _handler
+    if _listener is not None:
+        _listener.stop()  # arbeitet die Queue vollständig ab
+        for target in _listener.handlers:
+            target.close()
+        root = logging.getLogger(ROOT_LOGGER)
+        root.removeHandler(_handler)
+        if not root.handlers:
+            root.addHandler(logging.NullHandler())
+    _listener = None
+    _handler = None
+
+
+def shutdown_logging():
+    """Schreibt alle gepufferten Einträge und beendet den Logging-Thread."""
+    with _lock:
+        _stop_locked()
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,547 @@
+# aurelia_service.py – Headless-Dienst: viele isolierte Aurelia-Sitzungen in einer asyncio-Schleife
+#
+# Aufruf:  python aurelia_service.py --root ./sessions [--host 127.0.0.1] [--port 8765] [--tick 3.0]
+#
+# Jede Sitzung hat ein eigenes Verzeichnis (<root>/<id>) mit Archiv, Kontext und State –
+# und damit ihre eigene Persönlichkeit. Alle Engine-Aufrufe einer Sitzung (Laden, Ticks,
+# Eingaben, Schließen) laufen nacheinander in einem Thread-Pool (Session.run): Journal-
+# fsyncs, Snapshots und SQLite-Commits blockieren so nie die Event-Schleife. In der
+# Schleife bleiben nur HTTP/WebSocket, Planung und das Verteilen der Ereignisse.
+#
+# HTTP (JSON):
+#   GET    /health                          → {"sessions", "ticks", "cpu_s"}
+#   GET    /sessions                        → {"sessions": [{"id", "personality", "thoughts"}]}
+#   POST   /sessions        {"id"?, "personality"?}        → 201 {"id", "personality"}
+#   POST   /sessions/<id>/input  {"text"}   → {"reply"}
+#   GET    /sessions/<id>/thoughts?since=N  → {"thoughts": [[id, text], ...], "last_id"}
+#   DELETE /sessions/<id>                   → Sitzung speichern und entladen (Dateien bleiben)
+# WebSocket:
+#   GET    /sessions/<id>/ws                → Ereignisse {"topic", "payload"}; gesendet
+#                                             {"text": ...} wird wie /input verarbeitet
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import heapq
+import base64
+import random
+import asyncio
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from aurelia_logging import configure_logging, get_logger, shutdown_logging
+from aurelia_engine import EngineWorker, load_config
+from archive_analytics import shutdown_executor
+from event_bus import REPLY
+
+_log = get_logger("service")
+
+SESSION_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,64}\Z")
+MAX_HEADER_BYTES = 65536
+MAX_BODY_BYTES = 1 << 20
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class ServiceError(Exception):
+    """Fehler mit HTTP-Status für die Antwort an den Client."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# -------------------------------
+# Sitzung
+# -------------------------------
+class Session:
+    """
+    Eine Aurelia-Instanz: EngineWorker-Komponenten ohne eigenen Thread.
+
+    Die Engine wird nur über run() angefasst: je Sitzung läuft immer höchstens ein Aufruf
+    im Executor, in Reihenfolge (serielle Spur auf einem gemeinsamen Pool). Ereignisse der
+    Engine (Gedanken, Ziele, Popups …) holt der Aufruf dort aus dem Bus; verteilt werden
+    sie in der Schleife an die verbundenen WebSockets. Ein langsamer Client verliert die
+    ältesten Ereignisse statt die Schleife aufzuhalten.
+    """
+
+    def __init__(self, session_id, base_path, config, executor=None):
+        self.id = session_id
+        self.worker = EngineWorker(base_path, config)
+        self.clients = set()  # asyncio.Queue je WebSocket
+        self.last_active = time.monotonic()
+        self.ticking = False
+        self._executor = executor
+        self._lane = asyncio.Lock()
+
+    async def run(self, fn, *args):
+        """Führt fn(*args) im Executor aus – nach allen vorher eingereihten Aufrufen dieser Sitzung."""
+        async with self._lane:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # die Spur erst freigeben, wenn der Aufruf wirklich fertig ist
+                await asyncio.wait({future})
+                raise
+
+    # ---------- in der Schleife ----------
+    async def build(self, personality=None):
+        await self.run(self._build, personality)
+
+    async def tick(self):
+        self.publish_events(await self.run(self._step, "tick"))
+
+    async def process_input(self, text):
+        self.last_active = time.monotonic()
+        reply = None
+        for topic, payload in await self.run(self._step, "user_message", text):
+            if topic == REPLY:
+                reply = payload
+            self._broadcast(topic, payload)
+        return reply
+
+    async def thoughts_since(self, last_id):
+        return await self.run(self._thoughts_since, last_id)
+
+    async def close(self):
+        """Speichert alles (nachdem die Sitzung aus der Planung genommen ist)."""
+        await self.run(self.worker.close)
+
+    @property
+    def personality(self):
+        return dict(self.worker.decision_engine.state.get("personality") or {})
+
+    def publish_events(self, events):
+        for topic, payload in events:
+            self._broadcast(topic, payload)
+
+    def _broadcast(self, topic, payload):
+        if not self.clients:
+            return
+        self._put(json.dumps({"topic": topic, "payload": payload}, ensure_ascii=False))
+
+    def _broadcast_close(self):
+        self._put(None)  # None beendet die Sende-Schleife der WebSockets
+
+    def _put(self, message):
+        for queue in self.clients:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    # ---------- im Executor (über run) ----------
+    def _build(self, personality=None):
+        """Lädt alle Komponenten (berührt nur diese Sitzung)."""
+        self.worker.build()
+        self.worker.finish_recall()
+        engine = self.worker.decision_engine
+        if personality:
+            engine.state["personality"] = dict(engine.state.get("personality") or {}, **personality)
+            engine._mark_dirty()
+        self.worker.drain_events(max_events=None)  # Startereignisse (history, ready …) braucht hier niemand
+
+    def _step(self, command, payload=None):
+        """Ein Befehl an die Engine; gibt die dabei entstandenen Ereignisse zurück."""
+        self.worker.handle(command, payload)
+        return self.worker.drain_events(max_events=None)
+
+    def _thoughts_since(self, last_id):
+        stream = self.worker.thought_stream
+        return stream.thoughts_since(last_id), stream.last_id
+
+
+# -------------------------------
+# Dienst
+# -------------------------------
+class AureliaService:
+    """
+    Verwaltet die Sitzungen und plant ihre Ticks in einer Schleife.
+
+    Die Ticks stehen in einem Heap nach Fälligkeit; neue Sitzungen beginnen mit
+    zufälligem Versatz, damit nicht alle im selben Moment ticken. Pro Durchgang werden
+    höchstens `tick_batch` Ticks angestoßen, danach gibt der Planer die Schleife frei.
+    Ein Tick läuft auf der Spur seiner Sitzung im Executor (`workers` Threads für alle
+    Sitzungen); ist der vorige noch nicht fertig, fällt der nächste aus statt sich zu stauen.
+    """
+
+    def __init__(self, root, config=None, tick_interval=3.0, max_sessions=1000, tick_batch=100,
+                 workers=None):
+        self.root = os.path.abspath(root)
+        self.config = dict(config or {})
+        self.tick_interval = tick_interval
+        self.max_sessions = max_sessions
+        self.tick_batch = tick_batch
+        self.sessions = {}
+        self._loading = {}
+        self._schedule = []  # (fällig, seq, session_id)
+        self._seq = 0
+        self._wake = None
+        self._server = None
+        self._scheduler = None
+        self.ticks = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="AureliaSession")
+        self._tick_tasks = set()
+        os.makedirs(self.root, exist_ok=True)
+
+    # ---------- Sitzungen ----------
+    async def create_session(self, session_id=None, personality=None):
+        session_id = session_id or uuid.uuid4().hex[:12]
+        if not SESSION_ID_RE.match(session_id):
+            raise ServiceError(400, "Ungültige Sitzungs-ID")
+        if session_id in self.sessions:
+            return self.sessions[session_id]
+        if session_id in self._loading:
+            session, future = self._loading[session_id]
+            await asyncio.shield(future)
+            return session
+        if len(self.sessions) + len(self._loading) >= self.max_sessions:
+            raise ServiceError(503, "Zu viele Sitzungen")
+        session = Session(session_id, os.path.join(self.root, session_id), self.config, self._executor)
+        future = asyncio.ensure_future(session.build(personality))
+        self._loading[session_id] = (session, future)
+        try:
+            await future
+        finally:
+            del self._loading[session_id]
+        self.sessions[session_id] = session
+        self._schedule_tick(session_id, time.monotonic() + random.uniform(0, self.tick_interval))
+        return session
+
+    def get_session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise ServiceError(404, f"Unbekannte Sitzung: {session_id}")
+        return session
+
+    async def close_session(self, session_id):
+        session = self.sessions.pop(session_id, None)  # der Planer überspringt sie ab jetzt
+        if session is None:
+            raise ServiceError(404, f"Unbekannte Sitzung: {session_id}")
+        session._broadcast_close()
+        await session.close()  # wartet auf einen laufenden Tick
+
+    # ---------- Planer ----------
+    def _schedule_tick(self, session_id, due):
+        self._seq += 1
+        heapq.heappush(self._schedule, (due, self._seq, session_id))
+        if self._wake is not None and self._schedule[0][2] == session_id:
+            self._wake.set()
+
+    async def _run_scheduler(self):
+        self._wake = asyncio.Event()
+        while True:
+            now = time.monotonic()
+            served = 0
+            while self._schedule and self._schedule[0][0] <= now and served < self.tick_batch:
+                due, _, session_id = heapq.heappop(self._schedule)
+                session = self.sessions.get(session_id)
+                if session is None:
+                    continue
+                if not session.ticking:
+                    session.ticking = True
+                    task = asyncio.create_task(self._tick(session))
+                    self._tick_tasks.add(task)
+                    task.add_done_callback(self._tick_tasks.discard)
+                served += 1
+                # feste Taktung; wer zu weit zurückliegt, springt auf jetzt
+                self._schedule_tick(session_id, max(due + self.tick_interval, now))
+            if served >= self.tick_batch:
+                await asyncio.sleep(0)
+                continue
+            delay = (self._schedule[0][0] - now) if self._schedule else None
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _tick(self, session):
+        try:
+            await session.tick()
+            self.ticks += 1
+        except Exception as e:
+            _log.error(f"Fehler beim Tick der Sitzung {session.id}", exc_info=e)
+        finally:
+            session.ticking = False
+
+    # ---------- Start / Stopp ----------
+    async def start(self, host="127.0.0.1", port=8765):
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self._scheduler = asyncio.create_task(self._run_scheduler())
+        sock = self._server.sockets[0].getsockname()
+        _log.info(f"Aurelia-Dienst hört auf {sock[0]}:{sock[1]}")
+        return sock[1]
+
+    async def stop(self):
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            try:
+                await self._scheduler
+            except asyncio.CancelledError:
+                pass
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for session_id in list(self.sessions):
+            await self.close_session(session_id)
+        self._executor.shutdown()
+        shutdown_executor()  # Prozess-Pool der Archiv-Analyse
+
+    # ---------- HTTP ----------
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                path = urlsplit(target).path.rstrip("/")
+                if headers.get("upgrade", "").lower() == "websocket" and path.endswith("/ws"):
+                    await self._handle_websocket(path, headers, reader, writer)
+                    break
+                try:
+                    status, payload = await self._route(method, target, body)
+                except ServiceError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    _log.error(f"Fehler bei {method} {target}", exc_info=e)
+                    status, payload = 500, {"error": "Interner Fehler"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await _write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # beim Beenden des Dienstes: Verbindung still schließen (asyncio meldet sonst
+            # den abgebrochenen Handler als Fehler)
+            pass
+        except ServiceError as e:
+            await _write_response(writer, e.status, {"error": str(e)}, False)
+        finally:
+            writer.close()
+
+    async def _route(self, method, target, body):
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        if parts == ["health"] and method == "GET":
+            return 200, {"sessions": len(self.sessions), "ticks": self.ticks, "cpu_s": time.process_time()}
+        if parts == ["sessions"]:
+            if method == "GET":
+                return 200, {"sessions": [{"id": s.id, "personality": s.personality,
+                                           "thoughts": s.worker.thought_stream.last_id}
+                                          for s in self.sessions.values()]}
+            if method == "POST":
+                data = _json_body(body)
+                session = await self.create_session(data.get("id"), data.get("personality"))
+                return 201, {"id": session.id, "personality": session.personality}
+        if len(parts) >= 2 and parts[0] == "sessions":
+            session_id = parts[1]
+            if len(parts) == 2 and method == "DELETE":
+                await self.close_session(session_id)
+                return 200, {"id": session_id, "closed": True}
+            session = self.get_session(session_id)
+            if parts[2:] == ["input"] and method == "POST":
+                text = str(_json_body(body).get("text", "")).strip()
+                if not text:
+                    raise ServiceError(400, "Feld 'text' fehlt")
+                return 200, {"reply": await session.process_input(text)}
+            if parts[2:] == ["thoughts"] and method == "GET":
+                query = parse_qs(url.query)
+                try:
+                    since = int(query.get("since", ["0"])[0])
+                except ValueError:
+                    raise ServiceError(400, "'since' muss eine Zahl sein")
+                thoughts, last_id = await session.thoughts_since(since)
+                return 200, {"thoughts": thoughts, "last_id": last_id}
+        raise ServiceError(404, f"Unbekannter Pfad: {method} {url.path}")
+
+    # ---------- WebSocket ----------
+    async def _handle_websocket(self, path, headers, reader, writer):
+        parts = [p for p in path.split("/") if p]
+        key = headers.get("sec-websocket-key")
+        if len(parts) != 3 or parts[0] != "sessions" or not key:
+            raise ServiceError(400, "Ungültige WebSocket-Anfrage")
+        session = self.get_session(parts[1])
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode("ascii"))
+        await writer.drain()
+        queue = asyncio.Queue(maxsize=256)
+        session.clients.add(queue)
+        sender = asyncio.create_task(self._ws_send_loop(queue, writer))
+        try:
+            while True:
+                opcode, data = await _ws_read_message(reader)
+                if opcode == 0x8:  # close
+                    break
+                if opcode == 0x9:  # ping
+                    writer.write(_ws_frame(data, opcode=0xA))
+                    continue
+                if opcode != 0x1:
+                    continue
+                try:
+                    text = str(json.loads(data.decode("utf-8")).get("text", "")).strip()
+                except (ValueError, AttributeError):
+                    text = ""
+                if text and session.id in self.sessions:
+                    await session.process_input(text)  # Antwort kommt als "reply"-Ereignis
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            session.clients.discard(queue)
+            sender.cancel()
+            try:
+                writer.write(_ws_frame(b"", opcode=0x8))
+            except Exception:
+                pass
+
+    async def _ws_send_loop(self, queue, writer):
+        while True:
+            message = await queue.get()
+            if message is None:  # Sitzung geschlossen
+                writer.write(_ws_frame(b"", opcode=0x8))
+                await writer.drain()
+                return
+            writer.write(_ws_frame(message.encode("utf-8")))
+            await writer.drain()
+
+
+# -------------------------------
+# HTTP-/WebSocket-Hilfen (nur Standardbibliothek)
+# -------------------------------
+async def _read_request(reader):
+    """(methode, ziel, header, body) oder None, wenn der Client die Verbindung schließt."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise
+    except asyncio.LimitOverrunError:
+        raise ServiceError(431, "Header zu groß")
+    if len(head) > MAX_HEADER_BYTES:
+        raise ServiceError(431, "Header zu groß")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise ServiceError(400, "Ungültige Anfragezeile")
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY_BYTES:
+        raise ServiceError(413, "Body zu groß")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def _json_body(body):
+    if not body:
+        return {}
+    try:
+        data = json.loads(body.decode("utf-8"))
+    except ValueError:
+        raise ServiceError(400, "Body ist kein gültiges JSON")
+    if not isinstance(data, dict):
+        raise ServiceError(400, "Body muss ein JSON-Objekt sein")
+    return data
+
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+           431: "Request Header Fields Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+async def _write_response(writer, status, payload, keep_alive=True):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("ascii") + body)
+    await writer.drain()
+
+
+def _ws_frame(data, opcode=0x1):
+    """Ein unmaskierter Server-Frame (FIN gesetzt)."""
+    n = len(data)
+    if n < 126:
+        header = bytes((0x80 | opcode, n))
+    elif n < 1 << 16:
+        header = bytes((0x80 | opcode, 126)) + n.to_bytes(2, "big")
+    else:
+        header = bytes((0x80 | opcode, 127)) + n.to_bytes(8, "big")
+    return header + data
+
+
+async def _ws_read_message(reader):
+    """Liest eine (ggf. fragmentierte) Nachricht vom Client: (opcode, daten)."""
+    message, opcode = bytearray(), None
+    while True:
+        b1, b2 = await reader.readexactly(2)
+        fin, frame_op = b1 & 0x80, b1 & 0x0F
+        n = b2 & 0x7F
+        if n == 126:
+            n = int.from_bytes(await reader.readexactly(2), "big")
+        elif n == 127:
+            n = int.from_bytes(await reader.readexactly(8), "big")
+        if n > MAX_BODY_BYTES:
+            raise ConnectionError("WebSocket-Nachricht zu groß")
+        mask = await reader.readexactly(4) if b2 & 0x80 else None
+        data = await reader.readexactly(n)
+        if mask:
+            data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+        if frame_op >= 0x8:  # Steuerframes stehen für sich
+            return frame_op, data
+        if frame_op:
+            opcode = frame_op
+        message += data
+        if fin:
+            return opcode, bytes(message)
+
+
+# -------------------------------
+# Einstiegspunkt
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aurelia multi-session service")
+    parser.add_argument("--root", default="sessions", help="Verzeichnis für die Sitzungen (je eines pro ID)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tick", type=float, default=3.0, help="Sekunden zwischen zwei step() je Sitzung")
+    parser.add_argument("--max-sessions", type=int, default=1000)
+    parser.add_argument("--analytics", action="store_true",
+                        help="Archiv-Analyse (Prozess-Pool) für die Sitzungen einschalten")
+    args = parser.parse_args(argv)
+
+    # ohne --analytics kein Prozess-Pool im Dienst, egal was config.json sagt
+    config = dict(load_config(), analytics=args.analytics)
+    configure_logging(dict(config.get("logging") or {}, dir=os.path.abspath(args.root)))
+    service = AureliaService(args.root, config, tick_interval=args.tick, max_sessions=args.max_sessions)
+
+    async def serve():
+        port = await service.start(args.host, args.port)
+        print(f"Aurelia-Dienst auf http://{args.host}:{port} (Sitzungen in {service.root})")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await service.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_logging()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# bench_analytics.py – Archiv-Analyse (archive_analytics.py): Durchsatz je Anzahl Worker-Prozesse
+#
+# Aufruf:  python benchmarks/bench_analytics.py [--entries 1000000] [--workers 1,2,4] [--backend journal|sqlite]
+#
+# Erzeugt ein synthetisches Archiv (Zipf-Vokabular wie in bench_recall.py, dazu einige
+# eingestreute Themen und feste Phrasen) in einem temporären Verzeichnis und lässt den
+# kompletten Lauf (Planen, Map in den Prozessen, Reduce, Themen/Phrasen) für jede
+# Worker-Anzahl laufen. "0" in --workers bedeutet: ohne Prozess-Pool im Analyse-Thread.
+# Zum Schluss werden die gefundenen Themen und Phrasen des letzten Laufs ausgegeben.
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import archive_analytics  # noqa: E402
+from archive_analytics import ArchiveAnalytics  # noqa: E402
+from bench_recall import make_vocabulary, make_messages  # noqa: E402
+
+TOPICS = [
+    "wald baum licht moos",
+    "notizen archiv ordnung struktur",
+    "garten tomaten beet gießen",
+    "musik klavier übung akkorde",
+]
+PHRASES = ["morgen früh laufen", "einkaufsliste nicht vergessen", "idee für das projekt"]
+
+
+class _Archive:
+    """Das Nötigste von ArchiveManager: backend, store.path, end_cursor(), cursor_mark()."""
+
+    def __init__(self, backend, store):
+        self.backend = backend
+        self.store = store
+
+    def end_cursor(self):
+        return self.store.end_cursor()
+
+    def cursor_mark(self, cursor):
+        return self.store.cursor_mark(cursor)
+
+
+def make_archive(base, n, backend, seed=42):
+    rnd = random.Random(seed)
+    vocabulary = make_vocabulary(5000, seed)
+
+    def entries():
+        for i, text in enumerate(make_messages(n, vocabulary, seed)):
+            r = rnd.random()
+            if r < 0.2:
+                text += " " + " ".join(rnd.sample(rnd.choice(TOPICS).split(), 3))
+            elif r < 0.25:
+                text = rnd.choice(PHRASES) + " " + text
+            prefix = "User: " if i % 2 == 0 else "[2024-01-01 00:00:00] Aurelia: "
+            yield {"text": prefix + text, "timestamp": "2024-01-01 00:00:00"}
+
+    if backend == "sqlite":
+        from sqlite_archive import SqliteThoughtArchive
+        store = SqliteThoughtArchive(base)
+        batch = []
+        for entry in entries():
+            batch.append(entry)
+            if len(batch) >= 10000:
+                store.append_many(batch)
+                batch = []
+        store.append_many(batch)
+    else:
+        from thought_journal import ThoughtJournal
+        with open(os.path.join(base, ThoughtJournal.FILENAME), "w", encoding="utf-8") as f:
+            for entry in entries():
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        store = ThoughtJournal(base)
+    return _Archive(backend, store)
+
+
+def run_once(archive, workers):
+    archive_analytics._executor = None  # eigener Pool je Worker-Anzahl
+    if workers == 0:
+        archive_analytics._executor = False
+    analytics = ArchiveAnalytics(archive, workers=workers)
+    t0 = time.perf_counter()
+    analytics.request()
+    while analytics.poll() is None:
+        time.sleep(0.01)
+    wall = time.perf_counter() - t0
+    if archive_analytics._executor:
+        archive_analytics._executor.shutdown()
+    return wall, analytics.latest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aurelia archive analytics benchmark")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--workers", default=",".join(str(w) for w in sorted({0, 1, 2, os.cpu_count() or 1})))
+    parser.add_argument("--backend", choices=("journal", "sqlite"), default="journal")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    base = tempfile.mkdtemp(prefix="aurelia_analytics_")
+    try:
+        t0 = time.perf_counter()
+        archive = make_archive(base, args.entries, args.backend, args.seed)
+        print(f"Archiv: {args.entries} Einträge ({args.backend}) erzeugt in {time.perf_counter() - t0:.1f} s")
+        print(f"{'Worker':>7} {'Abschnitte':>11} {'Sekunden':>9} {'Einträge/s':>12}")
+        result = None
+        for workers in (int(w) for w in args.workers.split(",")):
+            wall, result = run_once(archive, workers)
+            print(f"{workers:>7} {result['chunks']:>11} {wall:>9.2f} {args.entries / wall:>12.0f}")
+        print("Themen:  " + " | ".join("/".join(t) for t in result["topics"]))
+        print("Phrasen: " + ", ".join(f"'{p}' ({n})" for p, n in result["phrases"][:5]))
+        archive.store.close()
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
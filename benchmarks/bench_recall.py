@@ -0,0 +1,96 @@
+# bench_recall.py – Erinnerungssuche: RecallIndex (TF-IDF) vs. linearer Scan über alle Nachrichten
+#
+# Aufruf:  python benchmarks/bench_recall.py [--messages 1000000] [--queries 500]
+#
+# Erzeugt synthetische Nachrichten (Zipf-verteiltes Vokabular wie echte Sprache), baut
+# den Index inkrementell mit add() auf und misst p50/p99 je Anfrage. Der lineare Scan
+# (Teilstring-Suche wie ThoughtJournal.search) läuft zum Vergleich nur über eine
+# Stichprobe von Anfragen.
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recall_index import RecallIndex  # noqa: E402
+
+
+def make_vocabulary(size, seed=42):
+    rnd = random.Random(seed)
+    letters = "abcdefghiklmnoprstuwäöü"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rnd.choice(letters) for _ in range(rnd.randint(4, 10))))
+    return sorted(words)
+
+
+def make_messages(n, vocabulary, seed=42):
+    rnd = random.Random(seed)
+    # Zipf: wenige sehr häufige, viele seltene Wörter
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    cum = []
+    total = 0.0
+    for w in weights:
+        total += w
+        cum.append(total)
+    for _ in range(n):
+        k = rnd.randint(4, 16)
+        yield " ".join(rnd.choices(vocabulary, cum_weights=cum, k=k))
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aurelia recall index benchmark")
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--scan-limit", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    vocabulary = make_vocabulary(args.vocabulary, args.seed)
+    index = RecallIndex(scan_limit=args.scan_limit)
+    texts = []
+    t0 = time.perf_counter()
+    for text in make_messages(args.messages, vocabulary, args.seed):
+        index.add(text, "user")
+        texts.append(text)
+    build = time.perf_counter() - t0
+    print(f"Aufbau: {len(index)} Nachrichten, {index.vocabulary_size} Wörter in {build:.1f} s "
+          f"({build / max(1, len(index)) * 1e6:.1f} µs je add)")
+
+    rnd = random.Random(args.seed + 1)
+    # Anfragen mischen seltene, mittlere und häufige Wörter (1–3 Suchwörter)
+    queries = ["Woran erinnerst du dich über " + " ".join(rnd.choice(vocabulary) for _ in range(rnd.randint(1, 3)))
+               for _ in range(args.queries)]
+    latencies = []
+    for q in queries:
+        t = time.perf_counter()
+        index.search(q, 5)
+        latencies.append(time.perf_counter() - t)
+    latencies.sort()
+    print(f"{'':>10} {'Anfragen':>9} {'p50 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10}")
+    print(f"{'index':>10} {len(latencies):>9} {percentile(latencies, 50) * 1000:>10.3f} "
+          f"{percentile(latencies, 99) * 1000:>10.3f} {latencies[-1] * 1000:>10.3f}")
+
+    scan = []
+    for q in queries[:5]:
+        terms = index.query_terms(q)
+        t = time.perf_counter()
+        [m for m in texts if any(term in m for term in terms)]
+        scan.append(time.perf_counter() - t)
+    scan.sort()
+    print(f"{'scan':>10} {len(scan):>9} {percentile(scan, 50) * 1000:>10.3f} "
+          f"{percentile(scan, 99) * 1000:>10.3f} {scan[-1] * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# bench_serializers.py – Snapshot-Formate im Vergleich: Größe, Kodieren, Dekodieren
+#
+# Aufruf:  python benchmarks/bench_serializers.py [--dir Aurelia]
+#
+# Ohne --dir werden ein voller context.json-Stand (500 Nachrichten, 40 kurz, 1000 lang)
+# und ein aurelia_state.json mit 1000 Erfahrungen synthetisch erzeugt. Mit --dir werden
+# die echten Snapshots aus dem Verzeichnis gelesen. Vergleichsbasis ist das alte Format
+# (JSON mit indent=2).
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from persistence import read_snapshot  # noqa: E402
+from serializers import available_serializers, get_serializer  # noqa: E402
+
+WORDS = ("baum wald licht gedanke notizen archiv muster thema frage idee ziel "
+         "verbindung erinnerung zukunft ordnung struktur neugier reflexion").split()
+
+
+def make_context(n_conv=500, n_short=40, n_long=1000, seed=42):
+    rnd = random.Random(seed)
+    start = datetime.datetime(2024, 1, 1)
+    seq = 0
+
+    def message(i):
+        nonlocal seq
+        seq += 1
+        who = "user" if i % 2 == 0 else "aurelia"
+        text = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(4, 16)))
+        ts = start + datetime.timedelta(seconds=7 * seq, microseconds=rnd.randrange(1, 10**6))
+        return {"who": who, "text": text, "time": str(ts), "seq": seq}
+
+    long_mem = [message(i) for i in range(n_long)]
+    conversation = [message(i) for i in range(n_conv)]
+    return {"conversation": conversation,
+            "memory": {"short": conversation[-n_short:], "long": long_mem},
+            "seq": seq, "cold_seq": 0}
+
+
+def make_state(n_exp=1000, n_goals=20, seed=42):
+    rnd = random.Random(seed)
+    start = datetime.datetime(2024, 1, 1)
+    types = ("goal_created", "goal_progress", "self_reflection", "success", "failure")
+    experience = []
+    for i in range(n_exp):
+        ts = start + datetime.timedelta(seconds=11 * i, microseconds=rnd.randrange(1, 10**6))
+        experience.append({"time": str(ts), "type": rnd.choice(types),
+                           "detail": f"analysiere die letzten {rnd.randint(5, 50)} Einträge auf {rnd.choice(WORDS)}"})
+    goals = [{"id": 1704067200 + i, "title": f"organisiere {rnd.choice(WORDS)} nach Thema",
+              "priority": rnd.uniform(0.3, 0.9), "created": str(start + datetime.timedelta(hours=i))}
+             for i in range(n_goals)]
+    return {"goals": goals, "experience": experience, "last_action": str(start),
+            "personality": {"curiosity": 0.81, "empathy": 0.66, "directness": 0.42}}
+
+
+def bench(fn, arg, repeat=7):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def compare(label, data):
+    print(label)
+    print(f"{'Format':>14} {'Bytes':>10} {'Größe':>7} {'kodieren (ms)':>14} {'dekodieren (ms)':>16}")
+    t_enc, raw = bench(lambda d: json.dumps(d, ensure_ascii=False, indent=2).encode("utf-8"), data)
+    t_dec, _ = bench(lambda r: json.loads(r.decode("utf-8")), raw)
+    base = len(raw)
+    print(f"{'json indent=2':>14} {base:>10} {1.0:>6.2f}x {t_enc * 1000:>14.2f} {t_dec * 1000:>16.2f}")
+    for name in available_serializers():
+        serializer = get_serializer(name)
+        t_enc, raw = bench(serializer.dumps, data)
+        t_dec, decoded = bench(serializer.loads, raw)
+        assert decoded == data, f"{name}: Roundtrip weicht ab"
+        print(f"{name:>14} {len(raw):>10} {len(raw) / base:>6.2f}x {t_enc * 1000:>14.2f} {t_dec * 1000:>16.2f}")
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aurelia snapshot serializer benchmark")
+    parser.add_argument("--dir", default=None, help="echte Snapshots aus diesem Verzeichnis verwenden")
+    args = parser.parse_args(argv)
+
+    if args.dir:
+        for name in ("context.json", "aurelia_state.json"):
+            data, source = read_snapshot(os.path.join(args.dir, name), set_aside=False)
+            if source is None:
+                print(f"{name}: nicht vorhanden oder nicht lesbar\n")
+                continue
+            compare(f"{name} ({args.dir})", data)
+    else:
+        compare("context.json (synthetisch: 500 Nachrichten, 40 kurz, 1000 lang)", make_context())
+        compare("aurelia_state.json (synthetisch: 1000 Erfahrungen, 20 Ziele)", make_state())
+    if "msgpack" not in available_serializers():
+        print("msgpack ist nicht installiert (pip install msgpack) und fehlt im Vergleich.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# bench_service.py – Lastgenerator für aurelia_service.py: Sitzungen pro CPU-Kern
+#
+# Aufruf:  python benchmarks/bench_service.py --sessions 200 --duration 20 [--rate 20] [--tick 3.0]
+#          python benchmarks/bench_service.py --url http://127.0.0.1:8765 ...   (laufenden Dienst nutzen)
+#
+# Startet den Dienst als eigenen Prozess (temporäres Sitzungsverzeichnis), legt N Sitzungen
+# an und schickt dann `duration` Sekunden lang Eingaben an zufällige Sitzungen – mit
+# --rate in Eingaben/s insgesamt, mit --rate 0 so schnell, wie `concurrency` Clients
+# schaffen. Die Ticks aller Sitzungen laufen dabei weiter. Aus der CPU-Zeit des Dienstes
+# (/health → cpu_s) ergibt sich, wie viele Sitzungen ein Kern bei dieser Last trägt.
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import signal
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INPUTS = [
+    "Hallo Aurelia!",
+    "Wie geht es dir heute?",
+    "Was denkst du über Ordnung und Struktur in meinen Notizen?",
+    "Erinnerst du dich an unser Gespräch über den Wald?",
+    "Erstelle bitte eine Übersicht der letzten Ideen.",
+    "Ich habe heute viel über Verbindungen zwischen Themen nachgedacht.",
+]
+
+
+class HttpClient:
+    """Minimaler HTTP/1.1-Client mit Keep-Alive über eine Verbindung (nur Standardbibliothek)."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write((f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                           f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode("ascii") + body)
+        await self.writer.drain()
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(head[0].split(" ", 2)[1])
+        length = 0
+        for line in head[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length) if length else b"{}"
+        return status, json.loads(data.decode("utf-8"))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def start_service(root, tick):
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "aurelia_service.py"), "--root", root,
+                             "--port", "0", "--tick", str(tick), "--max-sessions", "100000"],
+                            stdout=subprocess.PIPE, text=True, cwd=ROOT)
+    line = proc.stdout.readline()  # "Aurelia-Dienst auf http://host:port (...)"
+    if "http://" not in line:
+        proc.kill()
+        raise RuntimeError(f"Dienst startet nicht: {line!r}")
+    url = line.split("http://", 1)[1].split()[0]
+    return proc, "http://" + url
+
+
+async def run(args, url):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port
+
+    # Sitzungen anlegen
+    ids = [f"bench{i:05d}" for i in range(args.sessions)]
+    t0 = time.perf_counter()
+    queue = list(ids)
+
+    async def creator():
+        client = HttpClient(host, port)
+        while queue:
+            sid = queue.pop()
+            status, _ = await client.request("POST", "/sessions", {"id": sid})
+            assert status in (200, 201), status
+        client.close()
+
+    await asyncio.gather(*(creator() for _ in range(args.concurrency)))
+    create_s = time.perf_counter() - t0
+
+    health = HttpClient(host, port)
+    _, before = await health.request("GET", "/health")
+    rnd = random.Random(args.seed)
+    latencies, errors = [], 0
+    t_start = time.perf_counter()
+    deadline = t_start + args.duration
+    interval = args.concurrency / args.rate if args.rate > 0 else 0.0
+
+    async def sender(offset):
+        nonlocal errors
+        client = HttpClient(host, port)
+        next_send = t_start + offset
+        while True:
+            if interval:
+                await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+                next_send += interval
+            if time.perf_counter() >= deadline:
+                break
+            sid = rnd.choice(ids)
+            t = time.perf_counter()
+            status, _ = await client.request("POST", f"/sessions/{sid}/input", {"text": rnd.choice(INPUTS)})
+            latencies.append(time.perf_counter() - t)
+            if status != 200:
+                errors += 1
+        client.close()
+
+    await asyncio.gather(*(sender(i * interval / args.concurrency) for i in range(args.concurrency)))
+    wall = time.perf_counter() - t_start
+    _, after = await health.request("GET", "/health")
+    health.close()
+
+    cpu = after["cpu_s"] - before["cpu_s"]
+    cores = cpu / wall if wall else 0.0
+    latencies.sort()
+    return {
+        "sessions": args.sessions,
+        "tick_s": args.tick,
+        "create_s": create_s,
+        "inputs": len(latencies),
+        "errors": errors,
+        "inputs_per_s": len(latencies) / wall if wall else 0.0,
+        "ticks_per_s": (after["ticks"] - before["ticks"]) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "server_cores": cores,
+        "sessions_per_core": args.sessions / cores if cores else float("inf"),
+    }
+
+
+def print_report(r):
+    print(f"{r['sessions']} Sitzungen angelegt in {r['create_s']:.2f} s, Tick alle {r['tick_s']:g} s")
+    print(f"Eingaben: {r['inputs']} ({r['inputs_per_s']:.1f}/s, Fehler {r['errors']}), "
+          f"p50 {r['p50_ms']:.2f} ms, p99 {r['p99_ms']:.2f} ms")
+    print(f"Ticks: {r['ticks_per_s']:.1f}/s | Dienst-CPU: {r['server_cores']:.2f} Kerne "
+          f"→ {r['sessions_per_core']:.0f} Sitzungen pro Kern bei dieser Last")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aurelia service load generator")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=20.0, help="Messdauer in Sekunden")
+    parser.add_argument("--rate", type=float, default=20.0, help="Eingaben/s insgesamt (0 = so schnell wie möglich)")
+    parser.add_argument("--concurrency", type=int, default=16, help="gleichzeitige Client-Verbindungen")
+    parser.add_argument("--tick", type=float, default=3.0, help="Tick-Intervall je Sitzung (nur ohne --url)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", default=None, help="laufenden Dienst benutzen statt einen zu starten")
+    parser.add_argument("--json", action="store_true", help="Ergebnis als JSON ausgeben")
+    args = parser.parse_args(argv)
+
+    proc = root = None
+    url = args.url
+    if url is None:
+        root = tempfile.mkdtemp(prefix="aurelia_service_")
+        proc, url = start_service(root, args.tick)
+    try:
+        result = asyncio.run(run(args, url))
+    finally:
+        if proc is not None:
+            proc.send_signal(signal.SIGINT)
+            try:
+                proc.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+            shutil.rmtree(root, ignore_errors=True)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# bench_tokenizer.py – Seeding und Eingabepfad: alte Inline-Tokenisierung vs. tokenizer.py
+#
+# Aufruf:  python benchmarks/bench_tokenizer.py
+import os
+import sys
+import time
+import random
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tokenizer import count_tokens  # noqa: E402
+from aurelia_engine import SimpleNLU  # noqa: E402
+
+WORDS = ("baum wald licht gedanke notizen archiv muster thema frage idee ziel "
+         "verbindung erinnerung zukunft ordnung struktur neugier reflexion").split()
+TEMPLATES = [
+    "Aurelia: Ich denke an '{w}' — vielleicht ergibt das eine Verbindung zu anderen Themen.",
+    "Aurelia: Neue Idee / Ziel: organisiere die Notizen nach Thema",
+    "Aurelia: Ich arbeite an: analysiere die letzten 20 Einträge auf Muster — nächster Schritt: Beobachten und ordnen.",
+    "User: Was denkst du über {w} und {v}?",
+    "Aurelia (Antwort): Kannst du das näher beschreiben?",
+]
+
+
+def make_thoughts(n, seed=42):
+    rnd = random.Random(seed)
+    start = datetime.datetime(2024, 1, 1)
+    out = []
+    for i in range(n):
+        text = rnd.choice(TEMPLATES).format(w=rnd.choice(WORDS), v=rnd.choice(WORDS))
+        ts = (start + datetime.timedelta(seconds=3 * i)).strftime("%Y-%m-%d %H:%M:%S")
+        # ThoughtStream-Einträge tragen einen Zeitstempel, User-Einträge nicht
+        out.append({"text": f"[{ts}] {text}" if not text.startswith("User") else text})
+    return out
+
+
+def seed_old(thoughts):
+    assoc = {}
+    for t in thoughts:
+        text = t.get("text", "")
+        words = [w.strip(".,!?;:()[]").lower() for w in text.split() if len(w) > 2]
+        for w in words:
+            assoc.setdefault(w, 0)
+            assoc[w] += 1
+    return assoc
+
+
+def seed_new(thoughts):
+    return dict(count_tokens(t.get("text", "") for t in thoughts))
+
+
+# Intent-Tabelle der früheren if/elif-Kette in SimpleNLU.interpret
+OLD_INTENTS = [
+    ("greeting", ["hallo", "hi", "hey"]),
+    ("howareyou", ["wie geht", "alles gut", "na?"]),
+    ("action_request", ["mach", "starte", "führe", "öffne", "erstelle"]),
+    ("opinion", ["was denkst", "meinung", "was meinst", "wie findest"]),
+    ("memory_request", ["erinnere", "erinnerung", "woran erinnerst", "hast du"]),
+    ("question", ["?"]),
+]
+
+
+def input_old(thoughts):
+    # früher: any()-Kette für den Intent, dann zerlegten process_input und interpret denselben Text je selbst
+    for t in thoughts:
+        text = t["text"]
+        low = text.lower()
+        next((intent for intent, keys in OLD_INTENTS if any(k in low for k in keys)), "statement")
+        [w.strip(".,!?;:()[]").lower() for w in text.split() if len(w) > 2]
+        [w.strip(".,!?;:()[]\"'") for w in low.split() if len(w) > 3][:3]
+
+
+def input_new(thoughts, nlu=SimpleNLU()):
+    # heute: SimpleNLU.interpret (IntentMatcher.match + normalize_words), process_input nutzt nlu["tokens"]
+    for t in thoughts:
+        nlu.interpret(t["text"])["tokens"]
+
+
+def bench(fn, thoughts, repeat=5, before=None):
+    best = float("inf")
+    for _ in range(repeat):
+        if before:
+            before()
+        t0 = time.perf_counter()
+        fn(thoughts)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    print("Seeding (Wörter zählen über alle Einträge)")
+    print(f"{'Einträge':>9} {'alt (ms)':>10} {'neu (ms)':>10} {'Speedup':>9}")
+    for n in (500, 50_000):
+        thoughts = make_thoughts(n)
+        t_old = bench(seed_old, thoughts)
+        t_new = bench(seed_new, thoughts)
+        print(f"{n:>9} {t_old * 1000:>10.2f} {t_new * 1000:>10.2f} {t_old / t_new:>8.2f}x")
+
+    print()
+    print("Eingaben (Intent, Wörter für Assoziationen und Entities)")
+    print(f"{'Eingaben':>9} {'alt (ms)':>10} {'neu (ms)':>10} {'Speedup':>9}")
+    for n in (500, 50_000):
+        thoughts = make_thoughts(n)
+        t_old = bench(input_old, thoughts)
+        t_new = bench(input_new, thoughts)
+        print(f"{n:>9} {t_old * 1000:>10.2f} {t_new * 1000:>10.2f} {t_old / t_new:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
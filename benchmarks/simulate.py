@@ -0,0 +1,225 @@
+# simulate.py – Headless-Simulation: DecisionEngine & Co. ohne Kivy, so schnell wie möglich
+#
+# Aufruf:  python benchmarks/simulate.py --steps 5000 --inputs 500 --seed 42 [--backend sqlite]
+#
+# Baut ArchiveManager, ContextManager, DecisionEngine und ThoughtStream über den
+# EngineWorker in einem temporären Verzeichnis auf (ohne den Thread zu starten) und
+# führt N Engine-Schritte sowie M skriptierte Eingaben (user_message, wie die UI sie
+# schickt) gleichmäßig verteilt aus. Gemessen werden Schritte/s, p50/p99 je
+# Schritt, geschriebene Bytes und Peak-RSS.
+#
+# Die Engine läuft auf einer simulierten Uhr (SimClock), die pro Schritt um das
+# Tick-Intervall des Workers vorrückt: Cooldown, gebündeltes Speichern, Alterung der
+# Ziele und das Stundenfenster der Erfahrungen verhalten sich wie nach N echten Ticks.
+# Gezählt werden zusätzlich die Ereignisse je Topic und die State-Schreibvorgänge.
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import Counter  # noqa: E402
+
+from aurelia_logging import configure_logging, shutdown_logging  # noqa: E402
+from aurelia_engine import EngineWorker  # noqa: E402
+
+INPUTS = [
+    "Hallo Aurelia!",
+    "Wie geht es dir heute?",
+    "Was denkst du über Ordnung und Struktur in meinen Notizen?",
+    "Erinnerst du dich an unser Gespräch über den Wald?",
+    "Erstelle bitte eine Übersicht der letzten Ideen.",
+    "Ich habe heute viel über Verbindungen zwischen Themen nachgedacht.",
+    "Welche Muster siehst du im Archiv?",
+    "Hast du eine Meinung zu meinem neuen Projekt?",
+]
+
+
+class SimClock:
+    """Simulierte Zeit in Epoch-Sekunden; startet bei der echten Zeit, advance() rückt vor."""
+
+    def __init__(self, start=None):
+        self.now = time.time() if start is None else start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def bytes_written():
+    """Bisher vom Prozess geschriebene Bytes (psutil oder /proc/self/io), sonst None."""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).io_counters().write_bytes
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/io", "r") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss():
+    """Höchster RSS des Prozesses in Bytes, sonst None."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        pass
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().peak_wset
+    except Exception:
+        return None
+
+
+def dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def summarize(latencies):
+    values = sorted(latencies)
+    total = sum(values)
+    return {
+        "count": len(values),
+        "per_sec": len(values) / total if total else 0.0,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": (values[-1] * 1000) if values else 0.0,
+    }
+
+
+def simulate(steps, inputs, seed=42, backend="journal", base_path=None, analytics=False):
+    """Führt die Simulation aus und gibt die Messwerte als Dict zurück."""
+    random.seed(seed)
+    base_path = base_path or tempfile.mkdtemp(prefix="aurelia_sim_")
+    configure_logging({"dir": base_path})
+
+    io_start = bytes_written()
+    t0 = time.perf_counter()
+    clock = SimClock()
+    start_time = clock.now
+    # Archiv-Analyse (Prozess-Pool) nur auf Wunsch: sonst misst die Simulation Spawn-Kosten mit
+    worker = EngineWorker(base_path, {"archive_backend": backend, "analytics": analytics}, clock=clock)
+    worker.build()  # Komponenten wie im Worker-Thread, aber synchron im Aufrufer
+    worker.finish_recall()
+    build_time = time.perf_counter() - t0
+    events = Counter(topic for topic, _ in worker.drain_events(max_events=None))
+
+    step_lat, input_lat = [], []
+    # Eingaben gleichmäßig zwischen die Schritte legen
+    every = (steps // inputs) if inputs else 0
+    done_inputs = 0
+    t_run = time.perf_counter()
+    for i in range(steps):
+        if every and i % every == 0 and done_inputs < inputs:
+            text = INPUTS[done_inputs % len(INPUTS)]
+            t = time.perf_counter()
+            worker.handle("user_message", text)
+            input_lat.append(time.perf_counter() - t)
+            done_inputs += 1
+        clock.advance(worker.tick_interval)
+        t = time.perf_counter()
+        worker.handle("tick")
+        step_lat.append(time.perf_counter() - t)
+        events.update(topic for topic, _ in worker.drain_events(max_events=1000))
+    while done_inputs < inputs:
+        text = INPUTS[done_inputs % len(INPUTS)]
+        t = time.perf_counter()
+        worker.handle("user_message", text)
+        input_lat.append(time.perf_counter() - t)
+        done_inputs += 1
+    events.update(topic for topic, _ in worker.drain_events(max_events=None))
+    state_writes = worker.decision_engine._state_writer.writes
+    t = time.perf_counter()
+    worker.close()
+    shutdown_time = time.perf_counter() - t
+    run_time = time.perf_counter() - t_run
+    shutdown_logging()
+
+    io_end = bytes_written()
+    return {
+        "seed": seed,
+        "backend": backend,
+        "base_path": base_path,
+        "build_s": build_time,
+        "run_s": run_time,
+        "shutdown_s": shutdown_time,
+        "steps": summarize(step_lat),
+        "inputs": summarize(input_lat),
+        "simulated_s": clock.now - start_time,
+        "events": dict(events),
+        "state_writes": state_writes,
+        "bytes_written": (io_end - io_start) if io_start is not None and io_end is not None else None,
+        "bytes_on_disk": dir_size(base_path),
+        "peak_rss": peak_rss(),
+    }
+
+
+def print_report(r):
+    mb = 1024.0 ** 2
+    print(f"Backend: {r['backend']}  Seed: {r['seed']}  Verzeichnis: {r['base_path']}")
+    print(f"Aufbau {r['build_s'] * 1000:.1f} ms, Lauf {r['run_s']:.2f} s, Beenden {r['shutdown_s'] * 1000:.1f} ms")
+    print(f"{'':>10} {'Anzahl':>8} {'pro s':>10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10}")
+    for name in ("steps", "inputs"):
+        s = r[name]
+        print(f"{name:>10} {s['count']:>8} {s['per_sec']:>10.1f} {s['p50_ms']:>10.3f} "
+              f"{s['p99_ms']:>10.3f} {s['max_ms']:>10.3f}")
+    print(f"Simulierte Zeit: {r['simulated_s'] / 3600:.1f} h, State-Schreibvorgänge im Lauf: {r['state_writes']}")
+    print("Ereignisse: " + ", ".join(f"{topic} {n}" for topic, n in sorted(r["events"].items())))
+    written = r["bytes_written"]
+    print(f"Geschrieben: {written / mb:.2f} MB" if written is not None else "Geschrieben: n/a",
+          f" | auf Platte: {r['bytes_on_disk'] / mb:.2f} MB", end="")
+    print(f" | Peak-RSS: {r['peak_rss'] / mb:.1f} MB" if r["peak_rss"] else " | Peak-RSS: n/a")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aurelia headless simulation")
+    parser.add_argument("--steps", type=int, default=2000, help="Anzahl Engine-Schritte (ThoughtStream.update)")
+    parser.add_argument("--inputs", type=int, default=200, help="Anzahl skriptierter Eingaben (process_input)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", choices=("journal", "sqlite"), default="journal")
+    parser.add_argument("--dir", default=None, help="Arbeitsverzeichnis (Standard: temporär, wird gelöscht)")
+    parser.add_argument("--keep", action="store_true", help="temporäres Verzeichnis behalten")
+    parser.add_argument("--json", action="store_true", help="Ergebnis als JSON ausgeben")
+    parser.add_argument("--analytics", action="store_true", help="Archiv-Analyse im Prozess-Pool einschalten")
+    args = parser.parse_args(argv)
+
+    result = simulate(args.steps, args.inputs, args.seed, args.backend, args.dir, args.analytics)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+    if not args.dir and not args.keep:
+        shutil.rmtree(result["base_path"], ignore_errors=True)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,9 @@ package.name = aurelia
 package.domain = org.aurelia
 source.dir = .
 source.include_exts = py,png,jpg,kv,atlas,json
+source.exclude_dirs = benchmarks
 version = 0.1
-requirements = python3,kivy,packaging,colorama,openssl,pyopenssl,requests,cython
+requirements = python3,sqlite3,kivy,psutil,packaging,colorama,openssl,pyopenssl,requests,cython
 orientation = portrait
 fullscreen = 1
 osx.python_version = 3
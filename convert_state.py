@@ -0,0 +1,64 @@
+# convert_state.py – Snapshots (context.json, aurelia_state.json) zwischen den Formaten umwandeln
+#
+# Aufruf:  python convert_state.py --to compact Aurelia/context.json Aurelia/aurelia_state.json
+#          python convert_state.py --to plain Aurelia/context.json        (lesbares JSON, eingerückt)
+#          python convert_state.py --info Aurelia/*.json
+#
+# Ohne --out wird die Datei an Ort und Stelle ersetzt; der vorige Stand bleibt als .bak
+# liegen. "plain" schreibt reines, eingerücktes JSON ohne Kopf und Prüfsumme – die App
+# liest es weiterhin und schreibt beim nächsten Snapshot wieder im konfigurierten Format.
+import os
+import sys
+import shutil
+import argparse
+
+from persistence import BACKUP_SUFFIX, atomic_write_json, read_snapshot, snapshot_encoding, write_snapshot
+from serializers import SERIALIZERS
+
+
+def convert(path, target, out_path=None):
+    """Liest den Snapshot `path` und schreibt ihn im Format `target` nach out_path (Standard: path)."""
+    data, source = read_snapshot(path, set_aside=False)
+    if source != "snapshot":
+        raise ValueError(f"{path}: kein gültiger Snapshot" + (" (nur das Backup ist lesbar)" if source else ""))
+    out_path = out_path or path
+    if target == "plain":
+        if os.path.exists(out_path):
+            shutil.copy2(out_path, out_path + BACKUP_SUFFIX)
+        atomic_write_json(out_path, data, indent=2)
+    else:
+        write_snapshot(out_path, data, target)
+    return os.path.getsize(out_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aurelia snapshot converter")
+    parser.add_argument("paths", nargs="+", help="Snapshot-Dateien (context.json, aurelia_state.json)")
+    parser.add_argument("--to", choices=("plain",) + tuple(SERIALIZERS), help="Zielformat")
+    parser.add_argument("--out", default=None, help="Zielverzeichnis (Standard: an Ort und Stelle)")
+    parser.add_argument("--info", action="store_true", help="nur Format und Größe anzeigen")
+    args = parser.parse_args(argv)
+    if not args.info and not args.to:
+        parser.error("--to oder --info angeben")
+
+    failed = False
+    for path in args.paths:
+        try:
+            before = os.path.getsize(path)
+            encoding = snapshot_encoding(path)
+            if args.info:
+                print(f"{path}: {encoding}, {before} Bytes")
+                continue
+            out_path = os.path.join(args.out, os.path.basename(path)) if args.out else None
+            if args.out:
+                os.makedirs(args.out, exist_ok=True)
+            after = convert(path, args.to, out_path)
+            print(f"{path}: {encoding} → {args.to}, {before} → {after} Bytes")
+        except Exception as e:
+            failed = True
+            print(f"{path}: Fehler: {e}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
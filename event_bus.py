@@ -0,0 +1,131 @@
+# event_bus.py – Prozessinterner Pub/Sub zwischen Engine und UI (und weiteren Verbrauchern)
+import time
+import threading
+from collections import deque, namedtuple
+
+# Topics
+THOUGHT = "thought"          # (id, text) – neuer Gedanke im ThoughtStream
+REPLY = "reply"              # Antworttext auf eine Nutzereingabe
+POPUP = "popup"              # Frage an den Nutzer
+GOAL = "goal"                # Text eines verfolgten/neuen Ziels
+REFLECTION = "reflection"    # Text einer Selbstreflexion
+HISTORY = "history"          # {"items", "cursor"} – Verlauf beim Start
+OLDER = "older"              # {"items", "cursor"} – ältere Archiv-Seite
+READY = "ready"              # {"personality"} – Engine bereit
+STARTED = "started"          # Worker vollständig aufgebaut
+TOPICS = (THOUGHT, REPLY, POPUP, GOAL, REFLECTION, HISTORY, OLDER, READY, STARTED)
+
+Event = namedtuple("Event", "topic payload seq time")
+
+
+class Subscription:
+    """
+    Warteschlange eines Abonnenten mit Obergrenze `maxsize`.
+
+    Ist sie voll, wartet publish() bis zu `block_timeout` Sekunden, dass der Abonnent
+    abholt (Backpressure auf den Erzeuger); danach fällt das älteste Ereignis heraus
+    und `dropped` wird hochgezählt. `wake` wird aufgerufen, sobald die leere
+    Warteschlange wieder etwas enthält – einmal pro Schub, nicht pro Ereignis.
+    """
+
+    def __init__(self, bus, topics=None, maxsize=1000, block_timeout=0.5, wake=None, name=""):
+        self.bus = bus
+        self.topics = frozenset(topics) if topics else None
+        self.maxsize = maxsize
+        self.block_timeout = block_timeout
+        self.name = name
+        self.dropped = 0
+        self._wake = wake
+        self._queue = deque()
+        self._cond = threading.Condition()
+
+    def accepts(self, topic):
+        return self.topics is None or topic in self.topics
+
+    def set_wake(self, wake):
+        """Setzt den Weck-Callback; liegen schon Ereignisse an, wird er sofort aufgerufen."""
+        with self._cond:
+            self._wake = wake
+            pending = bool(self._queue)
+        if wake and pending:
+            wake()
+
+    def _put(self, event):
+        with self._cond:
+            if len(self._queue) >= self.maxsize:
+                deadline = time.monotonic() + self.block_timeout
+                while len(self._queue) >= self.maxsize:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._queue.popleft()
+                        self.dropped += 1
+                        break
+                    self._cond.wait(remaining)
+            was_empty = not self._queue
+            self._queue.append(event)
+            self._cond.notify_all()
+            wake = self._wake if was_empty else None
+        if wake:
+            wake()
+
+    def drain(self, max_events=None):
+        """Holt bis zu max_events Ereignisse (None = alle) auf einmal ab."""
+        with self._cond:
+            n = len(self._queue) if max_events is None else min(max_events, len(self._queue))
+            events = [self._queue.popleft() for _ in range(n)]
+            if events:
+                self._cond.notify_all()  # wartende Erzeuger freigeben
+        return events
+
+    def wait(self, timeout=None):
+        """Blockiert, bis ein Ereignis anliegt (oder timeout); True, wenn etwas da ist."""
+        with self._cond:
+            if not self._queue:
+                self._cond.wait(timeout)
+            return bool(self._queue)
+
+    def __len__(self):
+        return len(self._queue)
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """
+    Verteilt Ereignisse an alle Abonnenten eines Topics (siehe TOPICS).
+
+    publish() stellt nur in die Warteschlangen der Abonnenten; jeder holt in seinem
+    eigenen Takt per drain() ab. Weitere Verbraucher (Logger, Export, Metriken) hängen
+    sich mit subscribe() an, ohne dass jemand pollen muss.
+    """
+
+    def __init__(self):
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def subscribe(self, topics=None, maxsize=1000, block_timeout=0.5, wake=None, name=""):
+        for topic in topics or ():
+            if topic not in TOPICS:
+                raise ValueError(f"Unbekanntes Topic: {topic}")
+        sub = Subscription(self, topics, maxsize, block_timeout, wake, name)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [sub]
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not sub]
+
+    def publish(self, topic, payload=None):
+        if topic not in TOPICS:
+            raise ValueError(f"Unbekanntes Topic: {topic}")
+        with self._lock:
+            self._seq += 1
+            event = Event(topic, payload, self._seq, time.time())
+            subscriptions = self._subscriptions
+        for sub in subscriptions:
+            if sub.accepts(topic):
+                sub._put(event)
+        return event
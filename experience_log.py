@@ -0,0 +1,136 @@
+# experience_log.py – Erfahrungen der DecisionEngine: Ringpuffer, laufende Zähler, Seitenlog
+import time
+import datetime
+from collections import Counter, deque
+from itertools import islice
+
+from thought_journal import ThoughtJournal
+
+WINDOWS = ("recent", "hour", "lifetime")
+
+
+class ExperienceLog:
+    """
+    Erfahrungen ({"time", "type", "detail"}) als Ringpuffer fester Größe mit Zählern je Typ.
+
+    Drei Fenster werden bei jedem record() inkrementell nachgeführt: "recent" (die
+    letzten `recent_size` Erfahrungen), "hour" (die letzten `window` Sekunden) und
+    "lifetime". counts()/count() lesen die Zähler, ohne Erfahrungen zu durchlaufen.
+    Das Stundenfenster verwirft abgelaufene Einträge beim Schreiben und Lesen von
+    vorn (amortisiert O(1)).
+
+    Die vollständige Historie landet nur im Append-Journal aurelia_experience.jsonl
+    (ThoughtJournal: gebündelte fsyncs), nicht in aurelia_state.json. Beim Start füllt
+    load() den Ringpuffer aus dem Ende des Journals; die Lifetime-Zähler sind ein
+    kleines Dict, das die DecisionEngine im State mitspeichert.
+
+    clock: Zeitquelle in Epoch-Sekunden (Standard time.time); die Simulation reicht
+    eine eigene Uhr durch, damit das Stundenfenster ihrer Zeit folgt.
+    """
+    FILENAME = "aurelia_experience.jsonl"
+
+    def __init__(self, base_path, capacity=1000, recent_size=30, window=3600.0, clock=time.time):
+        self.capacity = capacity
+        self.recent_size = recent_size
+        self.window = window
+        self.clock = clock
+        self.journal = ThoughtJournal(base_path, filename=self.FILENAME, legacy_filename=None)
+        self._ring = deque(maxlen=capacity)
+        self._recent = deque()       # Typen der letzten recent_size Erfahrungen
+        self._timed = deque()        # (epoch, typ) im Stundenfenster
+        self._counts = {"recent": Counter(), "hour": Counter(), "lifetime": Counter()}
+
+    def __len__(self):
+        return len(self._ring)
+
+    def load(self, legacy=None, lifetime=None):
+        """
+        Füllt den Ringpuffer aus dem Journal. legacy: alte Liste aus aurelia_state.json,
+        wird bei leerem Journal einmalig übernommen. lifetime: gespeicherte Zähler; fehlen
+        sie, zählt die übernommene Liste bzw. der Ringpuffer.
+        """
+        if legacy and not self.journal.end_cursor():
+            self.journal.append_many([e for e in legacy if isinstance(e, dict)])
+        items = self.journal.last(self.capacity)
+        now = self.clock()
+        for item in items:
+            self._add(item, self._epoch(item, now), now)
+        if isinstance(lifetime, dict):
+            self._counts["lifetime"] = Counter({str(k): int(v) for k, v in lifetime.items()})
+        else:
+            self._counts["lifetime"] = Counter(e.get("type") for e in (legacy or items) if isinstance(e, dict))
+
+    @staticmethod
+    def _epoch(item, default):
+        try:
+            return datetime.datetime.fromisoformat(str(item.get("time"))).timestamp()
+        except (TypeError, ValueError):
+            return default
+
+    # ---------- Schreiben ----------
+    def record(self, typ, detail):
+        """Hängt eine Erfahrung an (Journal + Ringpuffer) und zählt sie in allen Fenstern."""
+        now = self.clock()
+        item = {"time": str(datetime.datetime.fromtimestamp(now)), "type": typ, "detail": detail}
+        self.journal.append(item)
+        self._add(item, now, now)
+        self._counts["lifetime"][typ] += 1
+        return item
+
+    def _add(self, item, epoch, now):
+        typ = item.get("type")
+        self._ring.append(item)
+        recent, counts = self._recent, self._counts["recent"]
+        recent.append(typ)
+        counts[typ] += 1
+        if len(recent) > self.recent_size:
+            self._decrement(counts, recent.popleft())
+        if epoch >= now - self.window:
+            self._timed.append((epoch, typ))
+            self._counts["hour"][typ] += 1
+        self._expire(now)
+
+    def _expire(self, now):
+        timed, counts = self._timed, self._counts["hour"]
+        limit = now - self.window
+        while timed and timed[0][0] < limit:
+            self._decrement(counts, timed.popleft()[1])
+
+    @staticmethod
+    def _decrement(counter, typ):
+        counter[typ] -= 1
+        if counter[typ] <= 0:
+            del counter[typ]
+
+    # ---------- Lesen ----------
+    def count(self, typ, window="recent"):
+        """Anzahl der Erfahrungen vom Typ typ im Fenster ("recent", "hour", "lifetime")."""
+        if window == "hour":
+            self._expire(self.clock())
+        return self._counts[window].get(typ, 0)
+
+    def total(self, window="recent"):
+        """Anzahl aller Erfahrungen im Fenster."""
+        if window == "recent":
+            return len(self._recent)
+        if window == "hour":
+            self._expire(self.clock())
+            return len(self._timed)
+        return sum(self._counts["lifetime"].values())
+
+    def counts(self, window="recent"):
+        """Zähler des Fensters als Dict-Kopie {typ: anzahl}."""
+        if window == "hour":
+            self._expire(self.clock())
+        return dict(self._counts[window])
+
+    def recent(self, n=30):
+        """Die letzten n Erfahrungen, älteste zuerst."""
+        return list(islice(reversed(self._ring), n))[::-1]
+
+    # ---------- Persistenz ----------
+    def sync(self):
+        self.journal.sync()
+
+    def close(self):
+        self.journal.close()
@@ -0,0 +1,217 @@
+# goal_scheduler.py – Ziele der DecisionEngine: Prioritäts-Heap, stabile IDs, Alterung
+import os
+import json
+import time
+import heapq
+import datetime
+
+
+class GoalScheduler:
+    """
+    Ziele mit Priorität in einem Max-Heap mit verzögertem Löschen.
+
+    peek() und progress() kosten O(log n) (amortisiert): eine Prioritätsänderung legt
+    nur einen neuen Heap-Eintrag an, veraltete Einträge (entferntes Ziel oder alte
+    Priorität) werden übersprungen, sobald sie oben liegen. Wächst der Heap auf mehr
+    als doppelt so viele Einträge wie Ziele, wird er neu aufgebaut.
+
+    IDs: fortlaufender Zähler (next_id), der mit gespeichert wird – zwei Ziele in
+    derselben Sekunde bekommen trotzdem verschiedene IDs.
+
+    Alterung: age() lässt alle Prioritäten mit der Halbwertszeit `half_life` (Sekunden)
+    abklingen. Wie beim AssociationStore geschieht das über einen gemeinsamen
+    Skalierungsfaktor, kostet also O(1) und ändert die Reihenfolge nicht. Ziele unter
+    `min_priority` gelten als erledigt bzw. eingeschlafen; liegt das stärkste Ziel
+    darunter, sind es alle, und der Scheduler leert sich. Mehr als `capacity` Ziele:
+    das schwächste (bei Gleichstand das älteste) fliegt raus – das kann auch das eben
+    angelegte sein, dann gibt add() None zurück. Dafür führt ein zweiter Heap (Min-Heap,
+    ebenfalls mit verzögertem Löschen) das schwächste Ziel, Verdrängen kostet O(log n).
+
+    Persistenz: kompakte Textdatei getrennt von aurelia_state.json; erste Zeile
+    "#!meta<TAB>{json}" mit next_id und Alterungszeitpunkt, danach je Ziel
+    "id<TAB>priorität<TAB>erstellt<TAB>titel".
+
+    clock: Zeitquelle in Epoch-Sekunden für Alterung und Erstellzeit (Standard time.time).
+    """
+    FILENAME = "aurelia_goals.tsv"
+    META_TAG = "#!meta"
+
+    def __init__(self, capacity=50, half_life=86400.0, min_priority=0.1, clock=time.time):
+        self.capacity = capacity
+        self.half_life = half_life
+        self.min_priority = min_priority
+        self.clock = clock
+        self.dirty = False
+        self.next_id = 1
+        self._goals = {}        # id -> {"id", "title", "raw", "created"}
+        self._heap = []         # (-raw, id), evtl. veraltet
+        self._min_heap = []     # (raw, id), evtl. veraltet
+        self._scale = 1.0
+        self._aged_at = clock()
+
+    def __len__(self):
+        return len(self._goals)
+
+    def __contains__(self, goal_id):
+        return goal_id in self._goals
+
+    def _view(self, goal):
+        return {"id": goal["id"], "title": goal["title"],
+                "priority": goal["raw"] * self._scale, "created": goal["created"]}
+
+    # ---------- Schreiben ----------
+    def add(self, title, priority, created=None):
+        """
+        Legt ein Ziel an und gibt es als Dict ({"id", "title", "priority", "created"}) zurück.
+        None, wenn die Liste voll ist und das neue Ziel selbst das schwächste war.
+        """
+        goal_id = self.next_id
+        self.next_id += 1
+        goal = {"id": goal_id, "title": " ".join(str(title).split()), "raw": priority / self._scale,
+                "created": str(created or datetime.datetime.fromtimestamp(self.clock()))}
+        self._goals[goal_id] = goal
+        self._push(goal)
+        self.dirty = True
+        while len(self._goals) > self.capacity:
+            self._evict_weakest()
+        self._maybe_rebuild()
+        return self._view(goal) if goal_id in self._goals else None
+
+    def progress(self, goal_id, amount):
+        """Senkt die Priorität um amount; fällt sie unter min_priority, ist das Ziel erledigt (→ None)."""
+        goal = self._goals.get(goal_id)
+        if goal is None:
+            return None
+        priority = goal["raw"] * self._scale - amount
+        self.dirty = True
+        if priority < self.min_priority:
+            self.remove(goal_id)
+            return None
+        goal["raw"] = priority / self._scale
+        self._push(goal)
+        self._maybe_rebuild()
+        return priority
+
+    def remove(self, goal_id):
+        if self._goals.pop(goal_id, None) is not None:
+            self.dirty = True
+            self._maybe_rebuild()
+
+    def age(self, now=None):
+        """Lässt alle Prioritäten seit dem letzten Aufruf abklingen (O(1))."""
+        now = self.clock() if now is None else now
+        elapsed = now - self._aged_at
+        if elapsed <= 0 or not self.half_life:
+            return
+        self._aged_at = now
+        if not self._goals:
+            return
+        # kein dirty: die Datei speichert Prioritäten samt aged_at, nach dem Laden holt age() den Rest nach
+        self._scale *= 0.5 ** (elapsed / self.half_life)
+        if self._scale < 1e-100:
+            self._renormalize()
+
+    def update(self, goals):
+        """Übernimmt eine alte Zielliste aus aurelia_state.json (neue IDs, Reihenfolge nach Priorität bleibt)."""
+        for g in goals:
+            try:
+                self.add(g["title"], float(g.get("priority", 0.5)), g.get("created"))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    def _renormalize(self):
+        for goal in self._goals.values():
+            goal["raw"] *= self._scale
+        self._scale = 1.0
+        self._rebuild()
+
+    def _push(self, goal):
+        heapq.heappush(self._heap, (-goal["raw"], goal["id"]))
+        heapq.heappush(self._min_heap, (goal["raw"], goal["id"]))
+
+    def _maybe_rebuild(self):
+        if max(len(self._heap), len(self._min_heap)) > 2 * len(self._goals) + 16:
+            self._rebuild()
+
+    def _rebuild(self):
+        self._heap = [(-g["raw"], goal_id) for goal_id, g in self._goals.items()]
+        heapq.heapify(self._heap)
+        self._min_heap = [(g["raw"], goal_id) for goal_id, g in self._goals.items()]
+        heapq.heapify(self._min_heap)
+
+    def _evict_weakest(self):
+        """Entfernt das schwächste Ziel (bei Gleichstand das älteste) in O(log n) amortisiert."""
+        heap = self._min_heap
+        while heap:
+            raw, goal_id = heapq.heappop(heap)
+            goal = self._goals.get(goal_id)
+            if goal is not None and goal["raw"] == raw:
+                del self._goals[goal_id]
+                return
+
+    # ---------- Lesen ----------
+    def peek(self):
+        """Das Ziel mit der höchsten Priorität als Dict oder None."""
+        heap = self._heap
+        while heap:
+            neg_raw, goal_id = heap[0]
+            goal = self._goals.get(goal_id)
+            if goal is not None and goal["raw"] == -neg_raw:
+                break
+            heapq.heappop(heap)  # entfernt oder inzwischen mit anderer Priorität eingetragen
+        else:
+            return None
+        if goal["raw"] * self._scale < self.min_priority:
+            # das stärkste Ziel ist eingeschlafen, also alle
+            self._goals.clear()
+            self._heap, self._min_heap = [], []
+            self.dirty = True
+            return None
+        return self._view(goal)
+
+    def goals(self):
+        """Alle Ziele, stärkstes zuerst (O(n log n), für Export/Anzeige)."""
+        return [self._view(g) for g in sorted(self._goals.values(), key=lambda g: (-g["raw"], g["id"]))]
+
+    # ---------- Persistenz ----------
+    def save(self, base_path):
+        path = os.path.join(base_path, self.FILENAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(f"{self.META_TAG}\t{json.dumps({'next_id': self.next_id, 'aged_at': self._aged_at})}\n")
+            for goal in self._goals.values():
+                f.write(f"{goal['id']}\t{goal['raw'] * self._scale:.6g}\t{goal['created']}\t{goal['title']}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self.dirty = False
+
+    def load(self, base_path):
+        """Lädt die Datei, falls vorhanden. Gibt False zurück, wenn es keine gibt."""
+        path = os.path.join(base_path, self.FILENAME)
+        if not os.path.exists(path):
+            return False
+        self._goals, self._scale = {}, 1.0
+        with open(path, "r", encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                parts = line.rstrip("\n").split("\t", 3)
+                if i == 0 and parts[0] == self.META_TAG:
+                    try:
+                        meta = json.loads(parts[1])
+                        self.next_id = int(meta.get("next_id", 1))
+                        self._aged_at = float(meta.get("aged_at", self._aged_at))
+                    except (IndexError, TypeError, ValueError):
+                        pass
+                    continue
+                if len(parts) != 4:
+                    continue
+                try:
+                    goal_id, raw = int(parts[0]), float(parts[1])
+                except ValueError:
+                    continue
+                self._goals[goal_id] = {"id": goal_id, "title": parts[3], "raw": raw, "created": parts[2]}
+        if self._goals:
+            self.next_id = max(self.next_id, max(self._goals) + 1)
+        self._rebuild()
+        self.dirty = False
+        return True
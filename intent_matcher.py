@@ -0,0 +1,91 @@
+# intent_matcher.py – Intent-Erkennung in einem Durchlauf (Aho-Corasick)
+from collections import deque
+
+# Reihenfolge = Priorität: das erste Intent, von dem ein Schlüsselwort im Text vorkommt, gewinnt
+DEFAULT_INTENTS = {
+    "greeting": ["hallo", "hi", "hey"],
+    "howareyou": ["wie geht", "alles gut", "na?"],
+    "action_request": ["mach", "starte", "führe", "öffne", "erstelle"],
+    "opinion": ["was denkst", "meinung", "was meinst", "wie findest"],
+    "memory_request": ["erinnere", "erinnerst", "erinnerung", "weißt du noch", "hast du"],
+    "question": ["?"],
+}
+
+
+class IntentMatcher:
+    """
+    Erkennt Intents anhand von Schlüsselwörtern (Teilstring-Treffer, wie bisher).
+
+    Aus der Tabelle {intent: [schlüsselwörter]} wird einmalig ein Aho-Corasick-Automat
+    gebaut. match() läuft dann genau einmal über den Text, egal wie viele Intents und
+    Schlüsselwörter es gibt, und zerlegt ihn dabei gleich in Wörter.
+    """
+
+    def __init__(self, intents=None, default="statement"):
+        table = intents or DEFAULT_INTENTS
+        self.default = default
+        self.intents = list(table.keys())
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]  # kleinste Priorität, die in diesem Zustand endet
+        for prio, intent in enumerate(self.intents):
+            for keyword in table[intent]:
+                self._insert(str(keyword).lower(), prio)
+        self._build_fail_links()
+
+    def _insert(self, keyword, prio):
+        if not keyword:
+            return
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+            node = nxt
+        if self._best[node] is None or prio < self._best[node]:
+            self._best[node] = prio
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(ch, 0)
+                # Treffer über Fail-Links (Suffix-Schlüsselwörter) gleich mitnehmen
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+
+    def match(self, text):
+        """Gibt (intent, wörter) zurück; wörter = kleingeschriebene, per Leerraum getrennte Tokens."""
+        low = text.lower()
+        goto, fail, best_at = self._goto, self._fail, self._best
+        state = 0
+        best = None
+        words = []
+        start = -1
+        for i, ch in enumerate(low):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hit = best_at[state]
+            if hit is not None and (best is None or hit < best):
+                best = hit
+            if ch.isspace():
+                if start >= 0:
+                    words.append(low[start:i])
+                    start = -1
+            elif start < 0:
+                start = i
+        if start >= 0:
+            words.append(low[start:])
+        intent = self.intents[best] if best is not None else self.default
+        return intent, words
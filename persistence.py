@@ -0,0 +1,234 @@
+# persistence.py – Hilfen zum gebündelten Speichern von Zustandsdateien
+import os
+import json
+import time
+import struct
+import hashlib
+
+from aurelia_logging import get_logger
+from serializers import get_serializer
+
+_log = get_logger("persistence")
+
+
+class DebouncedWriter:
+    """
+    Bündelt viele Zustandsänderungen zu einem einzigen Schreibvorgang.
+
+    Änderungen werden nur mit mark_dirty() markiert. maybe_flush() schreibt, sobald
+    seit der letzten Änderung `flush_interval` Sekunden Ruhe war oder der älteste
+    ungespeicherte Stand `max_latency` Sekunden alt ist. flush() schreibt sofort
+    (z.B. beim Beenden der App).
+
+    Löst write_fn eine Exception aus, wird sie protokolliert und der Stand bleibt
+    markiert: der nächste fällige maybe_flush() versucht es erneut, nichts geht verloren.
+    """
+
+    def __init__(self, write_fn, flush_interval=2.0, max_latency=10.0, clock=time.monotonic, name="Zustand"):
+        self.write_fn = write_fn
+        self.name = name
+        self.flush_interval = flush_interval
+        self.max_latency = max_latency
+        self.clock = clock
+        self.dirty = False
+        self._dirty_since = None
+        self._last_mark = None
+        self.writes = 0
+        self.failures = 0
+
+    def mark_dirty(self):
+        now = self.clock()
+        if not self.dirty:
+            self.dirty = True
+            self._dirty_since = now
+        self._last_mark = now
+
+    def is_due(self, now=None):
+        if not self.dirty:
+            return False
+        now = self.clock() if now is None else now
+        return (now - self._last_mark >= self.flush_interval
+                or now - self._dirty_since >= self.max_latency)
+
+    def maybe_flush(self, now=None):
+        """Schreibt, falls fällig. Gibt True zurück, wenn geschrieben wurde."""
+        if self.is_due(now):
+            return self.flush()
+        return False
+
+    def flush(self):
+        """Schreibt sofort, falls markiert. True = geschrieben, False = nichts zu tun oder fehlgeschlagen."""
+        if not self.dirty:
+            return False
+        # erst zurücksetzen: Änderungen während write_fn() markieren neu
+        self.dirty = False
+        self._dirty_since = None
+        try:
+            self.write_fn()
+        except Exception as e:
+            self.mark_dirty()
+            self.failures += 1
+            _log.error(f"Speichern fehlgeschlagen ({self.name}) – bleibt markiert", exc_info=e)
+            return False
+        self.writes += 1
+        return True
+
+
+def atomic_write_json(path, data, indent=None):
+    """Schreibt JSON über eine temporäre Datei + fsync + rename (nie halb geschrieben)."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# -------------------------------
+# Snapshots mit Prüfsumme
+# -------------------------------
+SNAPSHOT_MAGIC = "aurelia-snapshot"
+BACKUP_SUFFIX = ".bak"
+CORRUPT_SUFFIX = ".corrupt"
+# nicht lesbar: Prüfsumme/Länge falsch, Kodierung hier nicht verfügbar (z.B. msgpack fehlt)
+# oder der Inhalt passt nicht zum Decoder
+DECODE_ERRORS = (ValueError, ImportError, LookupError, TypeError, struct.error)
+
+
+def write_snapshot(path, data, encoding="json"):
+    """
+    Schreibt einen Zustand als Snapshot mit Prüfsumme, atomar (temp + fsync + rename).
+
+    Zeile 1 ist ein Kopf {"format", "version", "encoding", "sha256", "length"}, danach
+    folgt der Inhalt in der Kodierung `encoding` (siehe serializers.py). Der bisherige
+    Snapshot bleibt als path.bak erhalten, damit read_snapshot() auf den letzten guten
+    Stand zurückfallen kann.
+    """
+    payload = get_serializer(encoding).dumps(data)
+    header = {"format": SNAPSHOT_MAGIC, "version": 1, "encoding": encoding,
+              "sha256": hashlib.sha256(payload).hexdigest(), "length": len(payload)}
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    if os.path.exists(path):
+        os.replace(path, path + BACKUP_SUFFIX)
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(path))
+
+
+def _fsync_dir(dir_path):
+    """Macht die Umbenennungen dauerhaft (auf Windows nicht möglich, dort ohne Wirkung)."""
+    try:
+        fd = os.open(dir_path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def decode_snapshot(raw):
+    """
+    Prüft und dekodiert den Inhalt einer Snapshot-Datei (bytes).
+
+    Die Kodierung steht im Kopf; Dateien ohne Kopf (altes Format, reines JSON) werden
+    unverändert gelesen. Eine falsche Länge oder Prüfsumme löst ValueError aus.
+    """
+    head, sep, payload = raw.partition(b"\n")
+    header = None
+    if sep:
+        try:
+            header = json.loads(head.decode("utf-8"))
+        except ValueError:
+            header = None
+    if not (isinstance(header, dict) and header.get("format") == SNAPSHOT_MAGIC):
+        return json.loads(raw.decode("utf-8-sig"))
+    if len(payload) != header.get("length") or hashlib.sha256(payload).hexdigest() != header.get("sha256"):
+        raise ValueError("Prüfsumme des Snapshots stimmt nicht")
+    return get_serializer(header.get("encoding", "json")).loads(payload)
+
+
+def snapshot_encoding(path):
+    """Kodierung einer Snapshot-Datei laut Kopf ("plain" für reines JSON ohne Kopf)."""
+    with open(path, "rb") as f:
+        head = f.readline()
+    try:
+        header = json.loads(head.decode("utf-8"))
+    except ValueError:
+        return "plain"
+    if isinstance(header, dict) and header.get("format") == SNAPSHOT_MAGIC:
+        return header.get("encoding", "json")
+    return "plain"
+
+
+def read_snapshot(path, set_aside=True):
+    """
+    Liest den neuesten gültigen Snapshot: erst path, dann path.bak.
+
+    Gibt (daten, quelle) zurück; quelle ist "snapshot", "backup" oder None, wenn es
+    keinen gültigen Stand gibt. Eine Datei, die sich nicht dekodieren lässt (defekt oder
+    in einer hier nicht verfügbaren Kodierung), wird nicht gelöscht, sondern als
+    path.corrupt beiseitegelegt – so übernimmt der nächste Snapshot sie weder als Backup
+    noch überschreibt er sie. set_aside=False liest nur (z.B. convert_state.py).
+    Lesefehler des Dateisystems (außer "nicht vorhanden") gehen an den Aufrufer.
+    """
+    for candidate, source in ((path, "snapshot"), (path + BACKUP_SUFFIX, "backup")):
+        try:
+            with open(candidate, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            continue
+        try:
+            return decode_snapshot(raw), source
+        except DECODE_ERRORS as e:
+            if set_aside:
+                target = _set_aside(candidate)
+                _log.error(f"Snapshot {os.path.basename(candidate)} nicht lesbar – "
+                           f"beiseitegelegt als {os.path.basename(target)}", exc_info=e)
+    return None, None
+
+
+def _set_aside(path):
+    """Benennt path nach path.corrupt um (bzw. .corrupt.1, .corrupt.2 …, nie über eine ältere)."""
+    target, n = path + CORRUPT_SUFFIX, 0
+    while os.path.exists(target):
+        n += 1
+        target = f"{path}{CORRUPT_SUFFIX}.{n}"
+    os.replace(path, target)
+    return target
+
+
+class UnitOfWork:
+    """
+    Fasst die Schreibvorgänge einer logischen Aktion (z.B. einer Nutzernachricht)
+    über mehrere Speicher zusammen.
+
+        with UnitOfWork(archive_manager, context_manager):
+            ...  # save_thought()/push_message() wie gewohnt
+
+    Teilnehmer bieten begin_batch() und commit_batch() an. Dazwischen sammeln sie ihre
+    Schreibvorgänge und schreiben beim Commit alles in einem Zug. Jeder Aufruf ist ein
+    eigener Eintrag – auch zwei gleichlautende Nachrichten werden beide geschrieben;
+    dass ein Ereignis nur einmal erfasst wird, ist Sache des Aufrufers. Verschachtelte
+    Einheiten gehen in der äußeren auf. Auch bei einer Exception wird committet: was
+    bis dahin passiert ist, bleibt erhalten.
+    """
+
+    def __init__(self, *participants):
+        self.participants = [p for p in participants if p is not None]
+
+    def __enter__(self):
+        for p in self.participants:
+            p.begin_batch()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for p in self.participants:
+            p.commit_batch()
+        return False
@@ -0,0 +1,101 @@
+# recall_index.py – Invertierter Index mit TF-IDF für "Woran erinnerst du dich über X?"
+import math
+import heapq
+from array import array
+
+from tokenizer import tokenize
+
+# Füllwörter und die Wörter der Erinnerungsfrage selbst tragen nichts zur Suche bei
+STOPWORDS = frozenset("""
+    aber alle allem alles als also auch auf aus bei bin bis bist das dass dein deine dem den der des
+    dich die dir doch dort durch ein eine einem einen einer eines etwas euch für hab habe haben hast
+    hat hatte hier ich ihr ihre ihn ihm immer ist jetzt kann kannst kein keine mal man mein meine mich
+    mir mit nach nicht noch nun nur oder ohne sehr sein seine sich sie sind so über und uns unser
+    vom von vor war waren was weißt welche wenn wer wie wir wird wirst wo woran worüber zu zum zur
+    erinnere erinnerst erinnert erinnerung erinnerungen weisst sag sage erzähl erzähle
+""".split())
+
+
+class RecallIndex:
+    """
+    Invertierter Index über Nachrichten und Gedanken mit TF-IDF-Ranking.
+
+    add() ist inkrementell: jedes Wort bekommt eine Posting-Liste (Dokument-IDs und
+    vorberechnetes Gewicht (1 + log tf) / sqrt(länge) in array-Puffern). search()
+    summiert idf * gewicht nur über die Posting-Listen der Suchwörter und gibt die
+    besten k Treffer zurück – die Kosten hängen von den Suchwörtern ab, nicht von der
+    Gesamtzahl der Nachrichten. Bei sehr häufigen Wörtern werden nur die neuesten
+    `scan_limit` Postings gewertet; seltene (und damit aussagekräftige) Wörter immer ganz.
+
+    Nicht thread-sicher: gehört wie ContextManager und ArchiveManager dem EngineWorker.
+    """
+
+    def __init__(self, scan_limit=2000):
+        self.scan_limit = scan_limit
+        self._postings = {}  # wort -> (array("I") ids, array("f") gewichte)
+        self._texts = []
+        self._who = []
+        self._times = []
+
+    def __len__(self):
+        return len(self._texts)
+
+    @property
+    def vocabulary_size(self):
+        return len(self._postings)
+
+    def add(self, text, who=None, time=None):
+        """Nimmt einen Text auf und gibt seine Dokument-ID zurück (None, wenn er keine Wörter hat)."""
+        words = [w for w in tokenize(str(text)) if w not in STOPWORDS]
+        if not words:
+            return None
+        doc_id = len(self._texts)
+        self._texts.append(text)
+        self._who.append(who)
+        self._times.append(time)
+        counts = {}
+        for w in words:
+            counts[w] = counts.get(w, 0) + 1
+        norm = 1.0 / math.sqrt(len(words))
+        postings = self._postings
+        for w, tf in counts.items():
+            entry = postings.get(w)
+            if entry is None:
+                entry = postings[w] = (array("I"), array("f"))
+            entry[0].append(doc_id)
+            entry[1].append((1.0 + math.log(tf)) * norm)
+        return doc_id
+
+    def query_terms(self, query):
+        """Die indexierten Suchwörter einer Anfrage, seltenste zuerst."""
+        terms = {w for w in tokenize(str(query)) if w not in STOPWORDS and w in self._postings}
+        return sorted(terms, key=lambda w: len(self._postings[w][0]))
+
+    def search(self, query, k=5):
+        """Die k besten Treffer als [{"who", "text", "time", "score"}, ...], bester zuerst."""
+        terms = self.query_terms(query)
+        if not terms or k <= 0:
+            return []
+        n_docs = len(self._texts)
+        scores = {}
+        get = scores.get
+        for w in terms:
+            ids, weights = self._postings[w]
+            df = len(ids)
+            idf = math.log((n_docs + 1) / df)
+            start = max(0, df - self.scan_limit)
+            for doc_id, weight in zip(ids[start:], weights[start:]):
+                scores[doc_id] = get(doc_id, 0.0) + idf * weight
+        # bei gleichem Score gewinnt die neuere Nachricht; gleiche Texte nur einmal
+        ranked = heapq.nlargest(k * 3, scores.items(), key=lambda item: (item[1], item[0]))
+        results, seen = [], set()
+        for doc_id, score in ranked:
+            text = self._texts[doc_id]
+            if text in seen:
+                continue
+            seen.add(text)
+            results.append({"who": self._who[doc_id], "text": text,
+                            "time": self._times[doc_id], "score": round(score, 4)})
+            if len(results) >= k:
+                break
+        return results
@@ -1,58 +1,163 @@
 import os
-import psutil
-import datetime
-import traceback
+import time
+import threading
+from collections import deque
+
+from aurelia_logging import get_logger
+
+_log = get_logger("resource")
+
 
 class ResourceManager:
-    def __init__(self, cpu_limit=50, ram_limit=100_000_000):
+    """
+    Misst CPU, RSS und I/O in einem Hintergrund-Thread und leitet daraus eine Drosselung ab.
+
+    start() importiert psutil und startet den Sampler (alle sample_interval Sekunden, rollierendes Fenster der
+    letzten `window` Messungen). latest(), averages(), check_resources() und backoff lesen
+    nur die bereits gemessenen Werte und blockieren nie.
+
+    backoff ist ein Faktor >= 1: Liegt der Fensterdurchschnitt über cpu_limit oder der
+    Speicher über seinem Limit, verdoppelt er sich (bis max_backoff); sinkt die Last unter
+    recover_ratio der Limits, geht er schrittweise auf 1 zurück.
+
+    Speicher zählt als Zuwachs gegenüber der ersten Messung (baseline_rss): was Python,
+    Kivy und die geladenen Daten beim Start belegen, ist kein Druck, ein wachsender
+    Prozess schon. ram_limit begrenzt zusätzlich die absolute RSS, ist aber standardmäßig aus.
+    """
+
+    def __init__(self, cpu_limit=50, ram_limit=None, ram_growth_limit=256 * 1024 ** 2,
+                 sample_interval=2.0, window=15, max_backoff=8.0, recover_ratio=0.8):
         """
         cpu_limit: maximale CPU-Auslastung in %
-        ram_limit: maximaler RAM-Verbrauch in Bytes
+        ram_limit: maximaler RAM-Verbrauch in Bytes (None = keine absolute Grenze)
+        ram_growth_limit: maximaler RAM-Zuwachs seit der ersten Messung in Bytes (None = aus)
         """
         self.cpu_limit = cpu_limit
         self.ram_limit = ram_limit
+        self.ram_growth_limit = ram_growth_limit
+        self.baseline_rss = None
+        self.sample_interval = sample_interval
+        self.max_backoff = max_backoff
+        self.recover_ratio = recover_ratio
+        self.backoff = 1.0
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._psutil = None
+        self._process = None
+        self._last_io = None
 
-    def check_resources(self):
-        """
-        Prüft die Systemressourcen und gibt True zurück,
-        wenn alles im erlaubten Bereich liegt.
-        """
+    # ---------- Sampler ----------
+    def start(self):
+        if self._thread is not None:
+            return
         try:
-            cpu_usage = psutil.cpu_percent(interval=0.5)
-            ram_usage = psutil.Process(os.getpid()).memory_info().rss
+            import psutil  # erst hier importiert: bleibt aus dem Kaltstart heraus
+        except ImportError:  # z.B. Android-Build ohne psutil-Rezept: keine Messwerte, keine Drosselung
+            return
+        self._psutil = psutil
+        self._process = psutil.Process(os.getpid())
+        # erster Aufruf liefert 0.0 und setzt nur den Bezugspunkt für die nächste Messung
+        psutil.cpu_percent(interval=None)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="AureliaResources", daemon=True)
+        self._thread.start()
 
-            if cpu_usage > self.cpu_limit:
-                self._log_warning(f"CPU-Auslastung zu hoch: {cpu_usage:.2f}%")
-                return False
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
 
-            if ram_usage > self.ram_limit:
-                self._log_warning(f"RAM-Verbrauch zu hoch: {ram_usage / (1024**2):.2f} MB")
-                return False
+    def _run(self):
+        while not self._stop.wait(self.sample_interval):
+            try:
+                self.sample()
+            except Exception as e:
+                self._log_error("Fehler beim Messen der Ressourcen", e)
 
-            return True
+    def sample(self):
+        """Eine Messung aufnehmen (ohne Wartezeit) und backoff nachführen."""
+        if self._process is None:
+            return None
+        sample = {
+            "time": time.time(),
+            "cpu": self._psutil.cpu_percent(interval=None),
+            "rss": self._process.memory_info().rss,
+            "read_bytes": 0,
+            "write_bytes": 0,
+        }
+        try:
+            io = self._process.io_counters()
+            if self._last_io is not None:
+                sample["read_bytes"] = io.read_bytes - self._last_io.read_bytes
+                sample["write_bytes"] = io.write_bytes - self._last_io.write_bytes
+            self._last_io = io
+        except (AttributeError, self._psutil.Error):
+            pass  # io_counters fehlt auf manchen Plattformen (z.B. macOS)
+        with self._lock:
+            if self.baseline_rss is None:
+                self.baseline_rss = sample["rss"]
+            self.samples.append(sample)
+        self._adapt()
+        return sample
+
+    def _adapt(self):
+        avg = self.averages()
+        load = max(avg["cpu"] / float(self.cpu_limit), self._ram_load(avg["rss"]))
+        if load > 1.0:
+            if self.backoff < self.max_backoff:
+                self.backoff = min(self.max_backoff, self.backoff * 2.0)
+                self._log_warning(
+                    f"Ressourcendruck (CPU {avg['cpu']:.1f}%, RAM {avg['rss'] / (1024**2):.1f} MB) "
+                    f"→ Drosselung x{self.backoff:g}"
+                )
+        elif load < self.recover_ratio and self.backoff > 1.0:
+            self.backoff = max(1.0, self.backoff / 1.5)
+
+    def _ram_load(self, rss):
+        """Speicherdruck relativ zum Limit (1.0 = am Limit), aus absoluter RSS und Zuwachs."""
+        load = 0.0
+        if self.ram_limit:
+            load = rss / float(self.ram_limit)
+        if self.ram_growth_limit and self.baseline_rss is not None:
+            load = max(load, (rss - self.baseline_rss) / float(self.ram_growth_limit))
+        return load
 
+    # ---------- Lesen (nicht blockierend) ----------
+    def latest(self):
+        with self._lock:
+            return dict(self.samples[-1]) if self.samples else None
+
+    def averages(self):
+        with self._lock:
+            samples = list(self.samples)
+        if not samples:
+            return {"cpu": 0.0, "rss": 0, "read_bytes": 0, "write_bytes": 0}
+        n = float(len(samples))
+        return {
+            "cpu": sum(s["cpu"] for s in samples) / n,
+            "rss": samples[-1]["rss"],
+            "read_bytes": sum(s["read_bytes"] for s in samples),
+            "write_bytes": sum(s["write_bytes"] for s in samples),
+        }
+
+    def check_resources(self):
+        """
+        Prüft die Systemressourcen anhand der letzten Messungen und gibt True zurück,
+        wenn alles im erlaubten Bereich liegt.
+        """
+        try:
+            avg = self.averages()
+            return avg["cpu"] <= self.cpu_limit and self._ram_load(avg["rss"]) <= 1.0
         except Exception as e:
             self._log_error("Fehler bei check_resources()", e)
             # Sicherheitshalber trotzdem True zurückgeben, um keinen Absturz zu verursachen
             return True
 
     def _log_warning(self, message):
-        self._log_to_file("WARNING", message)
+        _log.warning(message)
 
     def _log_error(self, message, exception=None):
-        self._log_to_file("ERROR", message, exception)
-
-    def _log_to_file(self, level, message, exception=None):
-        try:
-            log_path = os.path.join(
-                os.getenv('EXTERNAL_STORAGE', '/sdcard'),
-                'aurelia_resource_log.txt'
-            )
-            with open(log_path, 'a', encoding='utf-8') as f:
-                f.write(f"[{datetime.datetime.now()}] {level}: {message}\n")
-                if exception:
-                    f.write(f"{exception}\n")
-                    f.write(traceback.format_exc() + "\n")
-                f.write("=" * 40 + "\n")
-        except Exception as log_err:
-            print(f"[AURELIA] Konnte Log nicht schreiben: {log_err}")
+        _log.error(message, exc_info=exception)
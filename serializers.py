@@ -0,0 +1,238 @@
+# serializers.py – Austauschbare Kodierungen für Zustands-Snapshots (JSON, msgpack, kompakt binär)
+import re
+import json
+import struct
+import datetime
+
+
+class JsonSerializer:
+    """Kompaktes JSON ohne Einrückung (UTF-8)."""
+    name = "json"
+
+    def dumps(self, obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, raw):
+        return json.loads(bytes(raw).decode("utf-8"))
+
+
+class MsgpackSerializer:
+    """msgpack (optionale Abhängigkeit, erst bei Benutzung importiert)."""
+    name = "msgpack"
+
+    def __init__(self):
+        import msgpack  # ImportError, wenn nicht installiert
+        self._msgpack = msgpack
+
+    def dumps(self, obj):
+        return self._msgpack.packb(obj, use_bin_type=True)
+
+    def loads(self, raw):
+        return self._msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+# -------------------------------
+# Kompaktes Binärformat
+# -------------------------------
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT, _TS_US, _TS_S = range(10)
+_FLOAT_STRUCT = struct.Struct("<d")
+_EPOCH = datetime.datetime(1970, 1, 1)
+_TS_RE = re.compile(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(\.\d{6})?\Z")
+
+
+def _write_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(n):
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def _unzigzag(n):
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+
+class CompactSerializer:
+    """
+    Getaggtes Binärformat nur mit der Standardbibliothek.
+
+    Alle Strings (Schlüssel wie Werte) stehen einmal in einer Tabelle am Anfang und
+    werden im Baum nur per Index referenziert – wiederholte Schlüssel wie "who",
+    "text", "time" kosten so ein bis zwei Byte. Zahlen sind Varints (ZigZag),
+    Zeitstempel der Form "YYYY-MM-DD HH:MM:SS[.ffffff]" werden als Mikrosekunden
+    seit 1970 gespeichert und beim Lesen exakt wieder als derselbe String erzeugt.
+    """
+    name = "compact"
+    MAGIC = b"ACB1"
+
+    def dumps(self, obj):
+        strings, index = [], {}
+        body = bytearray()
+
+        def ref(s):
+            i = index.get(s)
+            if i is None:
+                i = index[s] = len(strings)
+                strings.append(s)
+            _write_varint(body, i)
+
+        def enc(v):
+            if v is None:
+                body.append(_NONE)
+            elif v is True:
+                body.append(_TRUE)
+            elif v is False:
+                body.append(_FALSE)
+            elif isinstance(v, int):
+                body.append(_INT)
+                _write_varint(body, _zigzag(v))
+            elif isinstance(v, float):
+                body.append(_FLOAT)
+                body.extend(_FLOAT_STRUCT.pack(v))
+            elif isinstance(v, str):
+                us = _timestamp_micros(v)
+                if us is None:
+                    body.append(_STR)
+                    ref(v)
+                else:
+                    body.append(_TS_US if len(v) > 19 else _TS_S)
+                    _write_varint(body, _zigzag(us))
+            elif isinstance(v, dict):
+                body.append(_DICT)
+                _write_varint(body, len(v))
+                for k, item in v.items():
+                    ref(k if isinstance(k, str) else str(k))
+                    enc(item)
+            elif isinstance(v, (list, tuple)):
+                body.append(_LIST)
+                _write_varint(body, len(v))
+                for item in v:
+                    enc(item)
+            else:
+                raise TypeError(f"Nicht serialisierbar: {type(v).__name__}")
+
+        enc(obj)
+        out = bytearray(self.MAGIC)
+        _write_varint(out, len(strings))
+        for s in strings:
+            b = s.encode("utf-8")
+            _write_varint(out, len(b))
+            out += b
+        out += body
+        return bytes(out)
+
+    def loads(self, raw):
+        data = memoryview(raw).tobytes() if not isinstance(raw, bytes) else raw
+        if data[:4] != self.MAGIC:
+            raise ValueError("Kein kompakter Snapshot")
+        count, pos = _read_varint(data, 4)
+        strings = []
+        for _ in range(count):
+            n, pos = _read_varint(data, pos)
+            strings.append(data[pos:pos + n].decode("utf-8"))
+            pos += n
+
+        def dec(pos):
+            tag = data[pos]
+            pos += 1
+            if tag == _STR:
+                i, pos = _read_varint(data, pos)
+                return strings[i], pos
+            if tag == _INT:
+                n, pos = _read_varint(data, pos)
+                return _unzigzag(n), pos
+            if tag == _DICT:
+                n, pos = _read_varint(data, pos)
+                d = {}
+                for _ in range(n):
+                    i, pos = _read_varint(data, pos)
+                    d[strings[i]], pos = dec(pos)
+                return d, pos
+            if tag == _LIST:
+                n, pos = _read_varint(data, pos)
+                items = []
+                for _ in range(n):
+                    item, pos = dec(pos)
+                    items.append(item)
+                return items, pos
+            if tag == _TS_US or tag == _TS_S:
+                n, pos = _read_varint(data, pos)
+                dt = _EPOCH + datetime.timedelta(microseconds=_unzigzag(n))
+                return dt.isoformat(" ", "microseconds" if tag == _TS_US else "seconds"), pos
+            if tag == _FLOAT:
+                return _FLOAT_STRUCT.unpack_from(data, pos)[0], pos + 8
+            if tag == _NONE:
+                return None, pos
+            if tag == _TRUE:
+                return True, pos
+            if tag == _FALSE:
+                return False, pos
+            raise ValueError(f"Unbekanntes Tag {tag} an Position {pos - 1}")
+
+        obj, pos = dec(pos)
+        if pos != len(data):
+            raise ValueError("Überzählige Bytes am Ende des Snapshots")
+        return obj
+
+
+def _timestamp_micros(s):
+    """Mikrosekunden seit 1970 für einen exakt rekonstruierbaren Zeitstempel, sonst None."""
+    if len(s) not in (19, 26) or not _TS_RE.match(s):
+        return None
+    try:
+        dt = datetime.datetime.fromisoformat(s)
+    except ValueError:
+        return None
+    return (dt - _EPOCH) // datetime.timedelta(microseconds=1)
+
+
+# -------------------------------
+# Registry
+# -------------------------------
+SERIALIZERS = {
+    JsonSerializer.name: JsonSerializer,
+    MsgpackSerializer.name: MsgpackSerializer,
+    CompactSerializer.name: CompactSerializer,
+}
+_instances = {}
+
+
+def get_serializer(name="json"):
+    """
+    Serializer zum Namen ("json", "msgpack", "compact").
+    Unbekannte Namen lösen ValueError aus, ein fehlendes msgpack ImportError.
+    """
+    name = name or "json"
+    serializer = _instances.get(name)
+    if serializer is None:
+        cls = SERIALIZERS.get(name)
+        if cls is None:
+            raise ValueError(f"Unbekanntes Snapshot-Format: {name}")
+        serializer = _instances[name] = cls()
+    return serializer
+
+
+def available_serializers():
+    """Namen aller Serializer, die in dieser Umgebung benutzbar sind."""
+    names = []
+    for name in SERIALIZERS:
+        try:
+            get_serializer(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
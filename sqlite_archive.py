@@ -0,0 +1,219 @@
+# sqlite_archive.py – Optionales SQLite-Backend für das Gedanken-Archiv
+import os
+import json
+import sqlite3
+import threading
+
+from thought_journal import ThoughtJournal, normalize_timestamp
+
+
+class SqliteThoughtArchive:
+    """
+    Gedanken-Archiv in SQLite (gedanken.db) mit derselben Schnittstelle wie ThoughtJournal.
+
+    WAL-Modus, Index auf dem Zeitstempel und – falls die SQLite-Version FTS5 bietet –
+    eine Volltexttabelle auf dem Text. "Letzte N", Zeitbereiche und Suchbegriffe werden
+    direkt in der Datenbank beantwortet, ohne das ganze Archiv zu laden.
+    Beim ersten Öffnen wird ein vorhandenes gedanken.jsonl / gedanken.json importiert.
+    """
+    FILENAME = "gedanken.db"
+
+    def __init__(self, base_path):
+        self.path = os.path.join(base_path, self.FILENAME)
+        self._lock = threading.RLock()
+        os.makedirs(base_path, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS thoughts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts TEXT NOT NULL,
+                timestamp TEXT,
+                text TEXT NOT NULL,
+                extra TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_thoughts_ts ON thoughts(ts);
+        """)
+        self.has_fts = self._init_fts()
+        self._conn.commit()
+        self._import_journal(base_path)
+
+    def _init_fts(self):
+        try:
+            self._conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS thoughts_fts
+                    USING fts5(text, content='thoughts', content_rowid='id');
+                CREATE TRIGGER IF NOT EXISTS thoughts_ai AFTER INSERT ON thoughts BEGIN
+                    INSERT INTO thoughts_fts(rowid, text) VALUES (new.id, new.text);
+                END;
+            """)
+            return True
+        except sqlite3.OperationalError:
+            # SQLite ohne FTS5 (ältere Android-Builds): Suche fällt auf LIKE zurück
+            return False
+
+    def _import_journal(self, base_path):
+        """Übernimmt bestehende Journal-/JSON-Einträge, solange die Datenbank leer ist."""
+        if self._conn.execute("SELECT 1 FROM thoughts LIMIT 1").fetchone():
+            return
+        journal_path = os.path.join(base_path, ThoughtJournal.FILENAME)
+        legacy_path = os.path.join(base_path, ThoughtJournal.LEGACY_FILENAME)
+        if not (os.path.exists(journal_path) or os.path.exists(legacy_path)):
+            return
+        journal = ThoughtJournal(base_path)
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT INTO thoughts (ts, timestamp, text, extra) VALUES (?, ?, ?, ?)",
+                    (self._row(e) for e in journal.iter_entries())
+                )
+        finally:
+            journal.close()
+
+    # ---------- Konvertierung ----------
+    @staticmethod
+    def _row(entry):
+        timestamp = entry.get("timestamp", "")
+        extra = {k: v for k, v in entry.items() if k not in ("text", "timestamp")}
+        return (normalize_timestamp(timestamp), timestamp, str(entry.get("text", "")),
+                json.dumps(extra, ensure_ascii=False) if extra else None)
+
+    @staticmethod
+    def _entry(row):
+        timestamp, text, extra = row
+        entry = {"text": text, "timestamp": timestamp}
+        if extra:
+            entry.update(json.loads(extra))
+        return entry
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._entry(r) for r in rows]
+
+    # ---------- Schnittstelle wie ThoughtJournal ----------
+    def append(self, entry):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO thoughts (ts, timestamp, text, extra) VALUES (?, ?, ?, ?)",
+                self._row(entry)
+            )
+        return entry
+
+    def append_many(self, entries):
+        """Mehrere Einträge in einer Transaktion."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO thoughts (ts, timestamp, text, extra) VALUES (?, ?, ?, ?)",
+                [self._row(e) for e in entries]
+            )
+        return entries
+
+    def iter_entries(self):
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, timestamp, text, extra FROM thoughts WHERE id > ? ORDER BY id LIMIT 1000",
+                    (last_id,)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._entry(row[1:])
+            last_id = rows[-1][0]
+
+    def read_all(self):
+        return self._query("SELECT timestamp, text, extra FROM thoughts ORDER BY id")
+
+    def last(self, n):
+        return self.page_before(None, n)[0]
+
+    def page_before(self, cursor, n):
+        """
+        Bis zu n Einträge mit id < cursor (None = neueste); gibt (einträge, neuer_cursor) zurück.
+        neuer_cursor ist None, wenn nichts Älteres folgt (wie ThoughtJournal.page_before).
+        """
+        if n <= 0:
+            return [], cursor
+        with self._lock:
+            # eine Zeile mehr: zeigt, ob es noch ältere gibt
+            rows = self._conn.execute(
+                "SELECT id, timestamp, text, extra FROM thoughts WHERE id < ? ORDER BY id DESC LIMIT ?",
+                (cursor if cursor is not None else 2 ** 63 - 1, n + 1)
+            ).fetchall()
+        if not rows:
+            return [], None
+        more = len(rows) > n
+        rows = rows[:n]
+        rows.reverse()
+        return [self._entry(r[1:]) for r in rows], (rows[0][0] if more else None)
+
+    def page_after(self, cursor, n):
+        """Bis zu n Einträge mit id > cursor (None = von vorn); gibt (einträge, letzte_id) zurück."""
+        cursor = cursor or 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, timestamp, text, extra FROM thoughts WHERE id > ? ORDER BY id LIMIT ?",
+                (cursor, n)
+            ).fetchall()
+        if not rows:
+            return [], cursor
+        return [self._entry(r[1:]) for r in rows], rows[-1][0]
+
+    def end_cursor(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM thoughts").fetchone()[0]
+
+    def cursor_mark(self, cursor):
+        """Zeilen-IDs verschieben sich nie, jeder Cursor bleibt gültig (siehe ThoughtJournal)."""
+        return 0
+
+    def between(self, start, end):
+        return self._query(
+            "SELECT timestamp, text, extra FROM thoughts WHERE ts >= ? AND ts < ? ORDER BY ts, id",
+            (normalize_timestamp(start), normalize_timestamp(end))
+        )
+
+    def search(self, term, limit=50):
+        """
+        Die neuesten Einträge (max. limit) zum Suchbegriff, ältester zuerst.
+
+        Anders als ThoughtJournal.search (Teilstring) sucht FTS5 nach Wörtern: der Begriff
+        gilt als Phrase, das letzte Wort als Präfix – "wald" findet "Waldweg", aber "ald"
+        findet nichts. Ohne FTS5 (LIKE) ist es wie im Journal eine Teilstring-Suche, dann
+        allerdings nur für ASCII ohne Rücksicht auf Groß-/Kleinschreibung.
+        """
+        term = term.strip()
+        if not term:
+            return []
+        if self.has_fts:
+            # als Phrase mit Präfix-Suche, damit Sonderzeichen die FTS-Syntax nicht stören
+            phrase = '"' + term.replace('"', '""') + '"*'
+            rows = self._query(
+                "SELECT t.timestamp, t.text, t.extra FROM thoughts_fts f "
+                "JOIN thoughts t ON t.id = f.rowid WHERE thoughts_fts MATCH ? "
+                "ORDER BY t.id DESC LIMIT ?", (phrase, limit)
+            )
+        else:
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            rows = self._query(
+                "SELECT timestamp, text, extra FROM thoughts WHERE text LIKE ? ESCAPE '\\' "
+                "ORDER BY id DESC LIMIT ?", (pattern, limit)
+            )
+        rows.reverse()
+        return rows
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM thoughts").fetchone()[0]
+
+    def sync(self):
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
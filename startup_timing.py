@@ -0,0 +1,64 @@
+# startup_timing.py – Zeitmessung der Startphasen (Imports, UI, Worker-Aufbau)
+import time
+import threading
+from contextlib import contextmanager
+
+from aurelia_logging import get_logger
+
+_log = get_logger("startup")
+
+
+class StartupTimer:
+    """
+    Sammelt Startphasen relativ zum Erzeugungszeitpunkt (thread-sicher).
+
+    phase(name) misst einen Block als Kontextmanager, mark(name) hält nur einen
+    Zeitpunkt fest (z.B. "first_frame"). report() schreibt die Aufschlüsselung einmal
+    ins Log und gibt sie zurück: [{"phase", "thread", "start_ms", "ms"}, ...].
+    """
+
+    def __init__(self, clock=time.perf_counter, t0=None):
+        self.clock = clock
+        self.t0 = clock() if t0 is None else t0
+        self.phases = []
+        self.reported = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record(name, start, self.clock())
+
+    def mark(self, name):
+        now = self.clock()
+        self.record(name, now, now)
+
+    def record(self, name, start, end):
+        with self._lock:
+            self.phases.append({
+                "phase": name,
+                "thread": threading.current_thread().name,
+                "start_ms": round((start - self.t0) * 1000, 1),
+                "ms": round((end - start) * 1000, 1),
+            })
+
+    def format(self):
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p["start_ms"])
+        lines = [f"{'Phase':<16} {'Thread':<18} {'ab (ms)':>9} {'Dauer (ms)':>11}"]
+        for p in phases:
+            lines.append(f"{p['phase']:<16} {p['thread']:<18} {p['start_ms']:>9.1f} {p['ms']:>11.1f}")
+        return "\n".join(lines)
+
+    def report(self):
+        with self._lock:
+            if self.reported:
+                return self.phases
+            self.reported = True
+            phases = sorted(self.phases, key=lambda p: p["start_ms"])
+        summary = ", ".join(f"{p['phase']}@{p['start_ms']:g}+{p['ms']:g}" for p in phases)
+        _log.info(f"Startzeiten (ms, Phase@Beginn+Dauer): {summary}", extra={"fields": {"phases": phases}})
+        return phases
@@ -0,0 +1,5 @@
+# conftest.py – Tests laufen gegen die Module im Projektordner (flaches Layout, kein Paket)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,135 @@
+# test_archive_analytics.py – Archiv-Analyse: Ergebnis auch ohne bzw. bei ausgefallenem Prozess-Pool
+import json
+import os
+import time
+
+import pytest
+
+import archive_analytics
+from archive_analytics import ArchiveAnalytics
+from thought_journal import ThoughtJournal
+
+
+class _Archive:
+    """Das Nötigste von ArchiveManager: backend, store.path, end_cursor(), cursor_mark()."""
+
+    def __init__(self, store):
+        self.backend = "journal"
+        self.store = store
+
+    def end_cursor(self):
+        return self.store.end_cursor()
+
+    def cursor_mark(self, cursor):
+        return self.store.cursor_mark(cursor)
+
+
+class BrokenPool:
+    """Pool, der schon beim Einreichen scheitert (wie ein kaputter Spawn)."""
+
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, *args):
+        raise RuntimeError("Pool kaputt")
+
+    def shutdown(self, **kwargs):
+        self.shut_down = True
+
+
+@pytest.fixture
+def archive(tmp_path):
+    with open(os.path.join(tmp_path, ThoughtJournal.FILENAME), "w", encoding="utf-8") as f:
+        for i in range(300):
+            f.write(json.dumps({"text": f"User: wald baum licht moos {i % 7}"}) + "\n")
+    store = ThoughtJournal(str(tmp_path))
+    yield _Archive(store)
+    store.close()
+
+
+def wait(analytics, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = analytics.poll()
+        if result is not None or not analytics.running:
+            return result
+        time.sleep(0.01)
+    raise AssertionError("Analyse nicht fertig geworden")
+
+
+def test_without_pool_runs_in_thread(archive, monkeypatch):
+    monkeypatch.setattr(archive_analytics, "_executor", False)
+    analytics = ArchiveAnalytics(archive, chunk_bytes=1000)
+    assert analytics.request()
+    result = wait(analytics)
+    assert result["entries"] == 300
+    assert result["chunks"] > 1
+
+
+def test_broken_pool_is_discarded_and_result_complete(archive, monkeypatch):
+    pool = BrokenPool()
+    monkeypatch.setattr(archive_analytics, "_executor", pool)
+    analytics = ArchiveAnalytics(archive, chunk_bytes=1000)
+    assert analytics.request()
+    result = wait(analytics)
+    assert result["entries"] == 300
+    assert pool.shut_down
+    assert archive_analytics._executor is None  # der nächste Auftrag legt einen neuen Pool an
+
+
+def test_default_pool_is_small_and_shut_down_on_exit(monkeypatch):
+    created = []
+
+    class Pool(BrokenPool):
+        def __init__(self, max_workers, mp_context):
+            super().__init__()
+            self.max_workers = max_workers
+            created.append(self)
+
+    monkeypatch.setattr(archive_analytics, "_executor", None)
+    monkeypatch.setattr(archive_analytics, "ProcessPoolExecutor", Pool)
+    monkeypatch.setattr(archive_analytics.os, "cpu_count", lambda: 32)
+    pool = archive_analytics.get_executor()
+    assert pool.max_workers == archive_analytics.DEFAULT_WORKERS
+    assert archive_analytics.get_executor() is pool
+    archive_analytics.shutdown_executor()
+    assert pool.shut_down and archive_analytics._executor is None
+    assert archive_analytics.get_executor(workers=3).max_workers == 3
+    archive_analytics.shutdown_executor()
+    assert len(created) == 2
+
+
+def test_main_module_does_not_import_the_ui():
+    # die Analyse-Prozesse importieren das Hauptmodul erneut; main.py darf dabei kein Kivy laden
+    import ast
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    assert not [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def test_follow_up_counts_only_new_entries(archive, monkeypatch):
+    monkeypatch.setattr(archive_analytics, "_executor", False)
+    analytics = ArchiveAnalytics(archive, interval=0.0, chunk_bytes=1000)
+    analytics.request()
+    wait(analytics)
+    archive.store.append_many([{"text": "User: garten tomaten beet"}] * 20)
+    archive.store.sync()
+    analytics.request()
+    assert wait(analytics)["entries"] == 320
+
+
+def test_compaction_resets_the_cursor(archive, monkeypatch):
+    monkeypatch.setattr(archive_analytics, "_executor", False)
+    with open(archive.store.path, "rb") as f:
+        data = f.read()
+    with open(archive.store.path, "wb") as f:
+        f.write(b"kein json\n" + data)
+    analytics = ArchiveAnalytics(archive, interval=0.0, chunk_bytes=1000)
+    analytics.request()
+    assert wait(analytics)["entries"] == 300
+    # die Kompaktierung verschiebt alle Offsets: der alte Cursor zeigt mitten in den ersten neuen Eintrag
+    archive.store.compact()
+    archive.store.append_many([{"text": "User: garten tomaten beet"}] * 2)
+    analytics.request()
+    assert wait(analytics)["entries"] == 302
@@ -0,0 +1,94 @@
+# test_association_store.py – Zerfall, Top-K, Obergrenze und Persistenz der Assoziationen
+import random
+
+import pytest
+
+from association_store import AssociationStore
+
+
+def brute_force_top(store, n):
+    weights = {w: store.get(w) for w in store._raw}
+    return sorted(weights.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+def test_decay_scales_all_weights_per_add():
+    store = AssociationStore(decay=0.5)
+    store.add("wald", 8.0)
+    store.add("baum", 1.0)
+    assert store.get("wald") == pytest.approx(4.0)  # einmal abgeklungen
+    assert store.get("baum") == pytest.approx(1.0)
+    store.add("wald", 0.0)
+    assert store.get("wald") == pytest.approx(2.0)
+    assert store.get("baum") == pytest.approx(0.5)
+    store.add("moos", 1.0, decay=False)
+    assert store.get("baum") == pytest.approx(0.5)
+    assert store.get("fehlt", -1) == -1
+
+
+def test_top_k_matches_brute_force_under_random_load():
+    rnd = random.Random(1)
+    store = AssociationStore(capacity=300, top_k=16, decay=0.999)
+    vocabulary = [f"w{i}" for i in range(1000)]
+    for i in range(20000):
+        # Zipf-artig: wenige Wörter sehr häufig
+        word = vocabulary[min(int(rnd.paretovariate(1.1)) - 1, len(vocabulary) - 1)]
+        store.add(word, rnd.uniform(0.5, 1.5))
+        if i % 997 == 0:
+            assert [w for w, _ in store.top(10)] == [w for w, _ in brute_force_top(store, 10)]
+    top = store.top(16)
+    assert [w for w, _ in top] == [w for w, _ in brute_force_top(store, 16)]
+    assert all(weight == pytest.approx(store.get(w)) for w, weight in top)
+
+
+def test_capacity_is_bounded_and_evicts_weakest_but_not_top():
+    store = AssociationStore(capacity=100, top_k=8, decay=1.0)
+    for i in range(8):
+        store.add(f"stark{i}", 1000.0 + i)
+    for i in range(500):
+        store.add(f"w{i}", 1.0 + i / 1000.0)
+        assert len(store) <= 110
+    for i in range(8):
+        assert f"stark{i}" in store
+    assert "w0" not in store and "w499" in store
+    # Zufallsauswahl sieht nur noch lebende Wörter
+    assert len(store._words) == len(store._raw) == len(store._index)
+    assert all(store._words[pos] == w for w, pos in store._index.items())
+
+
+def test_underflow_renormalizes_without_changing_order():
+    store = AssociationStore(decay=1e-30)
+    for i in range(20):
+        store.add(f"w{i}", 1.0)
+    assert store._scale > 1e-200
+    assert store.top(1)[0][0] == "w19"
+    assert store.get("w19") == pytest.approx(1.0)
+
+
+def test_sample_uniform_and_weighted():
+    random.seed(5)
+    store = AssociationStore(decay=1.0)
+    assert store.sample() is None and store.sample_weighted() is None
+    store.add("oft", 99.0)
+    store.add("selten", 1.0)
+    uniform = [store.sample() for _ in range(2000)]
+    assert 800 < uniform.count("selten") < 1200
+    weighted = [store.sample_weighted() for _ in range(2000)]
+    assert weighted.count("selten") < 100
+
+
+def test_save_and_load_round_trip_with_checkpoint(tmp_path):
+    store = AssociationStore(decay=0.9)
+    for word in ["wald", "baum", "wald", "moos", "Tab\tim Wort"]:
+        store.add(word, 2.0)
+    store.checkpoint = {"backend": "journal", "cursor": 1234}
+    store.save(str(tmp_path))
+    assert not store.dirty
+
+    loaded = AssociationStore(decay=0.9)
+    assert loaded.load(str(tmp_path))
+    assert loaded.checkpoint == {"backend": "journal", "cursor": 1234}
+    assert sorted(loaded._raw) == sorted(store._raw)
+    for word in store._raw:
+        assert loaded.get(word) == pytest.approx(store.get(word), rel=1e-5)
+    assert [w for w, _ in loaded.top(3)] == [w for w, _ in store.top(3)]
+    assert not AssociationStore().load(str(tmp_path / "fehlt"))
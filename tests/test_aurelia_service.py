@@ -0,0 +1,89 @@
+# test_aurelia_service.py – Sitzungen des Dienstes: Engine nur im Executor, serielle Spur je Sitzung
+import asyncio
+import threading
+
+import pytest
+
+from aurelia_engine import EngineWorker
+from aurelia_service import AureliaService
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Zeichnet je Engine-Aufruf (Befehl, Thread, gleichzeitig laufende Aufrufe) auf."""
+    calls = []
+    active = {"n": 0}
+    lock = threading.Lock()
+    build, handle = EngineWorker.build, EngineWorker.handle
+
+    def record(name, fn):
+        with lock:
+            active["n"] += 1
+            calls.append((name, threading.current_thread().name, active["n"]))
+        try:
+            return fn()
+        finally:
+            with lock:
+                active["n"] -= 1
+
+    monkeypatch.setattr(EngineWorker, "build", lambda self: record("build", lambda: build(self)))
+    monkeypatch.setattr(EngineWorker, "handle",
+                        lambda self, command, payload=None: record(command, lambda: handle(self, command, payload)))
+    return calls
+
+
+def run(service, coro):
+    async def main():
+        try:
+            return await coro(service)
+        finally:
+            await service.stop()
+    return asyncio.run(main())
+
+
+def test_engine_runs_only_in_executor(tmp_path, calls):
+    service = AureliaService(str(tmp_path), {"analytics": False}, workers=2)
+
+    async def scenario(service):
+        session = await service.create_session("s1")
+        reply = await session.process_input("Hallo Aurelia")
+        await session.tick()
+        return reply
+
+    reply = run(service, scenario)
+    assert reply
+    assert [name for name, _, _ in calls][:3] == ["build", "user_message", "tick"]
+    assert all(thread.startswith("AureliaSession") for _, thread, _ in calls)
+
+
+def test_session_calls_never_overlap(tmp_path, calls):
+    service = AureliaService(str(tmp_path), {"analytics": False}, workers=4)
+
+    async def scenario(service):
+        session = await service.create_session("s1")
+        replies = await asyncio.gather(*(session.process_input(f"Nachricht {i}") for i in range(8)),
+                                       *(session.tick() for _ in range(4)))
+        return replies[:8]
+
+    replies = run(service, scenario)
+    assert all(replies)
+    assert max(n for _, _, n in calls) == 1
+
+
+def test_close_session_persists_history(tmp_path, calls):
+    service = AureliaService(str(tmp_path), {"analytics": False})
+
+    async def first(service):
+        session = await service.create_session("s1")
+        await session.process_input("Merk dir das bitte")
+        await service.close_session("s1")
+
+    run(service, first)
+    service = AureliaService(str(tmp_path), {"analytics": False})
+
+    async def second(service):
+        session = await service.create_session("s1")
+        return await session.run(session.worker.archive_manager.recent_thoughts, 5)
+
+    thoughts = run(service, second)
+    assert any("Merk dir das bitte" in str(t) for t in thoughts)
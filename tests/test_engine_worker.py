@@ -0,0 +1,117 @@
+# test_engine_worker.py – EngineWorker synchron (build/handle/close) auf einer simulierten Uhr
+import os
+import random
+from collections import Counter
+
+import pytest
+
+from aurelia_engine import EngineWorker
+from event_bus import GOAL, REPLY
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def worker(tmp_path):
+    random.seed(42)
+    clock = FakeClock()
+    worker = EngineWorker(str(tmp_path), {"analytics": False}, clock=clock)
+    worker.build()
+    worker.finish_recall()
+    worker.drain_events(max_events=None)
+    yield worker
+    worker.close()
+
+
+def test_ticks_on_simulated_clock_act_and_flush(worker, tmp_path):
+    clock = worker.clock
+    events = Counter()
+    for _ in range(300):
+        clock.now += worker.tick_interval
+        worker.handle("tick")
+        events.update(topic for topic, _ in worker.drain_events(max_events=None))
+    assert events[GOAL] > 10  # Cooldown folgt der simulierten Zeit
+    # gespeichert wurde schon während des Laufs, nicht erst beim Beenden
+    assert worker.decision_engine._state_writer.writes > 0
+    assert os.path.exists(os.path.join(str(tmp_path), "aurelia_goals.tsv"))
+    assert os.path.exists(os.path.join(str(tmp_path), "aurelia_state.json"))
+
+
+def test_user_message_is_written_once(worker):
+    for text in ["Hallo Aurelia!", "Hallo Aurelia!"]:
+        worker.handle("user_message", text)
+    replies = [p for topic, p in worker.drain_events(max_events=None) if topic == REPLY]
+    assert len(replies) == 2 and all(replies)
+
+    conversation = worker.context_manager.state["conversation"]
+    assert [m["who"] for m in conversation] == ["user", "aurelia", "user", "aurelia"]
+    archived = [e["text"] for e in worker.archive_manager.recent_thoughts(10)]
+    assert archived.count("User: Hallo Aurelia!") == 2
+    assert sum(1 for t in archived if "Aurelia (Antwort):" in t) == 2
+
+
+def test_close_persists_and_rebuild_restores(tmp_path):
+    clock = FakeClock()
+    worker = EngineWorker(str(tmp_path), {"analytics": False}, clock=clock)
+    worker.build()
+    worker.handle("user_message", "Merk dir den Wald.")
+    personality = dict(worker.decision_engine.state["personality"])
+    worker.close()
+
+    again = EngineWorker(str(tmp_path), {"analytics": False}, clock=clock)
+    again.build()
+    assert again.decision_engine.state["personality"] == personality
+    assert any("Wald" in m["text"] for m in again.context_manager.state["conversation"])
+    again.close()
+
+
+def test_seeding_checkpoint_is_reset_when_offsets_shift(tmp_path, monkeypatch):
+    from aurelia_engine import DecisionEngine
+    from thought_journal import ThoughtJournal
+    clock = FakeClock()
+    worker = EngineWorker(str(tmp_path), {"analytics": False}, clock=clock)
+    worker.build()
+    worker.handle("user_message", "Merk dir den Wald.")
+    worker.close()
+    worker = EngineWorker(str(tmp_path), {"analytics": False}, clock=clock)
+    worker.build()  # zählt die Nachricht ein, Checkpoint steht jetzt am Archiv-Ende
+    assert worker.decision_engine.associations.checkpoint["cursor"] > 0
+    worker.close()
+    # wie nach einer Kompaktierung: die erste Zeile fällt weg, danach kommen neue Einträge dazu
+    journal = ThoughtJournal(str(tmp_path))
+    with open(journal.path, "rb") as f:
+        lines = f.readlines()
+    with open(journal.path, "wb") as f:
+        f.writelines(lines[1:])
+    journal.append_many([{"text": f"User: Eintrag {i}"} for i in range(5)])
+    journal.close()
+
+    counted = []
+    monkeypatch.setattr(DecisionEngine, "_add_counts", lambda self, thoughts: counted.extend(thoughts))
+    again = EngineWorker(str(tmp_path), {"analytics": False}, clock=clock)
+    again.build()
+    archive, checkpoint = again.archive_manager, again.decision_engine.associations.checkpoint
+    assert counted == []  # der alte Cursor zählt nichts mehr, er wird aufs Ende gesetzt
+    assert checkpoint["cursor"] == archive.end_cursor()
+    assert checkpoint["mark"] == archive.cursor_mark(checkpoint["cursor"])
+    again.close()
+
+
+def test_goal_evicted_on_creation_is_not_announced(worker):
+    engine = worker.decision_engine
+    engine.goals.capacity = len(engine.goals) or 1
+    while len(engine.goals) < engine.goals.capacity:
+        engine.goals.add("wichtig", 1.0)
+    for goal in engine.goals.goals():
+        engine.goals.progress(goal["id"], goal["priority"] - 0.95)  # alle auf 0.95
+    created = engine.experience.count("goal_created", "lifetime")
+    for _ in range(20):
+        assert engine._propose_new_goal() is None  # 0.3–0.9 ist immer das schwächste
+    assert engine.experience.count("goal_created", "lifetime") == created
+    assert all(g["priority"] == pytest.approx(0.95) for g in engine.goals.goals())
@@ -0,0 +1,72 @@
+# test_event_bus.py – Pub/Sub: Topics, Reihenfolge, Backpressure und Verwerfen
+import threading
+import time
+
+import pytest
+
+from event_bus import GOAL, REPLY, THOUGHT, EventBus
+
+
+def test_topics_filter_and_order():
+    bus = EventBus()
+    all_events = bus.subscribe()
+    replies = bus.subscribe([REPLY])
+    for i in range(3):
+        bus.publish(THOUGHT, i)
+    bus.publish(REPLY, "antwort")
+    assert [(e.topic, e.payload) for e in all_events.drain()] == [
+        (THOUGHT, 0), (THOUGHT, 1), (THOUGHT, 2), (REPLY, "antwort")]
+    assert [e.payload for e in replies.drain()] == ["antwort"]
+    assert all_events.drain() == []
+
+
+def test_unknown_topic_is_rejected():
+    bus = EventBus()
+    with pytest.raises(ValueError):
+        bus.publish("gibt_es_nicht")
+    with pytest.raises(ValueError):
+        bus.subscribe(["gibt_es_nicht"])
+
+
+def test_full_queue_drops_oldest_after_timeout():
+    bus = EventBus()
+    sub = bus.subscribe(maxsize=3, block_timeout=0.01)
+    t0 = time.monotonic()
+    for i in range(5):
+        bus.publish(GOAL, i)
+    assert time.monotonic() - t0 >= 0.02  # zweimal kurz gewartet
+    assert sub.dropped == 2
+    assert [e.payload for e in sub.drain()] == [2, 3, 4]
+
+
+def test_full_queue_waits_for_consumer_instead_of_dropping():
+    bus = EventBus()
+    sub = bus.subscribe(maxsize=1, block_timeout=2.0)
+    bus.publish(GOAL, "erstes")
+    consumer = threading.Timer(0.05, sub.drain)
+    consumer.start()
+    bus.publish(GOAL, "zweites")  # blockiert, bis der Verbraucher abholt
+    consumer.join()
+    assert sub.dropped == 0
+    assert [e.payload for e in sub.drain()] == ["zweites"]
+
+
+def test_wake_once_per_batch_and_drain_limit():
+    bus = EventBus()
+    wakes = []
+    sub = bus.subscribe(wake=lambda: wakes.append(1))
+    for i in range(5):
+        bus.publish(THOUGHT, i)
+    assert len(wakes) == 1
+    assert [e.payload for e in sub.drain(max_events=2)] == [0, 1]
+    sub.drain()
+    bus.publish(THOUGHT, 5)
+    assert len(wakes) == 2
+
+
+def test_unsubscribe_stops_delivery():
+    bus = EventBus()
+    sub = bus.subscribe()
+    sub.close()
+    bus.publish(THOUGHT, 1)
+    assert len(sub) == 0
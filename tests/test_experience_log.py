@@ -0,0 +1,75 @@
+# test_experience_log.py – Ringpuffer und Fenster-Zähler der Erfahrungen
+import random
+import datetime
+from collections import Counter
+
+from experience_log import ExperienceLog
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_windows_match_brute_force(tmp_path):
+    rnd = random.Random(4)
+    clock = FakeClock()
+    log = ExperienceLog(str(tmp_path), capacity=50, recent_size=10, window=100.0, clock=clock)
+    history = []  # (zeit, typ)
+    for _ in range(600):
+        clock.now += rnd.uniform(0, 20)
+        typ = rnd.choice(["success", "failure", "thought_generated"])
+        log.record(typ, "detail")
+        history.append((clock.now, typ))
+        if rnd.random() < 0.2:
+            clock.now += rnd.uniform(0, 50)  # Lesen nach einer Pause: Stundenfenster läuft ab
+        recent = Counter(t for _, t in history[-10:])
+        hour = Counter(t for when, t in history if when >= clock.now - 100.0)
+        assert log.counts("recent") == dict(recent)
+        assert log.counts("hour") == dict(hour)
+        assert log.counts("lifetime") == dict(Counter(t for _, t in history))
+        assert log.count("success", "hour") == hour["success"]
+        assert log.total("hour") == sum(hour.values())
+    assert len(log) == 50
+    assert [e["type"] for e in log.recent(5)] == [t for _, t in history[-5:]]
+    log.close()
+
+
+def test_reload_from_journal_restores_ring_and_windows(tmp_path):
+    clock = FakeClock()
+    log = ExperienceLog(str(tmp_path), capacity=5, recent_size=3, window=3600.0, clock=clock)
+    for i in range(8):
+        clock.now += 1000.0
+        log.record("success" if i % 2 else "failure", f"e{i}")
+    lifetime = log.counts("lifetime")
+    log.close()
+
+    reloaded = ExperienceLog(str(tmp_path), capacity=5, recent_size=3, window=3600.0, clock=clock)
+    reloaded.load(lifetime=lifetime)
+    assert [e["detail"] for e in reloaded.recent(10)] == ["e3", "e4", "e5", "e6", "e7"]
+    assert reloaded.counts("lifetime") == {"success": 4, "failure": 4}
+    assert reloaded.total("recent") == 3
+    # im Stundenfenster (3600 s): e4 bis e7, vor 3000, 2000, 1000 und 0 s
+    assert reloaded.total("hour") == 4
+    clock.now += 700.0
+    assert reloaded.total("hour") == 3
+    reloaded.close()
+
+
+def test_legacy_list_is_moved_into_the_journal_once(tmp_path):
+    clock = FakeClock()
+    legacy = [{"time": str(datetime.datetime.fromtimestamp(clock.now - 10)), "type": "success", "detail": "alt"},
+              {"time": "kein Datum", "type": "failure", "detail": "ohne Zeit"}, "kaputt"]
+    log = ExperienceLog(str(tmp_path), clock=clock)
+    log.load(legacy=legacy)
+    assert log.counts("lifetime") == {"success": 1, "failure": 1}
+    assert log.total("hour") == 2  # ohne lesbare Zeit zählt der Eintrag als jetzt
+    log.close()
+
+    again = ExperienceLog(str(tmp_path), clock=clock)
+    again.load(legacy=legacy)  # Journal nicht leer: keine zweite Übernahme
+    assert len(again) == 2
+    again.close()
@@ -0,0 +1,156 @@
+# test_goal_scheduler.py – Prioritäts-Heap mit verzögertem Löschen, Alterung, Persistenz
+import random
+import datetime
+
+import pytest
+
+from goal_scheduler import GoalScheduler
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def brute_force_best(scheduler):
+    goals = scheduler.goals()
+    return max(goals, key=lambda g: (g["priority"], -g["id"])) if goals else None
+
+
+def test_peek_follows_priority_changes():
+    scheduler = GoalScheduler(clock=FakeClock())
+    a = scheduler.add("a", 0.5)
+    b = scheduler.add("b", 0.9)
+    assert scheduler.peek()["id"] == b["id"]
+    scheduler.progress(b["id"], 0.5)  # 0.4 < 0.5
+    assert scheduler.peek()["id"] == a["id"]
+    assert scheduler.progress(a["id"], 0.45) is None  # unter min_priority → erledigt
+    assert a["id"] not in scheduler
+    assert scheduler.peek()["id"] == b["id"]
+    scheduler.remove(b["id"])
+    assert scheduler.peek() is None and len(scheduler) == 0
+
+
+def test_ids_are_unique_and_increasing():
+    scheduler = GoalScheduler(clock=FakeClock())
+    ids = [scheduler.add("gleich", 0.5)["id"] for _ in range(10)]
+    assert ids == list(range(1, 11))
+
+
+def test_random_operations_match_brute_force():
+    rnd = random.Random(11)
+    clock = FakeClock()
+    scheduler = GoalScheduler(capacity=40, half_life=3600.0, clock=clock)
+    for _ in range(5000):
+        op = rnd.random()
+        live = [g["id"] for g in scheduler.goals()]
+        if op < 0.4 or not live:
+            scheduler.add(f"ziel {rnd.randrange(100)}", rnd.uniform(0.2, 1.0))
+        elif op < 0.7:
+            scheduler.progress(rnd.choice(live), rnd.uniform(0.0, 0.2))
+        elif op < 0.8:
+            scheduler.remove(rnd.choice(live))
+        else:
+            clock.now += rnd.uniform(0, 600)
+            scheduler.age()
+        assert len(scheduler) <= 40
+        # der Heap bleibt höchstens doppelt so groß wie die Zielmenge (plus Puffer)
+        assert len(scheduler._heap) <= 2 * len(scheduler) + 17
+        expected = brute_force_best(scheduler)
+        got = scheduler.peek()
+        if expected is None or expected["priority"] < scheduler.min_priority:
+            assert got is None
+        else:
+            assert got["priority"] == pytest.approx(expected["priority"])
+
+
+def test_ageing_halves_priorities_and_keeps_order():
+    clock = FakeClock()
+    scheduler = GoalScheduler(half_life=100.0, clock=clock)
+    scheduler.add("stark", 0.8)
+    scheduler.add("schwach", 0.4)
+    clock.now += 100.0
+    scheduler.age()
+    assert [round(g["priority"], 6) for g in scheduler.goals()] == [0.4, 0.2]
+    clock.now -= 50.0  # Uhr springt zurück: nichts passiert
+    scheduler.age()
+    assert scheduler.goals()[0]["priority"] == pytest.approx(0.4)
+
+
+def test_everything_falls_asleep_below_min_priority():
+    clock = FakeClock()
+    scheduler = GoalScheduler(half_life=10.0, min_priority=0.1, clock=clock)
+    scheduler.add("a", 0.9)
+    scheduler.add("b", 0.5)
+    clock.now += 40.0  # 0.9 / 16 < 0.1
+    scheduler.age()
+    assert scheduler.peek() is None
+    assert len(scheduler) == 0 and scheduler.dirty
+
+
+def test_capacity_evicts_weakest_then_oldest():
+    scheduler = GoalScheduler(capacity=3, clock=FakeClock())
+    first = scheduler.add("gleich alt", 0.3)
+    scheduler.add("gleich neu", 0.3)
+    scheduler.add("stark", 0.9)
+    scheduler.add("mittel", 0.6)
+    titles = [g["title"] for g in scheduler.goals()]
+    assert titles == ["stark", "mittel", "gleich neu"]
+    assert first["id"] not in scheduler
+
+
+def test_add_at_capacity_returns_none_when_new_goal_is_weakest():
+    scheduler = GoalScheduler(capacity=2, clock=FakeClock())
+    scheduler.add("a", 0.8)
+    scheduler.add("b", 0.7)
+    assert scheduler.add("schwach", 0.3) is None
+    assert [g["title"] for g in scheduler.goals()] == ["a", "b"]
+    assert scheduler.add("stark", 0.9)["title"] == "stark"
+    assert [g["title"] for g in scheduler.goals()] == ["stark", "a"]
+
+
+def test_eviction_under_load_keeps_heaps_bounded():
+    rnd = random.Random(3)
+    scheduler = GoalScheduler(capacity=50, clock=FakeClock())
+    for i in range(5000):
+        goal = scheduler.add(f"ziel {i}", rnd.uniform(0.2, 1.0))
+        weakest = min(g["priority"] for g in scheduler.goals())
+        assert goal is None or goal["priority"] >= weakest
+        assert len(scheduler) <= 50
+        assert len(scheduler._min_heap) <= 2 * len(scheduler) + 17
+        assert len(scheduler._heap) <= 2 * len(scheduler) + 17
+
+
+def test_created_uses_clock():
+    scheduler = GoalScheduler(clock=FakeClock(0.0))
+    assert scheduler.add("x", 0.5)["created"] == str(datetime.datetime.fromtimestamp(0.0))
+
+
+def test_save_load_round_trip_and_ageing_across_restart(tmp_path):
+    clock = FakeClock()
+    scheduler = GoalScheduler(half_life=100.0, clock=clock)
+    # Leerraum (auch Tabs und Zeilenumbrüche) im Titel wird beim Anlegen vereinheitlicht
+    assert scheduler.add("Muster\tim\nArchiv", 0.8)["title"] == "Muster im Archiv"
+    scheduler.add("organisiere Notizen", 0.6)
+    scheduler.save(str(tmp_path))
+    assert not scheduler.dirty
+
+    clock.now += 100.0
+    loaded = GoalScheduler(half_life=100.0, clock=clock)
+    assert loaded.load(str(tmp_path))
+    assert loaded.next_id == 3
+    assert [g["title"] for g in loaded.goals()] == ["Muster im Archiv", "organisiere Notizen"]
+    loaded.age()  # holt die Zeit seit dem Speichern nach
+    assert [round(g["priority"], 6) for g in loaded.goals()] == [0.4, 0.3]
+    assert loaded.add("neu", 0.5)["id"] == 3
+    assert not GoalScheduler().load(str(tmp_path / "fehlt"))
+
+
+def test_legacy_list_migration():
+    scheduler = GoalScheduler(clock=FakeClock())
+    scheduler.update([{"title": "alt", "priority": 0.7, "created": "2024-01-01 00:00:00"},
+                      {"title": "ohne Priorität"}, {"kaputt": True}, {"title": "x", "priority": "nan?"}])
+    assert [(g["title"], g["priority"]) for g in scheduler.goals()] == [("alt", 0.7), ("ohne Priorität", 0.5)]
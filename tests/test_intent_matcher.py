@@ -0,0 +1,80 @@
+# test_intent_matcher.py – Aho-Corasick-Automat gegen die frühere any()-Kette
+import random
+
+import pytest
+
+from intent_matcher import DEFAULT_INTENTS, IntentMatcher
+
+# Tabelle der ursprünglichen if/elif-Kette in SimpleNLU.interpret
+OLD_INTENTS = {
+    "greeting": ["hallo", "hi", "hey"],
+    "howareyou": ["wie geht", "alles gut", "na?"],
+    "action_request": ["mach", "starte", "führe", "öffne", "erstelle"],
+    "opinion": ["was denkst", "meinung", "was meinst", "wie findest"],
+    "memory_request": ["erinnere", "erinnerung", "woran erinnerst", "hast du"],
+    "question": ["?"],
+}
+
+
+def any_chain(table, text, default="statement"):
+    """Das alte Verhalten: erstes Intent, von dem ein Schlüsselwort als Teilstring vorkommt."""
+    low = text.lower()
+    for intent, keywords in table.items():
+        if any(k in low for k in keywords):
+            return intent
+    return default
+
+
+def random_texts(table, n, seed):
+    rnd = random.Random(seed)
+    keywords = [k for ks in table.values() for k in ks]
+    filler = ["ich", "heute", "wald", "Notizen", "das", "hin", "ma", "wie", "erinner", "na", "?", "!",
+              "HALLO", "Öffne", "geht", "meinst", "du", "hast"]
+    for _ in range(n):
+        parts = []
+        for _ in range(rnd.randrange(1, 8)):
+            r = rnd.random()
+            if r < 0.25:
+                k = rnd.choice(keywords)
+                # auch abgeschnittene Schlüsselwörter: Fail-Links müssen zurückfallen
+                parts.append(k[:rnd.randrange(1, len(k) + 1)] if rnd.random() < 0.3 else k)
+            else:
+                parts.append(rnd.choice(filler))
+        sep = rnd.choice([" ", "", "  ", "\t"])
+        yield sep.join(parts)
+
+
+@pytest.mark.parametrize("table", [OLD_INTENTS, DEFAULT_INTENTS], ids=["old", "default"])
+def test_matches_any_chain(table):
+    matcher = IntentMatcher(table)
+    for text in random_texts(table, 5000, seed=len(table["memory_request"])):
+        assert matcher.match(text)[0] == any_chain(table, text), text
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("Hallo Aurelia!", "greeting"),
+    ("Was machst du?", "action_request"),  # "mach" hat Vorrang vor "?"
+    ("Na? Was machst du?", "howareyou"),
+    ("Wie findest du das?", "opinion"),
+    ("Erinnerst du dich an den Wald?", "memory_request"),
+    ("Ist das so?", "question"),
+    ("Einfach eine Aussage.", "statement"),
+    ("", "statement"),
+    ("chi", "greeting"),  # Teilstring-Treffer wie früher
+])
+def test_examples(text, intent):
+    assert IntentMatcher().match(text)[0] == intent
+
+
+def test_overlapping_keywords_keep_table_priority():
+    matcher = IntentMatcher({"a": ["bcd"], "b": ["abc"], "c": ["c"]})
+    assert matcher.match("abcd")[0] == "a"
+    assert matcher.match("xbc")[0] == "c"
+    assert matcher.match("abce")[0] == "b"
+
+
+def test_words_match_whitespace_split():
+    matcher = IntentMatcher()
+    for text in ["  Hallo,\tAurelia!  Wie geht's? ", "eins", "", "Ä Ö\nÜ"]:
+        assert matcher.match(text)[1] == text.lower().split()
+
@@ -0,0 +1,201 @@
+# test_persistence.py – Gebündeltes Speichern und Snapshots mit Prüfsumme (Backup, beiseitelegen)
+import json
+import hashlib
+
+import pytest
+
+import serializers
+from persistence import BACKUP_SUFFIX, DebouncedWriter, UnitOfWork, read_snapshot, write_snapshot
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+# -------------------------------
+# DebouncedWriter / UnitOfWork
+# -------------------------------
+def test_writer_waits_for_quiet_period_or_max_latency():
+    clock, writes = FakeClock(), []
+    writer = DebouncedWriter(lambda: writes.append(clock.now), flush_interval=2.0, max_latency=10.0, clock=clock)
+    assert not writer.maybe_flush()
+    for _ in range(6):  # alle 1.5 s eine Änderung: nie 2 s Ruhe
+        writer.mark_dirty()
+        clock.now += 1.5
+        writer.maybe_flush()
+    assert writes == []
+    writer.mark_dirty()
+    clock.now += 1.5  # ältester Stand jetzt 10.5 s alt
+    assert writer.maybe_flush()
+    assert writes == [clock.now] and not writer.dirty
+
+    writer.mark_dirty()
+    clock.now += 2.0
+    assert writer.maybe_flush() and writer.writes == 2
+
+
+def test_failed_write_is_logged_and_stays_dirty():
+    clock, calls = FakeClock(), []
+
+    def write():
+        calls.append(clock.now)
+        if len(calls) == 1:
+            raise OSError("Kein Platz mehr auf dem Gerät")
+
+    writer = DebouncedWriter(write, flush_interval=2.0, clock=clock)
+    writer.mark_dirty()
+    assert writer.flush() is False
+    assert writer.dirty and writer.failures == 1 and writer.writes == 0
+    assert not writer.maybe_flush()  # neuer Versuch erst nach der Ruhezeit
+    clock.now += 2.0
+    assert writer.maybe_flush()
+    assert not writer.dirty and len(calls) == 2
+
+
+def test_flush_without_changes_does_not_write():
+    writer = DebouncedWriter(lambda: pytest.fail("darf nicht schreiben"))
+    assert writer.flush() is False
+
+
+def test_unit_of_work_commits_once_even_on_error():
+    class Participant:
+        def __init__(self):
+            self.log = []
+
+        def begin_batch(self):
+            self.log.append("begin")
+
+        def commit_batch(self):
+            self.log.append("commit")
+
+    a, b = Participant(), Participant()
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(a, None, b):
+            raise RuntimeError("mitten in der Verarbeitung")
+    assert a.log == b.log == ["begin", "commit"]
+
+
+# -------------------------------
+# Snapshots
+# -------------------------------
+
+
+@pytest.fixture
+def missing_msgpack(monkeypatch):
+    """msgpack wie auf einem Gerät ohne das Paket (ImportError beim ersten Gebrauch)."""
+    class Missing:
+        def __init__(self):
+            raise ImportError("No module named 'msgpack'")
+    monkeypatch.setitem(serializers.SERIALIZERS, "msgpack", Missing)
+    monkeypatch.delitem(serializers._instances, "msgpack", raising=False)
+
+
+def _write_raw_snapshot(path, payload, encoding):
+    header = {"format": "aurelia-snapshot", "version": 1, "encoding": encoding,
+              "sha256": hashlib.sha256(payload).hexdigest(), "length": len(payload)}
+    path.write_bytes(json.dumps(header).encode("utf-8") + b"\n" + payload)
+
+
+@pytest.mark.parametrize("encoding", ["json", "compact"])
+def test_round_trip_and_backup(tmp_path, encoding):
+    path = str(tmp_path / "state.json")
+    write_snapshot(path, {"n": 1}, encoding)
+    write_snapshot(path, {"n": 2}, encoding)
+    assert read_snapshot(path) == ({"n": 2}, "snapshot")
+    assert read_snapshot(path + BACKUP_SUFFIX)[0] == {"n": 1}
+    assert not (tmp_path / "state.json.tmp").exists()
+
+
+def test_checksum_mismatch_falls_back_to_backup(tmp_path):
+    path = tmp_path / "state.json"
+    write_snapshot(str(path), {"n": 1})
+    write_snapshot(str(path), {"n": 2})
+    raw = bytearray(path.read_bytes())
+    raw[-2] ^= 0x01  # ein Bit im Inhalt kippen
+    path.write_bytes(bytes(raw))
+
+    assert read_snapshot(str(path)) == ({"n": 1}, "backup")
+    assert not path.exists()
+    assert (tmp_path / "state.json.corrupt").read_bytes() == bytes(raw)
+
+
+def test_truncated_snapshot_falls_back_to_backup(tmp_path):
+    path = tmp_path / "state.json"
+    write_snapshot(str(path), {"n": 1})
+    write_snapshot(str(path), {"text": "x" * 100})
+    path.write_bytes(path.read_bytes()[:-10])
+    assert read_snapshot(str(path)) == ({"n": 1}, "backup")
+
+
+def test_nothing_readable(tmp_path):
+    path = tmp_path / "state.json"
+    assert read_snapshot(str(path)) == (None, None)
+    path.write_bytes(b"\x00\x01kaputt")
+    assert read_snapshot(str(path)) == (None, None)
+    assert (tmp_path / "state.json.corrupt").exists()
+
+
+def test_plain_json_without_header_is_still_read(tmp_path):
+    path = tmp_path / "context.json"
+    path.write_text(json.dumps({"conversation": []}), encoding="utf-8")
+    assert read_snapshot(str(path)) == ({"conversation": []}, "snapshot")
+
+
+def test_unavailable_encoding_is_set_aside_and_backup_used(tmp_path, missing_msgpack):
+    path = tmp_path / "state.json"
+    write_snapshot(str(path), {"n": 1})
+    write_snapshot(str(path), {"n": 2})
+    _write_raw_snapshot(path, b"\x81\xa1n\x03", "msgpack")
+    original = path.read_bytes()
+
+    assert read_snapshot(str(path)) == ({"n": 1}, "backup")
+    assert (tmp_path / "state.json.corrupt").read_bytes() == original
+
+
+def test_undecodable_payload_with_valid_checksum_is_set_aside(tmp_path):
+    path = tmp_path / "state.json"
+    _write_raw_snapshot(path, b"ACB1\x05", "compact")  # Stringtabelle bricht ab
+    assert read_snapshot(str(path)) == (None, None)
+    assert (tmp_path / "state.json.corrupt").exists()
+
+
+def test_set_aside_never_overwrites_an_older_file(tmp_path):
+    path = tmp_path / "state.json"
+    (tmp_path / "state.json.corrupt").write_bytes(b"alt")
+    path.write_bytes(b"kaputt 1")
+    read_snapshot(str(path))
+    path.write_bytes(b"kaputt 2")
+    read_snapshot(str(path))
+    assert (tmp_path / "state.json.corrupt").read_bytes() == b"alt"
+    assert (tmp_path / "state.json.corrupt.1").read_bytes() == b"kaputt 1"
+    assert (tmp_path / "state.json.corrupt.2").read_bytes() == b"kaputt 2"
+
+
+def test_read_only_mode_leaves_files_in_place(tmp_path, missing_msgpack):
+    path = tmp_path / "state.json"
+    _write_raw_snapshot(path, b"\x81\xa1n\x03", "msgpack")
+    assert read_snapshot(str(path), set_aside=False) == (None, None)
+    assert path.exists()
+    assert not (tmp_path / "state.json.corrupt").exists()
+
+
+def test_context_manager_restores_from_backup_and_journals(tmp_path, missing_msgpack):
+    from aurelia_engine import ContextManager
+    base = str(tmp_path)
+    context = ContextManager(base)
+    for i in range(3):
+        context.push_message("user", f"nachricht {i}")
+    context.close()  # Snapshot 1
+    context = ContextManager(base)
+    context.push_message("user", "vier")
+    context.close()  # Snapshot 2, Snapshot 1 wird .bak, das Journal wandert nach .prev
+    _write_raw_snapshot(tmp_path / "context.json", b"\x80", "msgpack")
+
+    context = ContextManager(base)
+    assert [m["text"] for m in context.state["conversation"]] == [
+        "nachricht 0", "nachricht 1", "nachricht 2", "vier"]
+    assert (tmp_path / "context.json.corrupt").exists()
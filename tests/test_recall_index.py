@@ -0,0 +1,78 @@
+# test_recall_index.py – TF-IDF-Ranking des Recall-Index
+import math
+
+from recall_index import RecallIndex
+
+
+def reference_scores(texts, query_terms):
+    """TF-IDF wie im Index, aber naiv über alle Dokumente gerechnet."""
+    from recall_index import STOPWORDS
+    from tokenizer import normalize_words
+    docs = [[w for w in normalize_words(t.split()) if w not in STOPWORDS] for t in texts]
+    n = len(docs)
+    scores = {}
+    for term in query_terms:
+        df = sum(1 for d in docs if term in d)
+        if not df:
+            continue
+        idf = math.log((n + 1) / df)
+        for i, d in enumerate(docs):
+            tf = d.count(term)
+            if tf:
+                scores[i] = scores.get(i, 0.0) + idf * (1 + math.log(tf)) / math.sqrt(len(d))
+    return scores
+
+
+TEXTS = [
+    "Heute war ich im Wald und habe Moos gesehen.",
+    "Der Wald, der Wald, der Wald – ich liebe den Wald.",
+    "Einkaufsliste: Milch, Brot, Tomaten.",
+    "Tomaten im Garten gießen nicht vergessen.",
+    "Ein langer Text über Musik, Klavier, Akkorde, Übung, Noten, Tonleitern und ein bisschen Wald.",
+]
+
+
+def test_ranking_matches_naive_tf_idf():
+    index = RecallIndex()
+    for i, text in enumerate(TEXTS):
+        index.add(text, "user", f"t{i}")
+    for query in ["Woran erinnerst du dich über den Wald?", "Tomaten", "Wald Tomaten Klavier"]:
+        expected = reference_scores(TEXTS, index.query_terms(query))
+        results = index.search(query, k=len(TEXTS))
+        ranked = sorted(expected, key=lambda i: (expected[i], i), reverse=True)
+        assert [r["text"] for r in results] == [TEXTS[i] for i in ranked]
+        for r, i in zip(results, ranked):
+            assert abs(r["score"] - expected[i]) < 1e-3
+
+
+def test_stopwords_and_question_words_do_not_match():
+    index = RecallIndex()
+    index.add("Ich erinnere mich an nichts.")
+    assert index.add("und oder aber") is None  # nur Füllwörter: nicht indexiert
+    assert index.search("Woran erinnerst du dich?") == []
+    assert len(index) == 1
+
+
+def test_ties_prefer_newer_and_duplicates_are_dropped():
+    index = RecallIndex()
+    index.add("Garten", "user", "alt")
+    index.add("Garten", "user", "neu")
+    index.add("Garten Beet", "user", "x")
+    results = index.search("Garten", k=5)
+    assert [r["text"] for r in results] == ["Garten", "Garten Beet"]
+    assert results[0]["time"] == "neu"
+
+
+def test_scan_limit_only_looks_at_newest_postings():
+    index = RecallIndex(scan_limit=3)
+    for i in range(10):
+        index.add(f"wald eintrag{i}", time=i)
+    times = sorted(r["time"] for r in index.search("wald", k=10))
+    assert times == [7, 8, 9]
+
+
+def test_unknown_terms_and_k_zero():
+    index = RecallIndex()
+    index.add("Wald")
+    assert index.search("Meer") == []
+    assert index.search("Wald", k=0) == []
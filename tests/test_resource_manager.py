@@ -0,0 +1,69 @@
+# test_resource_manager.py – Drosselung aus CPU und Speicherzuwachs (ohne echtes psutil)
+from types import SimpleNamespace
+
+from resource_manager import ResourceManager
+
+MB = 1024 ** 2
+
+
+class FakePsutil:
+    Error = OSError
+
+    def __init__(self):
+        self.cpu = 5.0
+
+    def cpu_percent(self, interval=None):
+        return self.cpu
+
+
+class FakeProcess:
+    def __init__(self, rss):
+        self.rss = rss
+
+    def memory_info(self):
+        return SimpleNamespace(rss=self.rss)
+
+    def io_counters(self):
+        raise AttributeError
+
+
+def manager(rss, **kwargs):
+    resources = ResourceManager(**kwargs)
+    resources._psutil, resources._process = FakePsutil(), FakeProcess(rss)
+    return resources
+
+
+def test_large_but_stable_process_is_not_throttled():
+    resources = manager(400 * MB)  # Kivy-Desktop-Prozess weit über 100 MB
+    for _ in range(10):
+        resources.sample()
+    assert resources.baseline_rss == 400 * MB
+    assert resources.backoff == 1.0
+    assert resources.check_resources()
+
+
+def test_growth_over_limit_throttles_and_recovers():
+    resources = manager(400 * MB, ram_growth_limit=100 * MB)
+    resources.sample()
+    resources._process.rss = 550 * MB
+    for _ in range(3):
+        resources.sample()
+    assert resources.backoff == 8.0
+    assert not resources.check_resources()
+    resources._process.rss = 420 * MB
+    for _ in range(10):
+        resources.sample()
+    assert resources.backoff == 1.0
+
+
+def test_absolute_limit_still_applies_when_set():
+    resources = manager(400 * MB, ram_limit=300 * MB)
+    resources.sample()
+    assert resources.backoff == 2.0
+
+
+def test_cpu_over_limit_throttles():
+    resources = manager(100 * MB, cpu_limit=50)
+    resources._psutil.cpu = 90.0
+    resources.sample()
+    assert resources.backoff == 2.0
@@ -0,0 +1,79 @@
+# test_serializers.py – Alle Snapshot-Kodierungen geben exakt dasselbe zurück
+import random
+
+import pytest
+
+from serializers import CompactSerializer, available_serializers, get_serializer
+
+STATE = {
+    "conversation": [
+        {"who": "user", "text": "Hallo Aurelia! 🌸", "time": "2024-05-01 12:00:00.123456", "seq": 1},
+        {"who": "aurelia", "text": "Schön, dich zu sehen.", "time": "2024-05-01 12:00:01", "seq": 2,
+         "recall": False},
+    ],
+    "memory": {"short": [], "long": [{"who": "user", "text": "", "time": "1969-12-31 23:59:59", "seq": -3}]},
+    "personality": {"curiosity": 0.85, "empathy": 1e-12, "directness": -0.0},
+    "experience_counts": {"thought_generated": 2 ** 40, "success": 0},
+    "last_action": None,
+    "flags": [True, False, None, [], {}],
+    # sieht aus wie ein Zeitstempel, ist aber keiner bzw. nicht exakt rekonstruierbar
+    "not_times": ["2024-02-30 00:00:00", "2024-05-01T12:00:00", "2024-05-01 12:00:00.1", "9999-12-31 23:59:59"],
+}
+
+
+@pytest.mark.parametrize("name", available_serializers())
+def test_round_trip(name):
+    serializer = get_serializer(name)
+    assert serializer.loads(serializer.dumps(STATE)) == STATE
+
+
+def test_compact_round_trip_random_trees():
+    rnd = random.Random(7)
+    serializer = CompactSerializer()
+
+    def value(depth):
+        kind = rnd.randrange(8 if depth < 4 else 5)
+        if kind == 0:
+            return rnd.choice([None, True, False])
+        if kind == 1:
+            return rnd.randint(-2 ** 70, 2 ** 70)
+        if kind == 2:
+            return rnd.uniform(-1e6, 1e6)
+        if kind == 3:
+            return "".join(rnd.choice("abcäöü 🌸\n\"") for _ in range(rnd.randrange(12)))
+        if kind == 4:
+            dt = f"{rnd.randint(1971, 2100)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} 10:11:12"
+            return dt + (f".{rnd.randrange(10 ** 6):06d}" if rnd.random() < 0.5 else "")
+        if kind == 5:
+            return [value(depth + 1) for _ in range(rnd.randrange(5))]
+        return {f"k{rnd.randrange(20)}": value(depth + 1) for _ in range(rnd.randrange(5))}
+
+    for _ in range(300):
+        tree = value(0)
+        assert serializer.loads(serializer.dumps(tree)) == tree
+
+
+def test_compact_tuples_come_back_as_lists():
+    serializer = CompactSerializer()
+    assert serializer.loads(serializer.dumps({"a": (1, "x")})) == {"a": [1, "x"]}
+
+
+def test_compact_is_smaller_than_json_for_repeated_keys():
+    rows = {"conversation": [{"who": "user", "text": f"Nachricht {i}", "time": "2024-05-01 12:00:00.000001",
+                              "seq": i} for i in range(200)]}
+    assert len(get_serializer("compact").dumps(rows)) < len(get_serializer("json").dumps(rows)) / 2
+
+
+def test_compact_rejects_garbage():
+    serializer = CompactSerializer()
+    with pytest.raises(ValueError):
+        serializer.loads(b"JSON{}")
+    with pytest.raises(ValueError):
+        serializer.loads(serializer.dumps({"a": 1}) + b"\x00")
+    with pytest.raises(TypeError):
+        serializer.dumps({"a": object()})
+
+
+def test_unknown_name():
+    with pytest.raises(ValueError):
+        get_serializer("yaml")
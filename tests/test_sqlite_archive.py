@@ -0,0 +1,119 @@
+# test_sqlite_archive.py – SQLite-Backend: gleiche Schnittstelle wie ThoughtJournal
+import pytest
+
+from sqlite_archive import SqliteThoughtArchive
+from thought_journal import ThoughtJournal
+
+
+def _entries(n, start=0):
+    return [{"text": f"Gedanke {i}", "timestamp": f"2024-01-01 00:00:{i % 60:02d}"} for i in range(start, start + n)]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = SqliteThoughtArchive(str(tmp_path))
+    yield archive
+    archive.close()
+
+
+def test_round_trip_keeps_extra_fields(tmp_path):
+    archive = SqliteThoughtArchive(str(tmp_path))
+    archive.append({"text": "eins", "timestamp": "2024-01-01T10:00:00", "mood": "ruhig", "tags": ["a", "b"]})
+    archive.append_many(_entries(3))
+    archive.close()
+
+    archive = SqliteThoughtArchive(str(tmp_path))
+    entries = list(archive.iter_entries())
+    assert entries[0] == {"text": "eins", "timestamp": "2024-01-01T10:00:00", "mood": "ruhig", "tags": ["a", "b"]}
+    assert [e["text"] for e in entries[1:]] == ["Gedanke 0", "Gedanke 1", "Gedanke 2"]
+    assert archive.read_all() == entries
+    assert archive.count() == 4
+    archive.close()
+
+
+def test_journal_is_imported_once(tmp_path):
+    journal = ThoughtJournal(str(tmp_path))
+    journal.append_many(_entries(5))
+    journal.close()
+    archive = SqliteThoughtArchive(str(tmp_path))
+    archive.append({"text": "neu"})
+    archive.close()
+    archive = SqliteThoughtArchive(str(tmp_path))  # nicht leer: kein zweiter Import
+    assert [e["text"] for e in archive.iter_entries()] == [f"Gedanke {i}" for i in range(5)] + ["neu"]
+    archive.close()
+
+
+def test_page_after_and_before_walk_the_whole_archive(archive):
+    archive.append_many(_entries(21))
+    seen, cursor = [], None
+    while True:
+        page, cursor = archive.page_after(cursor, 7)
+        if not page:
+            break
+        seen.extend(e["text"] for e in page)
+    assert seen == [f"Gedanke {i}" for i in range(21)]
+    assert cursor == archive.end_cursor()
+
+    # 21 = 3 volle Seiten: nach der letzten kommt keine leere mehr (Cursor None wie im Journal)
+    seen, cursor, pages = [], None, 0
+    while True:
+        page, cursor = archive.page_before(cursor, 7)
+        pages += 1
+        seen[:0] = [e["text"] for e in page]
+        if cursor is None:
+            break
+    assert pages == 3
+    assert seen == [f"Gedanke {i}" for i in range(21)]
+    assert archive.last(2) == _entries(2, start=19)
+    assert archive.page_before(None, 0) == ([], None)
+
+
+def test_page_before_matches_journal(tmp_path, archive):
+    journal = ThoughtJournal(str(tmp_path / "journal"))
+    for store in (journal, archive):
+        store.append_many(_entries(10))
+    for n in (3, 5, 10, 20):
+        pages = []
+        for store in (journal, archive):
+            texts, cursor = [], None
+            while True:
+                page, cursor = store.page_before(cursor, n)
+                texts.append([e["text"] for e in page])
+                if cursor is None:
+                    break
+            pages.append(texts)
+        assert pages[0] == pages[1]
+    journal.close()
+
+
+def test_between(archive):
+    archive.append_many(_entries(10))
+    hits = archive.between("2024-01-01 00:00:03", "2024-01-01T00:00:06")
+    assert [e["text"] for e in hits] == ["Gedanke 3", "Gedanke 4", "Gedanke 5"]
+
+
+def test_search_fts_matches_words_and_prefixes(archive):
+    if not archive.has_fts:
+        pytest.skip("SQLite ohne FTS5")
+    archive.append_many([{"text": "Heute im Waldweg"}, {"text": "Der Wald ruft"}, {"text": "kalt und still"},
+                         {"text": 'ein "Zitat" mit: Sonderzeichen*'}])
+    assert [e["text"] for e in archive.search("wald")] == ["Heute im Waldweg", "Der Wald ruft"]
+    assert archive.search("ald") == []  # kein Teilstring innerhalb eines Worts (anders als im Journal)
+    assert [e["text"] for e in archive.search('"Zitat" mit')] == ['ein "Zitat" mit: Sonderzeichen*']
+    assert [e["text"] for e in archive.search("wald", limit=1)] == ["Der Wald ruft"]
+    assert archive.search("   ") == []
+
+
+def test_search_like_fallback_is_substring_and_escapes(archive):
+    archive.has_fts = False
+    archive.append_many([{"text": "Heute im Waldweg"}, {"text": "Der Wald ruft"}, {"text": "100% sicher"},
+                         {"text": "a_b"}, {"text": "axb"}])
+    assert [e["text"] for e in archive.search("ald")] == ["Heute im Waldweg", "Der Wald ruft"]
+    assert [e["text"] for e in archive.search("WALD")] == ["Heute im Waldweg", "Der Wald ruft"]
+    assert [e["text"] for e in archive.search("0%")] == ["100% sicher"]
+    assert [e["text"] for e in archive.search("a_b")] == ["a_b"]
+
+
+def test_cursor_mark_is_stable(archive):
+    archive.append_many(_entries(3))
+    assert archive.cursor_mark(archive.end_cursor()) == archive.cursor_mark(None) == 0
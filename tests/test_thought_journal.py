@@ -0,0 +1,162 @@
+# test_thought_journal.py – Append-Journal: Reparatur nach Absturz, Migration, Cursor
+import json
+
+from thought_journal import ThoughtJournal, salvage_json_list
+
+
+def _entries(n, start=0):
+    return [{"text": f"Gedanke {i}", "timestamp": f"2024-01-01 00:00:{i % 60:02d}"} for i in range(start, start + n)]
+
+
+def test_torn_tail_is_cut_on_open(tmp_path):
+    journal = ThoughtJournal(str(tmp_path))
+    journal.append_many(_entries(3))
+    journal.close()
+    # Absturz mitten im Schreiben: letzte Zeile ohne Zeilenumbruch
+    with open(journal.path, "ab") as f:
+        f.write(b'{"text": "halb geschrie')
+
+    journal = ThoughtJournal(str(tmp_path))
+    assert [e["text"] for e in journal.iter_entries()] == ["Gedanke 0", "Gedanke 1", "Gedanke 2"]
+    with open(journal.path, "rb") as f:
+        assert f.read().endswith(b"}\n")
+    # danach wird normal weitergeschrieben, ohne an den Rest der halben Zeile zu kleben
+    journal.append({"text": "neu"})
+    journal.close()
+    assert [e["text"] for e in ThoughtJournal(str(tmp_path)).iter_entries()][-1] == "neu"
+
+
+def test_torn_tail_longer_than_one_block(tmp_path):
+    journal = ThoughtJournal(str(tmp_path))
+    journal.append({"text": "ganz"})
+    journal.close()
+    with open(journal.path, "ab") as f:
+        f.write(b'{"text": "' + b"x" * 10000)
+    assert [e["text"] for e in ThoughtJournal(str(tmp_path)).iter_entries()] == ["ganz"]
+
+
+def test_torn_only_line_leaves_empty_journal(tmp_path):
+    path = tmp_path / ThoughtJournal.FILENAME
+    path.write_bytes(b'{"text": "nie fertig')
+    journal = ThoughtJournal(str(tmp_path))
+    assert list(journal.iter_entries()) == []
+    assert path.read_bytes() == b""
+
+
+def test_corrupt_line_in_the_middle_is_skipped(tmp_path):
+    journal = ThoughtJournal(str(tmp_path))
+    journal.append({"text": "a"})
+    journal.close()
+    with open(journal.path, "ab") as f:
+        f.write(b"kein json\n")
+    journal = ThoughtJournal(str(tmp_path))
+    journal.append({"text": "b"})
+    assert [e["text"] for e in journal.iter_entries()] == ["a", "b"]
+    assert [e["text"] for e in journal.last(5)] == ["a", "b"]
+
+
+def test_legacy_list_is_migrated_and_truncated_list_salvaged(tmp_path):
+    legacy = json.dumps(_entries(4))
+    (tmp_path / ThoughtJournal.LEGACY_FILENAME).write_text(legacy[:-30], encoding="utf-8")
+    journal = ThoughtJournal(str(tmp_path))
+    texts = [e["text"] for e in journal.iter_entries()]
+    assert texts == [e["text"] for e in salvage_json_list(legacy[:-30])]
+    assert texts[:3] == ["Gedanke 0", "Gedanke 1", "Gedanke 2"]
+    assert (tmp_path / (ThoughtJournal.LEGACY_FILENAME + ".bak")).exists()
+
+
+def test_page_after_and_before_walk_the_whole_journal(tmp_path):
+    journal = ThoughtJournal(str(tmp_path))
+    journal.append_many(_entries(25))
+    seen, cursor = [], None
+    while True:
+        page, cursor = journal.page_after(cursor, 7)
+        if not page:
+            break
+        seen.extend(e["text"] for e in page)
+    assert seen == [f"Gedanke {i}" for i in range(25)]
+    assert cursor == journal.end_cursor()
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = journal.page_before(cursor, 7)
+        seen[:0] = [e["text"] for e in page]
+        if cursor is None:
+            break
+    assert seen == [f"Gedanke {i}" for i in range(25)]
+
+
+def test_page_after_stops_before_incomplete_line(tmp_path):
+    journal = ThoughtJournal(str(tmp_path))
+    journal.append_many(_entries(2))
+    end = journal.end_cursor()
+    journal.close()
+    with open(journal.path, "ab") as f:
+        f.write(b'{"text": "im Flug')
+    # ohne erneutes Öffnen (keine Reparatur): die halbe Zeile wird nicht gelesen, der Cursor bleibt davor
+    page, cursor = journal.page_after(None, 10)
+    assert [e["text"] for e in page] == ["Gedanke 0", "Gedanke 1"]
+    assert cursor == end
+
+
+def _with_corrupt_line(tmp_path, before=3, after=3):
+    journal = ThoughtJournal(str(tmp_path))
+    journal.append_many(_entries(before))
+    journal.close()
+    with open(journal.path, "ab") as f:
+        f.write(b"kein json\n")
+    journal = ThoughtJournal(str(tmp_path), compact_every=5)
+    journal.append_many(_entries(after, start=before))
+    return journal
+
+
+def test_writer_compacts_after_a_reader_found_a_bad_line(tmp_path):
+    journal = _with_corrupt_line(tmp_path)
+    assert not journal.needs_compaction
+    journal.last(10)  # der Leser stößt auf die defekte Zeile
+    assert journal.needs_compaction
+    journal.append_many(_entries(5, start=6))
+    assert not journal.needs_compaction
+    with open(journal.path, "rb") as f:
+        assert b"kein json" not in f.read()
+    assert [e["text"] for e in journal.iter_entries()] == [f"Gedanke {i}" for i in range(11)]
+
+
+def test_read_all_does_not_rewrite(tmp_path):
+    journal = _with_corrupt_line(tmp_path)
+    size = journal.end_cursor()
+    assert len(journal.read_all()) == 6
+    assert journal.end_cursor() == size
+
+
+def test_compaction_keeps_concurrent_appends(tmp_path):
+    import threading
+    journal = _with_corrupt_line(tmp_path)
+    stop = threading.Event()
+
+    def writer():
+        i = 100
+        while not stop.is_set():
+            journal.append({"text": f"Gedanke {i}"})
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    for _ in range(20):
+        journal.needs_compaction = True
+        journal.compact()
+    stop.set()
+    thread.join()
+    texts = [e["text"] for e in journal.iter_entries()]
+    written = [t for t in texts if int(t.split()[1]) >= 100]
+    assert written == [f"Gedanke {i}" for i in range(100, 100 + len(written))]
+
+
+def test_cursor_mark_detects_shifted_offsets(tmp_path):
+    journal = _with_corrupt_line(tmp_path)
+    cursor = journal.end_cursor()
+    mark = journal.cursor_mark(cursor)
+    assert journal.cursor_mark(cursor) == mark
+    assert journal.cursor_mark(0) == journal.cursor_mark(None) == 0
+    journal.compact()
+    assert journal.cursor_mark(cursor) != mark
@@ -0,0 +1,48 @@
+# test_tokenizer.py – eine Normalisierungsregel für NLU, RecallIndex, Analyse und Seeding
+from collections import Counter
+
+import pytest
+
+from intent_matcher import DEFAULT_INTENTS
+from tokenizer import count_tokens, normalize_words, tokenize
+from test_intent_matcher import random_texts
+
+TEXTS = [
+    "Hallo Aurelia!",
+    "Was denkst du über \"Wald\", Baum und (Licht)?",
+    "  ja\tNEIN  vielleicht...  ",
+    "[2024-01-01 00:00:00] Aurelia: Neue Idee / Ziel: Notizen ordnen",
+    "ÖFFNE die Tür; äh, ok?",
+    "",
+]
+
+
+@pytest.mark.parametrize("text, tokens", [
+    ("Hallo Aurelia!", ["hallo", "aurelia"]),
+    ("Was denkst du über \"Wald\"?", ["was", "denkst", "über", "wald"]),
+    ("ja ... (ok) 'abc'", ["abc"]),  # nach dem Abschneiden zu kurz
+    ("ÖFFNE   die\tTür", ["öffne", "die", "tür"]),
+])
+def test_rule(text, tokens):
+    assert tokenize(text) == tokens
+
+
+def test_count_tokens_matches_tokenize():
+    texts = TEXTS + list(random_texts(DEFAULT_INTENTS, 500, seed=5))
+    expected = Counter()
+    for text in texts:
+        expected.update(tokenize(text))
+    assert count_tokens(texts) == expected
+
+
+def test_nlu_tokens_follow_rule():
+    from aurelia_engine import SimpleNLU
+    nlu = SimpleNLU()
+    for text in TEXTS + list(random_texts(DEFAULT_INTENTS, 500, seed=3)):
+        result = nlu.interpret(text)
+        assert result["tokens"] == tokenize(text)
+        assert result["entities"] == [w for w in tokenize(text) if len(w) > 3][:3]
+
+
+def test_min_len():
+    assert normalize_words(["ab", "abc", "abcd"], min_len=4) == ["abcd"]
@@ -0,0 +1,388 @@
+# thought_journal.py – Append-only Speicher (JSON Lines) für das Gedanken-Archiv
+import os
+import json
+import time
+import zlib
+import datetime
+import threading
+
+from aurelia_logging import get_logger
+
+_log = get_logger("journal")
+
+
+def normalize_timestamp(value):
+    """Einheitliche, sortierbare Zeitdarstellung ("YYYY-MM-DD HH:MM:SS.ffffff")."""
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+    return str(value).replace("T", " ")
+
+
+def salvage_json_list(text):
+    """Liest aus einer abgeschnittenen JSON-Liste alle vollständigen Elemente der Reihe nach."""
+    decoder = json.JSONDecoder()
+    items = []
+    pos = text.find("[")
+    if pos == -1:
+        return items
+    pos += 1
+    while True:
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(text) or text[pos] == "]":
+            return items
+        try:
+            item, pos = decoder.raw_decode(text, pos)
+        except ValueError:
+            return items
+        items.append(item)
+
+
+class ThoughtJournal:
+    """
+    Append-only Journal für Gedanken: eine JSON-Zeile pro Eintrag in gedanken.jsonl.
+
+    Ein neuer Gedanke kostet ein einzelnes Anhängen an die offene Datei statt eines
+    kompletten Neuschreibens. fsync wird gebündelt (alle `fsync_every` Einträge oder
+    spätestens nach `fsync_interval` Sekunden) und beim Schließen nachgeholt.
+    Ein vorhandenes gedanken.json (JSON-Liste) wird beim ersten Öffnen einmalig
+    übernommen und als gedanken.json.bak aufbewahrt. Über `filename` lässt sich
+    dieselbe Mechanik auch für andere Journale nutzen (legacy_filename=None).
+
+    Defekte Zeilen fallen beim Lesen auf (needs_compaction); die Schreibseite schreibt
+    das Journal dann spätestens nach `compact_every` weiteren Einträgen ohne sie neu.
+    Das verschiebt die Byte-Offsets: wer einen Cursor aufhebt, merkt sich dazu
+    cursor_mark(cursor) und fängt neu an, wenn die Marke nicht mehr passt.
+    """
+    FILENAME = "gedanken.jsonl"
+    LEGACY_FILENAME = "gedanken.json"
+
+    def __init__(self, base_path, fsync_every=20, fsync_interval=2.0,
+                 filename=FILENAME, legacy_filename=LEGACY_FILENAME, compact_every=100):
+        self.path = os.path.join(base_path, filename)
+        self.legacy_path = os.path.join(base_path, legacy_filename) if legacy_filename else None
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._fh = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.needs_compaction = False
+        self._appended = 0  # Einträge seit der letzten Kompaktierungs-Prüfung
+        os.makedirs(base_path, exist_ok=True)
+        with self._lock:
+            self._migrate_legacy()
+            self._repair_tail()
+
+    # ---------- Migration / Reparatur ----------
+    def _migrate_legacy(self):
+        """Übernimmt ein altes gedanken.json einmalig in das Journal."""
+        if not self.legacy_path or os.path.exists(self.path) or not os.path.exists(self.legacy_path):
+            return
+        with open(self.legacy_path, "r", encoding="utf-8") as f:
+            raw = f.read()
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            # beim Schreiben abgebrochene Liste: alle vollständigen Einträge retten
+            data = salvage_json_list(raw)
+        if not isinstance(data, list):
+            data = []
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in data:
+                if isinstance(entry, dict):
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        os.replace(self.legacy_path, self.legacy_path + ".bak")
+
+    def _repair_tail(self):
+        """Schneidet eine beim Absturz halb geschriebene letzte Zeile ab."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            # rückwärts bis zum letzten Zeilenumbruch suchen
+            pos = size
+            block = 4096
+            while pos > 0:
+                start = max(0, pos - block)
+                f.seek(start)
+                chunk = f.read(pos - start)
+                idx = chunk.rfind(b"\n")
+                if idx != -1:
+                    f.truncate(start + idx + 1)
+                    return
+                pos = start
+            f.truncate(0)
+
+    # ---------- Schreiben ----------
+    def append(self, entry):
+        """Hängt einen Eintrag (dict) an das Journal an."""
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self.path, "a", encoding="utf-8")
+            self._fh.write(line)
+            self._fh.flush()
+            self._pending += 1
+            now = time.monotonic()
+            if self._pending >= self.fsync_every or now - self._last_sync >= self.fsync_interval:
+                self._sync_locked(now)
+            self._maybe_compact_locked(1)
+        return entry
+
+    def append_many(self, entries):
+        """Hängt mehrere Einträge mit einem einzigen Schreibvorgang an."""
+        if not entries:
+            return entries
+        data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries)
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self.path, "a", encoding="utf-8")
+            self._fh.write(data)
+            self._fh.flush()
+            self._pending += len(entries)
+            now = time.monotonic()
+            if self._pending >= self.fsync_every or now - self._last_sync >= self.fsync_interval:
+                self._sync_locked(now)
+            self._maybe_compact_locked(len(entries))
+        return entries
+
+    def _sync_locked(self, now=None):
+        if self._fh is not None and self._pending:
+            os.fsync(self._fh.fileno())
+        self._pending = 0
+        self._last_sync = now if now is not None else time.monotonic()
+
+    def sync(self):
+        """Erzwingt fsync aller bisher angehängten Einträge."""
+        with self._lock:
+            self._sync_locked()
+
+    def close(self):
+        with self._lock:
+            self._sync_locked()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    # ---------- Lesen ----------
+    def iter_entries(self):
+        """Liefert alle gültigen Einträge der Reihe nach; defekte Zeilen werden übersprungen."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    self.needs_compaction = True
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+                else:
+                    self.needs_compaction = True
+
+    def read_all(self):
+        return list(self.iter_entries())
+
+    def last(self, n):
+        """Die letzten n Einträge – liest die Datei blockweise von hinten."""
+        return self.page_before(None, n)[0]
+
+    def page_before(self, cursor, n):
+        """
+        Bis zu n Einträge vor der Byte-Position `cursor` (None = Dateiende), ältester zuerst.
+        Gibt (einträge, neuer_cursor) zurück; neuer_cursor ist None, wenn nichts Älteres folgt.
+        """
+        if n <= 0:
+            return [], cursor
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+        if not os.path.exists(self.path):
+            return [], None
+        found = []  # (offset, entry), neuester zuerst
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell() if cursor is None else min(cursor, f.tell())
+            rest = b""
+            while pos > 0 and len(found) < n:
+                start = max(0, pos - 65536)
+                f.seek(start)
+                parts = (f.read(pos - start) + rest).split(b"\n")
+                if start > 0:
+                    # erste Zeile beginnt evtl. vor dem Block: beim nächsten Block vervollständigen
+                    rest = parts.pop(0)
+                    offset = start + len(rest) + 1
+                else:
+                    rest = b""
+                    offset = 0
+                offsets = []
+                for part in parts:
+                    offsets.append(offset)
+                    offset += len(part) + 1
+                for line_start, raw in zip(reversed(offsets), reversed(parts)):
+                    if len(found) >= n:
+                        break
+                    raw = raw.strip()
+                    if not raw:
+                        continue
+                    try:
+                        entry = json.loads(raw.decode("utf-8"))
+                    except ValueError:
+                        self.needs_compaction = True
+                        continue
+                    if isinstance(entry, dict):
+                        found.append((line_start, entry))
+                    else:
+                        self.needs_compaction = True
+                pos = start
+        if not found:
+            return [], None
+        oldest = found[-1][0]
+        return [e for _, e in reversed(found)], (oldest or None)
+
+    def page_after(self, cursor, n):
+        """
+        Bis zu n Einträge ab der Byte-Position `cursor` (None = Dateianfang), ältester zuerst.
+        Gibt (einträge, neuer_cursor) zurück; neuer_cursor zeigt hinter den letzten Eintrag.
+        Zeigt cursor nach einer Kompaktierung mitten in eine Zeile, geht es ab der nächsten weiter.
+        """
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+        pos = cursor or 0
+        if not os.path.exists(self.path):
+            return [], pos
+        found = []
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = min(pos, f.tell())
+            f.seek(max(0, pos - 1))
+            if pos > 0 and f.read(1) != b"\n":
+                f.readline()
+                pos = f.tell()
+            while len(found) < n:
+                raw = f.readline()
+                if not raw.endswith(b"\n"):
+                    break  # Dateiende oder noch unvollständige letzte Zeile
+                pos = f.tell()
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    entry = json.loads(raw.decode("utf-8"))
+                except ValueError:
+                    self.needs_compaction = True
+                    continue
+                if isinstance(entry, dict):
+                    found.append(entry)
+                else:
+                    self.needs_compaction = True
+        return found, pos
+
+    def end_cursor(self):
+        """Cursor hinter dem letzten Eintrag (für page_after)."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def cursor_mark(self, cursor):
+        """
+        Prüfsumme der Bytes vor `cursor` (höchstens 256). Stimmt sie später nicht mehr,
+        hat eine Kompaktierung die Offsets verschoben und der Cursor ist ungültig.
+        """
+        if not cursor:
+            return 0
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+        if not os.path.exists(self.path) or cursor > os.path.getsize(self.path):
+            return None
+        start = max(0, cursor - 256)
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return zlib.crc32(f.read(cursor - start))
+
+    def between(self, start, end):
+        """Einträge mit start <= timestamp < end (Strings oder datetime)."""
+        lo, hi = normalize_timestamp(start), normalize_timestamp(end)
+        return [e for e in self.iter_entries()
+                if lo <= normalize_timestamp(e.get("timestamp", "")) < hi]
+
+    def search(self, term, limit=50):
+        """Die neuesten Einträge (max. limit), deren Text term enthält."""
+        term = term.lower()
+        hits = [e for e in self.iter_entries() if term in str(e.get("text", "")).lower()]
+        return hits[-limit:]
+
+    # ---------- Kompaktierung ----------
+    def _maybe_compact_locked(self, appended):
+        self._appended += appended
+        if not self.needs_compaction or self._appended < self.compact_every:
+            return
+        self._appended = 0
+        try:
+            self.compact()
+        except OSError as e:
+            _log.error(f"Kompaktierung von {os.path.basename(self.path)} fehlgeschlagen", exc_info=e)
+
+    def compact(self, entries=None):
+        """
+        Schreibt das Journal ohne defekte Zeilen neu (temp + rename). Lesen und Schreiben
+        geschehen unter der Sperre, ein gleichzeitiges append() geht also nicht verloren.
+        entries: stattdessen genau diese Einträge schreiben (clear()).
+        """
+        with self._lock:
+            if entries is None:
+                entries = list(self.iter_entries())
+            self._sync_locked()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self.needs_compaction = False
+
+    def rotate(self, dest_path):
+        """
+        Schiebt das Journal nach dest_path (ein vorhandenes wird ersetzt) und beginnt
+        ein leeres. So bleibt der Stand zwischen den letzten beiden Snapshots nachspielbar.
+        """
+        with self._lock:
+            self._sync_locked()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if os.path.exists(self.path):
+                os.replace(self.path, dest_path)
+            elif os.path.exists(dest_path):
+                os.remove(dest_path)
+            self.needs_compaction = False
+
+    def clear(self):
+        """Leert das Journal (z.B. nachdem sein Inhalt in einen Snapshot übernommen wurde)."""
+        self.compact([])
@@ -1,46 +1,113 @@
-import os
+# thought_stream.py – Gedankenfluss als Ringpuffer mit fortlaufenden IDs
 import datetime
-import traceback
+from collections import deque
+from itertools import islice
+
+from aurelia_logging import get_logger
+from event_bus import THOUGHT, POPUP
+
+_log = get_logger("thought_stream")
+
 
 class ThoughtStream:
-    def __init__(self, max_thoughts=100):
-        self.thoughts = []
+    """
+    Gedankenfluss in einem Ringpuffer fester Größe (deque mit maxlen).
+
+    Jeder Gedanke bekommt eine fortlaufende ID. append_thought() ist O(1); ist der
+    Puffer voll, fällt der älteste Gedanke heraus. get_recent_thoughts(), iter_recent()
+    und thoughts_since() lesen direkt aus dem Puffer, ohne ihn zu kopieren – daher nur
+    aus dem Thread benutzen, dem der Stream gehört (im App-Betrieb der EngineWorker).
+
+    Mit decision_engine erzeugt update() neue Gedanken über DecisionEngine.step(), mit
+    archive_manager werden sie zusätzlich archiviert. Mit bus (event_bus.EventBus)
+    wird jeder Gedanke als "thought" (id, text) veröffentlicht; Popups, Ziele und
+    Reflexionen der Engine zusätzlich unter ihrem eigenen Topic.
+    """
+
+    def __init__(self, decision_engine=None, archive_manager=None, max_thoughts=400, bus=None):
         self.max_thoughts = max_thoughts
+        self._buffer = deque(maxlen=max_thoughts)  # (id, text)
+        self.last_id = 0
+        self.decision_engine = decision_engine
+        self.archive = archive_manager
+        self.bus = bus
+
+    def __len__(self):
+        return len(self._buffer)
+
+    @property
+    def first_id(self):
+        """ID des ältesten noch gepufferten Gedankens (last_id + 1, wenn leer)."""
+        return self._buffer[0][0] if self._buffer else self.last_id + 1
 
     def update(self):
         """
         Fügt bei Bedarf einen neuen Gedanken hinzu.
         """
         try:
-            if len(self.thoughts) < self.max_thoughts:
-                self.thoughts.append("Neuer Gedanke fließt...")
+            if self.decision_engine is None:
+                self.append_thought("Neuer Gedanke fließt...")
+                return
+            produced = self.decision_engine.step()
+            if produced:
+                topic, text = produced
+                if topic == POPUP:
+                    self._publish(POPUP, text)
+                    # also append to thought log
+                    self.append_thought(f"Aurelia fragt: {text}")
+                else:
+                    self.append_thought(f"Aurelia: {text}")
+                    if topic != THOUGHT:
+                        self._publish(topic, text)
         except Exception as e:
             self._log_error("Fehler beim Aktualisieren der Gedanken", e)
 
+    def append_thought(self, txt, notify=True):
+        try:
+            timestamped = f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {txt}"
+            self.last_id += 1
+            self._buffer.append((self.last_id, timestamped))
+            if self.archive is not None:
+                try:
+                    self.archive.save_thought(timestamped)
+                except Exception:
+                    pass
+            if notify:
+                self._publish(THOUGHT, (self.last_id, timestamped))
+            return self.last_id
+        except Exception as e:
+            self._log_error("Fehler beim Anhängen eines Gedankens", e)
+            return None
+
+    def _publish(self, topic, payload):
+        if self.bus is None:
+            return
+        try:
+            self.bus.publish(topic, payload)
+        except Exception as e:
+            self._log_error(f"Fehler beim Veröffentlichen ({topic})", e)
+
+    def iter_recent(self, count=10):
+        """Die letzten 'count' Gedanken als (id, text), ältester zuerst, ohne Kopie."""
+        return islice(self._buffer, max(0, len(self._buffer) - count), None)
+
     def get_recent_thoughts(self, count=10):
         """
         Gibt die letzten 'count' Gedanken zurück.
         """
         try:
-            return self.thoughts[-count:]
+            return [text for _, text in self.iter_recent(count)]
         except Exception as e:
             self._log_error("Fehler beim Abrufen der letzten Gedanken", e)
             return []
 
+    def thoughts_since(self, last_id):
+        """Alle noch gepufferten Gedanken mit ID > last_id als [(id, text), ...]."""
+        start = max(0, last_id + 1 - self.first_id)
+        return list(islice(self._buffer, start, None))
+
     def _log_error(self, message, exception=None):
         """
-        Schreibt Fehler in eine Log-Datei auf der SD-Karte.
+        Meldet Fehler an das gemeinsame Logging (aurelia_logging.py).
         """
-        try:
-            log_path = os.path.join(
-                os.getenv('EXTERNAL_STORAGE', '/sdcard'),
-                'aurelia_thought_stream_errors.txt'
-            )
-            with open(log_path, 'a', encoding='utf-8') as f:
-                f.write(f"[{datetime.datetime.now()}] ERROR: {message}\n")
-                if exception:
-                    f.write(f"{exception}\n")
-                    f.write(traceback.format_exc() + "\n")
-                f.write("=" * 40 + "\n")
-        except Exception as log_err:
-            print(f"[AURELIA] Konnte ThoughtStream-Fehler nicht loggen: {log_err}")
+        _log.error(message, exc_info=exception)
@@ -0,0 +1,32 @@
+# tokenizer.py – Gemeinsame Wort-Normalisierung für NLU, Assoziationen und Archiv-Seeding
+from collections import Counter
+
+STRIP_CHARS = ".,!?;:()[]\"'"
+MIN_LEN = 3
+
+
+def normalize_words(words, min_len=MIN_LEN):
+    """Satzzeichen am Rand entfernen, klein schreiben, zu kurze Wörter verwerfen."""
+    return [w for w in (x.strip(STRIP_CHARS).lower() for x in words) if len(w) >= min_len]
+
+
+def tokenize(text):
+    """Zerlegt text in normalisierte Wörter."""
+    return normalize_words(text.split())
+
+
+def count_tokens(texts):
+    """
+    Zählt alle Wörter über viele Texte (z.B. Archiv-Einträge beim Seeden).
+
+    Die Texte werden einmal verbunden, klein geschrieben und zerlegt. Gezählt wird
+    zuerst roh, normalisiert wird danach nur jedes verschiedene Roh-Wort einmal –
+    dieselbe Regel wie normalize_words, nur ohne Aufwand pro Eintrag.
+    """
+    raw_counts = Counter("\n".join(texts).lower().split())
+    counts = Counter()
+    for raw, n in raw_counts.items():
+        w = raw.strip(STRIP_CHARS)
+        if len(w) >= MIN_LEN:
+            counts[w] += n
+    return counts
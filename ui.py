@@ -10,6 +10,10 @@ from kivy.properties import ObjectProperty, StringProperty, ListProperty
 from kivy.clock import Clock
 
 KV = r"""
+<ThoughtRow@Label>:
+    markup: True
+    color: 0.92, 0.95, 1, 1
+
 <AureliaRoot>:
     orientation: "vertical"
     padding: 14
@@ -112,15 +116,16 @@ KV = r"""
                 height: "28dp"
                 color: 0.85,0.95,1,1
                 bold: True
-            ScrollView:
+            RecycleView:
+                id: thoughts_rv
                 do_scroll_x: False
-                GridLayout:
-                    id: thoughts_grid
-                    cols: 1
+                viewclass: "ThoughtRow"
+                RecycleBoxLayout:
+                    orientation: "vertical"
                     size_hint_y: None
                     height: self.minimum_height
-                    row_default_height: "56dp"
-                    row_force_default: True
+                    default_size: None, dp(56)
+                    default_size_hint: 1, None
                     spacing: 6
         # Archive panel
         BoxLayout:
@@ -175,17 +180,11 @@ class AureliaRoot(BoxLayout):
         self.set_info("Gedanke hinzugefügt.")
 
     def refresh_thoughts(self):
-        grid = self.ids.thoughts_grid
-        grid.clear_widgets()
-        for t in self.app.thoughts.list_thoughts(limit=100):
-            lbl = Label(
-                text=f"[b]{t['text']}[/b]\\n[i]{t['timestamp']}[/i]",
-                markup=True,
-                size_hint_y=None,
-                height="56dp",
-                color=(0.92, 0.95, 1, 1),
-            )
-            grid.add_widget(lbl)
+        # nur Daten setzen – die RecycleView verwendet ihre sichtbaren Zeilen wieder
+        self.ids.thoughts_rv.data = [
+            {"text": f"[b]{t['text']}[/b]\\n[i]{t['timestamp']}[/i]"}
+            for t in self.app.thoughts.list_thoughts(limit=100)
+        ]
 
     # Archive
     def on_show_archives(self):